@@ -31,6 +31,9 @@ class App(tk.Tk):
 
         self._load_frames()
 
+        # Stop acquisition, servers and DSP workers before closing
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def _load_frames(self):
         for FrameClass in (HomePage, SettingsPage, InitialPage, AboutPage):
             frame = FrameClass(
@@ -44,6 +47,10 @@ class App(tk.Tk):
         # Inject waveform
         draw_test_waveform(self.controller)
 
+    def _on_close(self):
+        self.controller.shutdown()
+        self.destroy()
+
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
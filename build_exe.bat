@@ -8,11 +8,12 @@ rmdir /s /q build
 rmdir /s /q dist
 del main.spec
 
-REM Build EXE with waveform, views, and ttk included
+REM Build EXE with waveform, views, scope, and ttk included
 pyinstaller --onefile --windowed --clean ^
 --icon=assets/app.ico ^
 --add-data "waveform.py;." ^
 --add-data "views;views" ^
+--add-data "scope;scope" ^
 --add-data "assets/app.ico;assets" ^
 --add-data "assets/kbk.ico;assets" ^
 --hidden-import=tkinter.ttk ^
@@ -2,6 +2,9 @@
 
 import json
 import os
+import tempfile
+
+from scope.dsp_executor import MODES as DSP_MODES
 
 
 class Controller:
@@ -22,6 +25,23 @@ class Controller:
         self.vscode_path = os.getenv("VSCODE_PATH")
         self.python_path = os.getenv("PYTHON_PATH")
 
+        # Optional: DSP executor mode (thread, process or serial)
+        self.dsp_mode = os.getenv("DSP_MODE", "thread")
+
+        # Optional: fixed seed for the noise generator (reproducible runs)
+        self.noise_seed = self._int_env("NOISE_SEED")
+
+        # Optional: where deep records (memory-mapped files) are kept
+        self.deep_record_dir = os.getenv("DEEP_RECORD_DIR") or os.path.join(
+            tempfile.gettempdir(), "kbk_deep_record")
+
+        # Optional: where streamed recordings (capture files) are written
+        self.record_dir = os.getenv("RECORD_DIR") or os.path.join(
+            tempfile.gettempdir(), "kbk_recordings")
+
+        # Optional: TCP port of the remote-control server (off if empty)
+        self.remote_port = self._int_env("REMOTE_PORT")
+
         # Validate environment variables
         self.validate_env()
 
@@ -39,7 +59,9 @@ class Controller:
             "current_page": None,    # will be set by show_frame()
             "language": "en",        # en, jp, etc.
             "font_size": "medium",   # small, medium, large
-            "color_mode": "normal"   # normal, dark, highcontrast
+            "color_mode": "normal",  # normal, dark, highcontrast
+            "ring_capacity": 100000,  # samples of history per channel
+            "deep_capacity": 10000000  # deep record samples per channel
         }
 
         # Load saved settings
@@ -149,6 +171,32 @@ class Controller:
                 "successfully."
             )
 
+        if self.remote_port is not None and not (
+            1 <= self.remote_port <= 65535
+        ):
+            print(f"\n[ENV VALIDATION WARNING] REMOTE_PORT="
+                  f"{self.remote_port} is not a TCP port (1-65535); "
+                  "remote control is off.\n")
+            self.remote_port = None
+
+        if self.dsp_mode not in DSP_MODES:
+            print(f"\n[ENV VALIDATION WARNING] DSP_MODE={self.dsp_mode!r} "
+                  f"is not one of {', '.join(DSP_MODES)}; using 'thread'.\n")
+            self.dsp_mode = "thread"
+
+    @staticmethod
+    def _int_env(name):
+        """Optional integer environment variable; warns if malformed."""
+        value = os.getenv(name)
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            print(f"\n[ENV VALIDATION WARNING] {name}={value!r} is not an "
+                  "integer; ignoring it.\n")
+            return None
+
     def register_frame(self, name, frame):
         """
         Register a frame with a name so it can be shown later.
@@ -176,6 +224,20 @@ class Controller:
         """
         return self.frames.get(name)
 
+    def shutdown(self):
+        """
+        Let every page release its resources (threads, worker
+        processes, sockets, files). Called when the window closes.
+        """
+        for name, frame in self.frames.items():
+            shutdown = getattr(frame, "shutdown", None)
+            if shutdown is None:
+                continue
+            try:
+                shutdown()
+            except Exception as exc:
+                print(f"[Controller] Shutdown of '{name}' failed: {exc!r}")
+
     # --- TRANSLATION HELPER ---
     def t(self, key):
         lang = self.shared_data["language"]
@@ -0,0 +1,137 @@
+# headless.py
+
+import csv
+import sys
+import time
+
+from scope.dds import WAVEFORMS
+from scope.engine import ScopeEngine
+from scope.measurements import MEASUREMENTS
+from scope.recorder import StreamRecorder
+from scope.replay import CaptureFile, ReplaySource
+from scope.scpi import ScpiSource
+
+
+SIGNAL_TYPES = WAVEFORMS + ("noise",)
+
+
+def parse_signal(text):
+    """'TYPE[:FREQ[:AMP[:NOISE]]]' -> set_channel keyword arguments."""
+    parts = text.split(":")
+    if len(parts) > 4 or parts[0] not in SIGNAL_TYPES:
+        raise ValueError(f"Bad signal spec: {text!r}")
+    names = ("sig_type", "freq", "amp", "noise_amp")
+    try:
+        values = [parts[0]] + [float(p) for p in parts[1:]]
+    except ValueError:
+        raise ValueError(f"Bad signal spec: {text!r}") from None
+    return dict(zip(names, values))
+
+
+def parse_address(spec):
+    """'[HOST:]PORT' of a SCPI instrument -> (host, port)."""
+    host, _, port = spec.rpartition(":")
+    if not port.isdigit() or not 1 <= int(port) <= 65535:
+        raise ValueError(f"Bad instrument address: {spec!r}")
+    return host or "127.0.0.1", int(port)
+
+
+def check_args(args):
+    """Raise ValueError for a bad --signal, --source or --measure."""
+    for spec in args.signal or []:
+        parse_signal(spec)
+    if args.source and not args.source.endswith(".kbkrec"):
+        parse_address(args.source)
+    unknown = [name for name in args.measure or []
+               if name not in MEASUREMENTS]
+    if unknown:
+        raise ValueError(f"Unknown measurements: {', '.join(unknown)}")
+
+
+def open_source(spec, n_samples):
+    """A SignalSource for --source: a .kbkrec capture or host:port."""
+    if spec.endswith(".kbkrec"):
+        # Replay as fast as it can be read
+        return ReplaySource(CaptureFile(spec), speed=None)
+    host, port = parse_address(spec)
+    return ScpiSource(host, port, n_samples=n_samples)
+
+
+def run(args):
+    """
+    Acquire without a GUI for args.frames frames or args.seconds
+    seconds, measuring every record and optionally recording every
+    frame. Returns the process exit code.
+    """
+    try:
+        check_args(args)
+    except ValueError as exc:
+        print(f"[Headless] {exc}", file=sys.stderr)
+        return 2
+
+    engine = ScopeEngine(
+        args.channels, args.samples, fs=args.rate, seed=args.seed)
+    for i, spec in enumerate(args.signal or []):
+        if i >= engine.n_channels:
+            break
+        engine.set_channel(i, **parse_signal(spec))
+    engine.acq.configure(mode=args.acquire, n_avg=args.averages)
+
+    try:
+        if args.source:
+            try:
+                engine.set_source(open_source(args.source, args.samples))
+            except (OSError, ValueError) as exc:
+                print(f"[Headless] Cannot open {args.source}: {exc}",
+                      file=sys.stderr)
+                return 1
+        return _acquire(engine, args)
+    finally:
+        engine.set_source(None)         # closes an instrument or replay
+
+
+def _acquire(engine, args):
+    names = args.measure or MEASUREMENTS
+    recorder = None
+    if args.record:
+        recorder = StreamRecorder(
+            args.record, engine.fs,
+            [{"name": f"CH{i + 1}"} for i in range(engine.n_channels)],
+            on_full="block")
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(["frame", "time", "channel"] + list(names))
+
+    empty = engine.bank.version
+
+    def on_frame(frame):
+        if recorder is not None:
+            recorder.submit(frame)
+        if engine.bank.version == empty:
+            return              # nothing triggered yet: no record
+        results = engine.measurements(names)
+        for row in range(engine.n_channels):
+            writer.writerow(
+                [frame.index, f"{frame.timestamp:.6f}", f"CH{row + 1}"] +
+                [f"{float(results[name][row]):.6g}" for name in names])
+
+    start = time.perf_counter()
+    try:
+        count = engine.run(args.frames, args.seconds, on_frame)
+    except KeyboardInterrupt:
+        count = engine.frames
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"[Headless] {count} frames in {elapsed:.2f} s "
+          f"({rate:.0f} frames/s)", file=sys.stderr)
+    if recorder is not None:
+        print(f"[Headless] {recorder.status_text()}: {args.record}",
+              file=sys.stderr)
+    return 0
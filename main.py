@@ -1,7 +1,70 @@
 # main.py
 
-from app import App
+import argparse
+import multiprocessing
+import sys
+
+from scope.acq_modes import MODES as ACQ_MODES
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="KBK scope. Without --headless the GUI starts.")
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="acquire and measure without a GUI")
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--frames", type=int, help="frames to acquire")
+    limit.add_argument("--seconds", type=float, help="seconds to acquire")
+    parser.add_argument(
+        "--source",
+        help="capture file (.kbkrec) or SCPI instrument host:port "
+             "(default: the built-in generator)")
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=500,
+                        help="samples per record")
+    parser.add_argument("--rate", type=float, default=500.0,
+                        help="generator sampling rate (Hz)")
+    parser.add_argument(
+        "--signal", action="append", metavar="TYPE[:FREQ[:AMP[:NOISE]]]",
+        help="generator setting of the next channel (repeatable)")
+    parser.add_argument(
+        "--acquire", choices=ACQ_MODES, default="sample",
+        help="acquisition mode applied to every record")
+    parser.add_argument("--averages", type=int, default=16,
+                        help="records per average (--acquire average)")
+    parser.add_argument(
+        "--measure", action="append", metavar="NAME",
+        help="measurement to report (repeatable; default: all)")
+    parser.add_argument("--output", help="measurement CSV (default: stdout)")
+    parser.add_argument("--record", help="also record every frame here")
+    parser.add_argument("--seed", type=int, help="noise seed")
+    args = parser.parse_args(argv)
+    if args.headless and args.frames is None and args.seconds is None:
+        parser.error("--headless needs --frames or --seconds")
+    for name in ("channels", "samples", "frames", "seconds", "rate",
+                 "averages"):
+        value = getattr(args, name)
+        if value is not None and value <= 0:
+            parser.error(f"--{name} must be positive")
+    if args.headless:
+        import headless
+        try:
+            headless.check_args(args)
+        except ValueError as exc:
+            parser.error(str(exc))
+    return args
+
 
 if __name__ == "__main__":
+    # Lets frozen (PyInstaller) builds start DSP worker processes
+    multiprocessing.freeze_support()
+    args = parse_args()
+    if args.headless:
+        import headless
+        sys.exit(headless.run(args))
+
+    from app import App
+
     app = App()
     app.mainloop()
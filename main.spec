@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('waveform.py', '.'), ('views', 'views'), ('assets/app.ico', 'assets'), ('assets/kbk.ico', 'assets')],
+    datas=[('waveform.py', '.'), ('views', 'views'), ('scope', 'scope'), ('assets/app.ico', 'assets'), ('assets/kbk.ico', 'assets')],
     hiddenimports=['tkinter.ttk'],
     hookspath=[],
     hooksconfig={},
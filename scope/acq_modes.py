@@ -0,0 +1,164 @@
+"""
+acq_modes.py
+
+Oscilloscope acquisition modes applied to each new record:
+  sample    records are shown as acquired
+  average   running average over n_avg records, exponential or boxcar
+  peak      per-bin min/max of the full-rate record (peak detect)
+  envelope  per-bin min/max accumulated across records
+All accumulators are preallocated for the current record shape and
+updated in place, so memory stays flat however long the scope runs.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+MODES = ("sample", "average", "peak", "envelope")
+AVERAGING = ("exponential", "boxcar")
+
+
+class AcqEngine:
+    """
+    Accumulator for one acquisition mode.
+
+    Call update() with every new (channels, samples) record. In average
+    mode the record is replaced by the average in place; in peak and
+    envelope mode points() returns the min/max trace to display.
+    """
+
+    def __init__(self, mode="sample", n_avg=16, averaging="exponential"):
+        self.mode = mode
+        self.n_avg = n_avg
+        self.averaging = averaging
+        self.count = 0            # records in the accumulator
+        self._shape = None
+        self._acc = None          # average: running mean or boxcar sum
+        self._tmp = None
+        self._history = None      # boxcar: the last n_avg records
+        self._slot = 0
+        self._bins = None         # peak/envelope: bin start indices
+        self._lo = self._hi = None
+        self._frame_lo = self._frame_hi = None
+
+    def configure(self, **settings):
+        """Change settings; accumulation restarts if anything changed."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Unknown acquisition setting: {name}")
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.reset()
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown acquisition mode: {self.mode!r}")
+        if self.averaging not in AVERAGING:
+            raise ValueError(f"Unknown averaging: {self.averaging!r}")
+
+    def reset(self):
+        """Drop all accumulated records (buffers are kept)."""
+        self.count = 0
+        self._slot = 0
+        self._shape = None
+
+    # ---------- UPDATE ----------
+    def update(self, data, n_bins=None):
+        """
+        Fold a new record into the accumulator.
+        data: (channels, samples) float array, averaged in place in
+        average mode. n_bins: display columns for peak/envelope.
+        """
+        if self.mode == "average":
+            self._average(data)
+        elif self.mode in ("peak", "envelope"):
+            self._min_max(data, n_bins or data.shape[1])
+
+    def _allocate(self, key):
+        """True (after a reset) when the accumulator layout changed."""
+        if self._shape != key:
+            self.reset()
+            self._shape = key
+            return True
+        return False
+
+    def _average(self, data):
+        n = max(int(self.n_avg), 1)
+        key = ("average", self.averaging, n, data.shape)
+        if self._allocate(key):
+            if self._acc is None or self._acc.shape != data.shape:
+                self._acc = np.empty(data.shape)
+                self._tmp = np.empty(data.shape)
+            if self.averaging == "boxcar" and (
+                self._history is None or
+                self._history.shape != (n,) + data.shape
+            ):
+                self._history = np.empty((n,) + data.shape)
+
+        if self.averaging == "exponential":
+            # Plain mean for the first n records, then exponential
+            self.count = min(self.count + 1, n)
+            if self.count == 1:
+                self._acc[...] = data
+            else:
+                np.subtract(data, self._acc, out=self._tmp)
+                self._tmp *= 1.0 / self.count
+                self._acc += self._tmp
+            data[...] = self._acc
+        else:
+            # Running sum over a ring of the last n records
+            if self.count == 0:
+                self._acc.fill(0.0)
+            if self.count == n:
+                self._acc -= self._history[self._slot]
+            else:
+                self.count += 1
+            self._history[self._slot] = data
+            self._acc += data
+            self._slot = (self._slot + 1) % n
+            np.divide(self._acc, self.count, out=data)
+
+    def _min_max(self, data, n_bins):
+        n_ch, n = data.shape
+        n_bins = max(1, min(int(n_bins), n))
+        key = ("minmax", data.shape, n_bins)
+        if self._allocate(key):
+            self._bins = np.linspace(0, n, n_bins, endpoint=False).astype(int)
+            self._lo = np.empty((n_ch, n_bins))
+            self._hi = np.empty((n_ch, n_bins))
+            self._frame_lo = np.empty((n_ch, n_bins))
+            self._frame_hi = np.empty((n_ch, n_bins))
+
+        # Per-bin extremes of the full-rate record, before decimation
+        np.minimum.reduceat(data, self._bins, axis=1, out=self._frame_lo)
+        np.maximum.reduceat(data, self._bins, axis=1, out=self._frame_hi)
+        if self.mode == "peak" or self.count == 0:
+            self._lo[...] = self._frame_lo
+            self._hi[...] = self._frame_hi
+        else:
+            np.minimum(self._lo, self._frame_lo, out=self._lo)
+            np.maximum(self._hi, self._frame_hi, out=self._hi)
+        self.count += 1
+
+    # ---------- OUTPUT ----------
+    @property
+    def shows_min_max(self):
+        return self.mode in ("peak", "envelope") and self.count > 0
+
+    def points(self, rows=None):
+        """
+        (xs, ys) min/max trace of the given rows: two points per bin
+        (min then max) at the bin's first sample index.
+        """
+        lo, hi = self._lo, self._hi
+        if rows is not None:
+            lo, hi = lo[rows], hi[rows]
+        ys = np.empty((lo.shape[0], 2 * lo.shape[1]))
+        ys[:, 0::2] = lo
+        ys[:, 1::2] = hi
+        xs = np.repeat(self._bins, 2)
+        return np.broadcast_to(xs, ys.shape), ys
+
+    def status_text(self):
+        """Short status, e.g. 'ACQ: AVG 12/16' or 'ACQ: ENV 240'."""
+        if self.mode == "average":
+            return f"ACQ: AVG {self.count}/{self.n_avg}"
+        if self.mode == "envelope":
+            return f"ACQ: ENV {self.count}"
+        return f"ACQ: {self.mode.upper()}"
@@ -0,0 +1,158 @@
+"""
+acquisition.py
+
+Background acquisition for the real-time oscilloscope.
+A worker thread calls a producer (signal generator now, hardware reads
+later) at a fixed rate and publishes each completed frame through a
+single-slot handoff. The UI takes the newest frame when it is ready to
+draw; older unread frames are replaced and counted as dropped, so the
+UI never blocks on acquisition and never renders a stale backlog.
+This file contains no UI code and no plotting code.
+"""
+import threading
+import time
+
+
+class AcquiredFrame:
+    """One acquisition: a (channels, samples) array plus metadata."""
+
+    def __init__(self, index, data, fs, timestamp, changed=None):
+        self.index = index            # running frame number
+        self.data = data              # numpy array (channels, samples)
+        self.fs = fs                  # sampling rate (Hz)
+        self.timestamp = timestamp    # time.time() at capture
+        # Per-channel bool array: False where the samples are identical
+        # to the previous frame. None means "assume all changed".
+        self.changed = changed
+
+
+class FrameSlot:
+    """Bounded (one-frame) handoff with latest-frame-wins semantics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self.published = 0
+        self.taken = 0
+        self.dropped = 0      # frames replaced before anyone took them
+
+    def publish(self, frame):
+        with self._lock:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self.published += 1
+
+    def take(self):
+        """Return the newest frame (or None) without blocking."""
+        with self._lock:
+            frame, self._frame = self._frame, None
+            if frame is not None:
+                self.taken += 1
+            return frame
+
+
+class AcquisitionWorker:
+    """
+    Runs producer() on a daemon thread, rate_hz times per second.
+
+    producer must return (data, fs), or (data, fs, changed) with the
+    per-channel flags of AcquiredFrame.changed, or None when it has
+    no frame this time (e.g. paused playback). It must not touch Tk:
+    the UI passes it plain values (see HomePage._snapshot_generator).
+    sinks are called on the worker thread with every frame, including
+    frames the UI never displays (e.g. for recording).
+
+    A failing producer or sink does not stop the thread: the exception
+    is kept in .error (cleared again by the next clean frame) and
+    acquisition goes on.
+    """
+
+    def __init__(self, producer, rate_hz=60.0, sinks=()):
+        self.producer = producer
+        self.rate_hz = float(rate_hz)
+        self.sinks = list(sinks)
+        self.slot = FrameSlot()
+        self.error = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None       # None once the thread has exited
+        self._index = 0
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    @property
+    def dropped(self):
+        return self.slot.dropped
+
+    def start(self):
+        """Start the thread, or keep one that is still stopping."""
+        with self._lock:
+            self._stop.clear()
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="acquisition", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Ask the thread to stop and wait up to timeout for it. If it is
+        still busy (e.g. in a slow producer) it stays .running and a
+        later start() resumes it instead of starting a second one.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _stopping(self):
+        """True when asked to stop; the thread then forgets itself."""
+        with self._lock:
+            if not self._stop.is_set():
+                return False
+            self._thread = None
+            return True
+
+    def _report(self, what, exc):
+        if self.error is None:
+            print(f"[Acquisition] {what} failed: {exc!r}")
+        self.error = exc
+
+    def _run(self):
+        next_time = time.perf_counter()
+        while not self._stopping():
+            period = 1.0 / self.rate_hz
+            try:
+                result = self.producer()
+            except Exception as exc:   # keep acquiring; report once
+                self._report("Producer", exc)
+                self._stop.wait(period)
+                continue
+
+            if result is not None:
+                data, fs, *changed = result
+                frame = AcquiredFrame(self._index, data, fs, time.time(),
+                                      *changed)
+                self._index += 1
+                ok = True
+                for sink in self.sinks:
+                    try:
+                        sink(frame)
+                    except Exception as exc:
+                        self._report("Sink", exc)
+                        ok = False
+                self.slot.publish(frame)
+                if ok:
+                    self.error = None
+
+            # Fixed-rate pacing; if we fell behind, restart the schedule
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                next_time = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
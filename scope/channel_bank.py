@@ -0,0 +1,160 @@
+"""
+channel_bank.py
+
+Structure-of-arrays storage for all oscilloscope channels.
+Samples for every channel live in one preallocated (channels, samples)
+array, and the per-channel vertical settings are parallel NumPy
+vectors, so scaling, FFT and measurements can run as single vectorized
+calls across all channels.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+COUPLINGS = ("DC", "AC", "GND")
+
+
+class ChannelBank:
+    """
+    Sample and settings storage for n_channels channels.
+
+    The sample buffer is allocated once and only reallocated when a
+    longer record is written; .data is always a (n_channels, n_samples)
+    view of it. A channel has no signal until it is first written
+    (see .valid).
+    """
+
+    def __init__(self, n_channels, n_samples=0, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self._buffer = np.zeros((n_channels, n_samples), dtype=self.dtype)
+        self._n_samples = n_samples
+
+        # Per-channel state, one entry per channel
+        self.valid = np.zeros(n_channels, dtype=bool)
+        self.scale = np.ones(n_channels)                 # V/div
+        self.offset = np.zeros(n_channels)               # V
+        self.probe = np.ones(n_channels)                 # x1, x10, x100
+        self.coupling = np.zeros(n_channels, dtype=np.int8)  # COUPLINGS
+
+        # Bumped on every sample write, so derived data (indexes,
+        # caches) can tell whether it is stale. row_version does the
+        # same per channel, so per-channel work can skip unchanged rows.
+        self.version = 0
+        self.row_version = np.zeros(n_channels, dtype=np.int64)
+
+    # ---------- SHAPE ----------
+    @property
+    def n_channels(self):
+        return self._buffer.shape[0]
+
+    @property
+    def n_samples(self):
+        return self._n_samples
+
+    @property
+    def data(self):
+        """(n_channels, n_samples) view of the current record."""
+        return self._buffer[:, :self._n_samples]
+
+    def resize(self, n_samples):
+        """
+        Change the record length. Reallocates only when growing past
+        the current capacity; existing samples are kept where they fit.
+        """
+        n_samples = int(n_samples)
+        if n_samples == self._n_samples:
+            return
+        if n_samples > self._buffer.shape[1]:
+            buffer = np.zeros((self.n_channels, n_samples), dtype=self.dtype)
+            keep = self._n_samples
+            buffer[:, :keep] = self._buffer[:, :keep]
+            self._buffer = buffer
+        self._n_samples = n_samples
+
+    # ---------- WRITE / READ ----------
+    def write(self, index, sig):
+        """Copy one channel's samples into the bank."""
+        sig = np.asarray(sig)
+        if len(sig) != self._n_samples:
+            # Other channels no longer match the record length
+            self.resize(len(sig))
+            self.valid[:] = False
+        self._buffer[index, :len(sig)] = sig
+        self.valid[index] = True
+        self.row_version[index] += 1
+        self.version += 1
+
+    def write_all(self, signals, changed=None):
+        """
+        Copy one record per channel (array or list of arrays).
+        changed (one bool per channel) lets rows known to be identical
+        to what the bank already holds skip the copy and keep their
+        row_version. Ignored when the record length changes.
+        """
+        if len(signals) == 0:
+            return
+        n = len(signals)
+        if changed is None or len(signals[0]) != self._n_samples:
+            changed = np.ones(n, dtype=bool)
+        else:
+            changed = np.asarray(changed[:n], dtype=bool) | ~self.valid[:n]
+            if not changed.any():
+                return
+        self.resize(len(signals[0]))
+        data = self.data
+        for i in np.flatnonzero(changed):
+            data[i] = signals[i]
+        self.valid[:n] = True
+        self.row_version[:n] += changed
+        self.version += 1
+
+    def signal(self, index):
+        """Samples of one channel (a view), or None if never written."""
+        if not self.valid[index]:
+            return None
+        return self._buffer[index, :self._n_samples]
+
+    def invalidate(self, index):
+        self.valid[index] = False
+        self.row_version[index] += 1
+        self.version += 1
+
+    # ---------- VERTICAL SETTINGS ----------
+    def get_coupling(self, index):
+        return COUPLINGS[self.coupling[index]]
+
+    def set_coupling(self, index, coupling):
+        self.coupling[index] = COUPLINGS.index(coupling)
+
+    def dc_level(self):
+        """Per-channel mean of the current record (used by AC coupling)."""
+        if self._n_samples == 0:
+            return np.zeros(self.n_channels)
+        return self.data.mean(axis=1)
+
+    def to_display(self, y, rows=None, dc=None):
+        """
+        Apply coupling, scale and offset to samples taken from this bank.
+
+        y is (len(rows), m): full records or points picked from them
+        (e.g. decimated). The AC level is always the mean of the full
+        record, so decimated and full data map the same way.
+        """
+        rows = np.arange(self.n_channels) if rows is None else rows
+        coupling = self.coupling[rows]
+        y = np.asarray(y, dtype=float)
+
+        is_ac = coupling == COUPLINGS.index("AC")
+        if not is_ac.any():
+            shift = np.zeros(len(coupling))
+        else:
+            if dc is None:
+                dc = self.dc_level()
+            shift = np.where(is_ac, dc[rows], 0.0)
+        gain = np.where(
+            coupling == COUPLINGS.index("GND"), 0.0, self.scale[rows]
+        )
+        return gain[:, None] * (y - shift[:, None]) + self.offset[rows, None]
+
+    def display(self):
+        """Display values of every channel as one (channels, n) array."""
+        return self.to_display(self.data)
@@ -0,0 +1,121 @@
+"""
+decimation.py
+
+Display decimation for oscilloscope traces.
+Reduces a long sample array to a few points per screen pixel column
+before it is handed to matplotlib, so render cost depends on the
+canvas width instead of the record length.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+METHODS = ("minmax", "lttb")
+
+
+def minmax_decimate(y, n_bins, x=None):
+    """
+    Peak-preserving min/max decimation (scope "peak detect" display).
+
+    Splits the last axis of y into n_bins columns and keeps the minimum
+    and the maximum of each column, in time order, so a single-sample
+    glitch survives any amount of decimation.
+
+    y may be 1-D (samples) or 2-D (channels, samples). Returns (xs, ys)
+    with 2 * n_bins points per channel; xs are sample indices, or the
+    matching values of x when it is given. Short inputs are returned
+    unchanged.
+    """
+    y = np.asarray(y)
+    n = y.shape[-1]
+    n_bins = int(n_bins)
+    if n_bins < 1 or n <= 2 * n_bins:
+        idx = np.arange(n)
+        if y.ndim == 2:
+            idx = np.broadcast_to(idx, y.shape)
+        return (idx if x is None else np.asarray(x)[idx]), y
+
+    # Equal-width bins over the head; the remainder becomes one more bin
+    bin_size = n // n_bins
+    n_head = bin_size * n_bins
+    head = y[..., :n_head].reshape(y.shape[:-1] + (n_bins, bin_size))
+
+    starts = np.arange(n_bins) * bin_size
+    i_min = head.argmin(axis=-1) + starts
+    i_max = head.argmax(axis=-1) + starts
+
+    if n_head < n:
+        tail = y[..., n_head:]
+        i_min = np.concatenate(
+            [i_min, tail.argmin(axis=-1)[..., None] + n_head], axis=-1)
+        i_max = np.concatenate(
+            [i_max, tail.argmax(axis=-1)[..., None] + n_head], axis=-1)
+
+    # Interleave as (first, second) of each bin to keep time order
+    idx = np.stack(
+        [np.minimum(i_min, i_max), np.maximum(i_min, i_max)], axis=-1
+    ).reshape(i_min.shape[:-1] + (-1,))
+
+    ys = np.take_along_axis(y, idx, axis=-1)
+    xs = idx if x is None else np.asarray(x)[idx]
+    return xs, ys
+
+
+def lttb_decimate(y, n_out, x=None):
+    """
+    Largest-Triangle-Three-Buckets downsampling of a 1-D trace.
+
+    Keeps the visual shape of the trace with n_out points. Smoother
+    than min/max but not guaranteed to keep every glitch. The loop runs
+    once per output point; the work inside each bucket is vectorized.
+    A 2-D (channels, samples) input is decimated row by row.
+    """
+    y = np.asarray(y)
+    if y.ndim == 2:
+        rows = [lttb_decimate(row, n_out, x=x) for row in y]
+        return (np.array([xs for xs, _ in rows]),
+                np.array([ys for _, ys in rows]))
+    n = len(y)
+    n_out = int(n_out)
+    xs = np.arange(n) if x is None else np.asarray(x)
+    if n_out < 3 or n <= n_out:
+        return xs, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+
+        # Average point of the next bucket (or the last sample)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            avg_x = xs[nlo:nhi].mean()
+            avg_y = y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = xs[-1], y[-1]
+
+        ax, ay = xs[a], y[a]
+        area = np.abs(
+            (ax - avg_x) * (y[lo:hi] - ay) - (ax - xs[lo:hi]) * (avg_y - ay)
+        )
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+
+    return xs[selected], y[selected]
+
+
+def decimate(y, n_pixels, method="minmax", x=None):
+    """
+    Reduce a trace to what fits in n_pixels screen columns.
+
+    method "minmax" keeps two points per column (peak detect),
+    "lttb" keeps the same number of points chosen by LTTB.
+    """
+    if method == "minmax":
+        return minmax_decimate(y, n_pixels, x=x)
+    if method == "lttb":
+        return lttb_decimate(y, 2 * int(n_pixels), x=x)
+    raise ValueError(f"Unknown decimation method: {method!r}")
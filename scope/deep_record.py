@@ -0,0 +1,192 @@
+"""
+deep_record.py
+
+Deep-memory capture backed by memory-mapped files.
+Each channel is one np.memmap file on local disk, preallocated to the
+record capacity, and acquisition appends to it. A min/max pyramid
+(see pyramid.py) is built alongside and saved next to the files, so
+zoomed-out views and region statistics read the index instead of the
+samples. The index is coarse (INDEX_BLOCK samples per finest block),
+so it stays in RAM at under 1 % of the record size. Raw reads only
+touch the requested range, in fixed-size chunks, so memory use is
+bounded by the chunk size and the screen width, not by the record
+length (hundreds of millions of samples).
+This file contains no UI code and no plotting code.
+"""
+import json
+import os
+
+import numpy as np
+
+from .pyramid import MinMaxPyramid
+
+CHUNK = 1 << 20            # samples per channel read at a time
+INDEX_BLOCK = 1024         # samples per finest index block (RAM < 1 %)
+HEADER = "record.json"
+INDEX = "index.npz"
+
+
+class DeepRecord:
+    """
+    Append-only multi-channel record of up to `capacity` samples.
+
+    Open with mode="w+" to create (or truncate) a record in `path`, or
+    mode="r" / "r+" to reopen one; the header file stores the channel
+    count, dtype, sampling rate and current length. .pyramid is the
+    min/max index; it is rebuilt on open if the saved one is missing.
+    """
+
+    def __init__(self, path, n_channels=None, capacity=None,
+                 dtype=np.float32, fs=None, mode="w+"):
+        self.path = path
+        self.mode = mode
+        if mode == "w+":
+            os.makedirs(path, exist_ok=True)
+            self.n_channels = int(n_channels)
+            self.capacity = int(capacity)
+            self.dtype = np.dtype(dtype)
+            self.fs = fs
+            self.length = 0
+            self._write_header()
+        else:
+            with open(os.path.join(path, HEADER), encoding="utf-8") as f:
+                header = json.load(f)
+            self.n_channels = header["n_channels"]
+            self.capacity = header["capacity"]
+            self.dtype = np.dtype(header["dtype"])
+            self.fs = header["fs"]
+            self.length = header["length"]
+
+        self._maps = [
+            np.memmap(self._channel_file(i), dtype=self.dtype,
+                      mode=mode, shape=(self.capacity,))
+            for i in range(self.n_channels)
+        ]
+        self.pyramid = self._open_index()
+
+    def _open_index(self):
+        path = os.path.join(self.path, INDEX)
+        if self.mode != "w+" and os.path.exists(path):
+            pyramid = MinMaxPyramid.load(path)
+            if pyramid.length == self.length:
+                return pyramid
+        # New record, or no usable index: build it in one pass
+        pyramid = MinMaxPyramid(self.n_channels, block=INDEX_BLOCK,
+                                dtype=self.dtype)
+        for _, data in self.chunks(0, self.length):
+            pyramid.append(data)
+        return pyramid
+
+    def _channel_file(self, index):
+        return os.path.join(self.path, f"ch{index + 1}.bin")
+
+    def _write_header(self):
+        header = {
+            "n_channels": self.n_channels,
+            "capacity": self.capacity,
+            "dtype": self.dtype.str,
+            "fs": self.fs,
+            "length": self.length,
+        }
+        with open(os.path.join(self.path, HEADER), "w",
+                  encoding="utf-8") as f:
+            json.dump(header, f, indent=2)
+
+    @property
+    def full(self):
+        return self.length >= self.capacity
+
+    # ---------- WRITE ----------
+    def append(self, block):
+        """
+        Append a (channels, k) block; returns how many samples fitted
+        (fewer than k once the record is full).
+        """
+        block = np.asarray(block)
+        k = min(block.shape[1], self.capacity - self.length)
+        if k <= 0:
+            return 0
+        for mm, row in zip(self._maps, block):
+            mm[self.length:self.length + k] = row[:k]
+        self.pyramid.append(block[:, :k])
+        self.length += k
+        return k
+
+    def flush(self):
+        for mm in self._maps:
+            mm.flush()
+        if self.mode != "r":
+            self._write_header()
+            self.pyramid.save(os.path.join(self.path, INDEX))
+
+    def close(self):
+        self.flush()
+        self._maps = []
+
+    # ---------- READ ----------
+    def _clip(self, start, stop):
+        start = max(0, int(start))
+        stop = min(int(stop), self.length)
+        return start, max(start, stop)
+
+    def read(self, start, stop, rows=None):
+        """Samples [start, stop) as a (channels, n) in-memory copy."""
+        start, stop = self._clip(start, stop)
+        rows = range(self.n_channels) if rows is None else rows
+        return np.stack([
+            np.array(self._maps[i][start:stop]) for i in rows
+        ])
+
+    def chunks(self, start, stop, size=CHUNK):
+        """Yield (offset, (channels, m) block) pieces of [start, stop)."""
+        start, stop = self._clip(start, stop)
+        for a in range(start, stop, size):
+            yield a, self.read(a, min(a + size, stop))
+
+    def window(self, start, stop, n_pixels):
+        """
+        Display points for samples [start, stop): the raw samples when
+        they fit in 2 * n_pixels points, otherwise a min/max pair per
+        pixel column. Wide views come from the pyramid in O(pixels);
+        close zooms (under one index block per pixel) are computed
+        from the samples, chunk by chunk. Returns (xs, ys) with xs
+        (points,) absolute sample positions and ys (channels, points).
+        """
+        start, stop = self._clip(start, stop)
+        n_pixels = max(int(n_pixels), 1)
+        if stop - start <= 2 * n_pixels:
+            return np.arange(start, stop), self.read(start, stop)
+        points = self.pyramid.render(start, stop, n_pixels, self.read)
+        if points is not None:
+            return points
+
+        edges = np.linspace(start, stop, n_pixels + 1).astype(np.int64)
+        lo = np.full((self.n_channels, n_pixels), np.inf)
+        hi = np.full((self.n_channels, n_pixels), -np.inf)
+        for a, data in self.chunks(start, stop):
+            b = a + data.shape[1]
+            # Pixel columns overlapping this chunk, clipped to it
+            i0 = np.searchsorted(edges, a, side="right") - 1
+            i1 = np.searchsorted(edges, b, side="left")
+            local = np.clip(edges[i0:i1], a, b) - a
+            np.minimum(lo[:, i0:i1],
+                       np.minimum.reduceat(data, local, axis=1),
+                       out=lo[:, i0:i1])
+            np.maximum(hi[:, i0:i1],
+                       np.maximum.reduceat(data, local, axis=1),
+                       out=hi[:, i0:i1])
+
+        ys = np.empty((self.n_channels, 2 * n_pixels))
+        ys[:, 0::2] = lo
+        ys[:, 1::2] = hi
+        return np.repeat(edges[:-1], 2), ys
+
+    def stats(self, start, stop):
+        """
+        Per-channel n, sum, mean, rms, min, max and peak of [start,
+        stop) (same keys as RegionIndex.stats). Answered from the
+        pyramid's coarse blocks; only the partial blocks at the two
+        edges are read from disk.
+        """
+        start, stop = self._clip(start, stop)
+        return self.pyramid.stats(start, stop, self.read)
@@ -0,0 +1,173 @@
+"""
+dsp_executor.py
+
+Parallel execution of per-channel analysis (FFT, measurements, ...).
+A (channels, samples) block is split into row chunks that run on a
+thread pool (NumPy releases the GIL for most of this work) or, for
+heavy jobs, on a process pool reading the block from shared memory.
+Jobs are pipelined: submit() this frame, collect() on the next one,
+so analysis overlaps with rendering instead of blocking it.
+mode="serial" runs everything inline, for debugging.
+This file contains no UI code and no plotting code.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MODES = ("serial", "thread", "process")
+
+
+def _run_shared(name, shape, dtype, start, stop, func, args):
+    """Process-pool task: run func on rows [start, stop) of a shm block."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        return func(block[start:stop], *args)
+    finally:
+        shm.close()
+
+
+class _SharedBlock:
+    """A reusable shared-memory array that grows when needed."""
+
+    def __init__(self):
+        self.shm = None
+
+    def load(self, data):
+        if self.shm is None or self.shm.size < data.nbytes:
+            self.release()
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=max(data.nbytes, 1)
+            )
+        view = np.ndarray(data.shape, dtype=data.dtype, buffer=self.shm.buf)
+        view[...] = data
+        return self.shm.name
+
+    def release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class _Job:
+    def __init__(self, futures, tag, results=None):
+        self.futures = futures
+        self.tag = tag
+        self.results = results
+
+    def done(self):
+        return self.results is not None or all(
+            f.done() for f in self.futures
+        )
+
+    def result(self):
+        if self.results is None:
+            self.results = [f.result() for f in self.futures]
+        return self.results
+
+
+class DSPExecutor:
+    """
+    Fan per-channel work out to a pool and gather it for the next frame.
+
+    func(rows, *args) receives a (k, samples) block of rows and must be
+    a module-level function in process mode (it is pickled). Results
+    come back as a list with one entry per chunk, in row order.
+    """
+
+    def __init__(self, mode="thread", max_workers=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown DSP mode: {mode!r}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._jobs = {}       # key -> in-flight or finished _Job
+        self._shared = {}     # key -> _SharedBlock (process mode)
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "thread":
+                self._pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="dsp")
+            else:
+                self._pool = ProcessPoolExecutor(self.max_workers)
+        return self._pool
+
+    def _chunks(self, n_rows):
+        n_chunks = max(1, min(n_rows, self.max_workers))
+        bounds = np.linspace(0, n_rows, n_chunks + 1).astype(int)
+        return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    def submit(self, key, func, data, *args, tag=None):
+        """
+        Start func over the rows of data. Returns False (and does
+        nothing) if the previous job for key is still running, so a
+        slow analysis coalesces frames instead of queueing them.
+        tag is handed back by collect() (e.g. which channels).
+        """
+        job = self._jobs.get(key)
+        if job is not None and not job.done():
+            return False
+
+        data = np.asarray(data)
+        if self.mode == "serial":
+            self._jobs[key] = _Job([], tag, [func(data, *args)])
+            return True
+
+        pool = self._get_pool()
+        if self.mode == "thread":
+            # Copy: the caller may overwrite its buffer next frame
+            data = np.array(data)
+            futures = [
+                pool.submit(func, data[a:b], *args)
+                for a, b in self._chunks(data.shape[0])
+            ]
+        else:
+            shared = self._shared.setdefault(key, _SharedBlock())
+            name = shared.load(data)
+            futures = [
+                pool.submit(_run_shared, name, data.shape, data.dtype.str,
+                            a, b, func, args)
+                for a, b in self._chunks(data.shape[0])
+            ]
+        self._jobs[key] = _Job(futures, tag)
+        return True
+
+    def collect(self, key):
+        """
+        (tag, results) of the last finished job for key, or None if it
+        is still running or nothing was submitted. Never blocks.
+        Each finished job is returned once.
+        """
+        job = self._jobs.get(key)
+        if job is None or not job.done():
+            return None
+        del self._jobs[key]
+        return job.tag, job.result()
+
+    def run(self, func, data, *args):
+        """Blocking version of submit() + collect()."""
+        data = np.asarray(data)
+        if self.mode == "serial":
+            return [func(data, *args)]
+        key = object()
+        self.submit(key, func, data, *args)
+        job = self._jobs.pop(key)
+        try:
+            return job.result()
+        finally:
+            shared = self._shared.pop(key, None)
+            if shared is not None:
+                shared.release()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for shared in self._shared.values():
+            shared.release()
+        self._shared.clear()
+        self._jobs.clear()
@@ -0,0 +1,272 @@
+"""
+engine.py
+
+Headless acquisition and analysis engine.
+ScopeEngine owns the whole path from a signal source to numbers: the
+generator, the capture history, the channel bank, the trigger, the
+acquisition mode, the measurements and the spectrum. It depends on
+neither Tk nor matplotlib, so the same pipeline runs inside the GUI
+(HomePage feeds it control snapshots and draws what it holds) and on
+a server or in CI at full speed (acquire() / run()).
+This file contains no UI code and no plotting code.
+"""
+import time
+
+import numpy as np
+
+from .acq_modes import AcqEngine
+from .acquisition import AcquiredFrame
+from .channel_bank import ChannelBank
+from .dds import DDSGenerator
+from .measurements import MeasurementEngine, measure_rows
+from .noise import NoiseSource
+from .ring_buffer import RingBuffer
+from .signal_cache import SignalCache
+from .sources import SyntheticSource
+from .spectrum import SpectrumEngine, amplitude_spectrum
+from .trigger import TriggerEngine
+
+
+class ScopeEngine:
+    """
+    n_channels channels of n_samples-point records at fs Hz.
+
+    .channel_settings holds the generator's per-channel
+    (sig_type, freq, amp, noise_amp, noise_color) tuples (see
+    set_channel); .source is the active SignalSource, the generator
+    unless set_source() picked another one.
+    """
+
+    def __init__(self, n_channels=2, n_samples=500, fs=500.0,
+                 ring_capacity=100000, seed=None, cache_size=32):
+        self.n_samples = int(n_samples)
+        self.fs = float(fs)
+        self._generator_fs = None     # generator rate while another plays
+        self.roll = False
+        self.frames = 0               # frames acquired by acquire()
+
+        # Channel samples and vertical settings, plus capture history
+        self.bank = ChannelBank(n_channels, self.n_samples)
+        self.ring = RingBuffer(
+            n_channels, max(int(ring_capacity), self.n_samples))
+
+        # Sources: phase-continuous generator with pooled noise
+        self.dds = DDSGenerator(
+            n_channels, cache=SignalCache(maxsize=cache_size))
+        self.noise = NoiseSource(seed=seed)
+        self.synthetic = SyntheticSource(self.dds, self.noise)
+        self.source = self.synthetic
+        self.channel_settings = [
+            ("sine", 5.0, 1.0, 0.0, "white") for _ in range(n_channels)
+        ]
+
+        # Trigger; its sub-sample part shifts the display on x
+        self.trigger = TriggerEngine(level=0.0, slope="rising")
+        self.trigger_source = 0
+        self.trigger_shift = 0.0
+
+        # Acquisition mode, folded into every newly loaded record;
+        # acq_bins is the min/max column count (display width)
+        self.acq = AcqEngine(mode="sample", n_avg=16)
+        self.acq_bins = None
+
+        # Analysis
+        self.measure = MeasurementEngine()
+        self.spectrum = SpectrumEngine(window="hann")
+
+    @property
+    def n_channels(self):
+        return self.bank.n_channels
+
+    # ---------- SOURCES ----------
+    def set_channel(self, index, sig_type=None, freq=None, amp=None,
+                    noise_amp=None, noise_color=None):
+        """Change generator settings of one channel (None keeps)."""
+        old = self.channel_settings[index]
+        new = (sig_type, freq, amp, noise_amp, noise_color)
+        self.channel_settings[index] = tuple(
+            o if n is None else n for o, n in zip(old, new))
+
+    def generator_settings(self):
+        """Plain snapshot for SyntheticSource.settings."""
+        return (tuple(self.channel_settings), self.n_samples, self.fs,
+                self.roll)
+
+    def set_source(self, source):
+        """
+        Acquire from source (None: the generator); closes the old one.
+        A source that knows its sampling rate sets .fs; going back to
+        the generator restores its rate.
+        """
+        source = source or self.synthetic
+        if self.source is not self.synthetic and self.source is not source:
+            self.source.close()
+        if self.source is self.synthetic and source is not self.synthetic:
+            self._generator_fs = self.fs
+        elif source is self.synthetic and self._generator_fs is not None:
+            self.fs, self._generator_fs = self._generator_fs, None
+        self.source = source
+        if source is not self.synthetic and source.fs:
+            self.fs = float(source.fs)
+
+    def produce(self):
+        """
+        One frame of the active source as (data, fs[, changed]), or
+        None. Safe to use as an AcquisitionWorker producer.
+        """
+        source = self.source
+        if source is self.synthetic and source.settings is None:
+            source.settings = self.generator_settings()
+        result = source.read()
+        if result is None or source is self.synthetic:
+            return result
+        data, fs, *changed = result
+        return (self.fit_channels(data), fs, *changed)
+
+    def fit_channels(self, data):
+        """Pad or trim a source's rows to this engine's channel count."""
+        n = self.n_channels
+        if data.shape[0] == n:
+            return data
+        fitted = np.zeros((n, data.shape[1]))
+        m = min(n, data.shape[0])
+        fitted[:m] = data[:m]
+        return fitted
+
+    # ---------- FRAMES ----------
+    def store_history(self, frame):
+        """Append a frame to the capture history (any thread)."""
+        with self.ring.lock:
+            self.ring.write(frame.data)
+
+    def load(self, frame, roll=None):
+        """
+        Load the display record for a new frame into the bank: the
+        newest n_samples of history in roll mode, otherwise the
+        trigger-aligned window. A new record then goes through the
+        acquisition mode (averaged in place, or added to the min/max
+        trace). .fs follows the frame, so the analysis always uses the
+        rate the record was taken at.
+        """
+        self.fs = float(frame.fs)
+        roll = self.roll if roll is None else roll
+        version = self.bank.version
+        if roll:
+            self.trigger_shift = 0.0
+            with self.ring.lock:
+                self.bank.write_all(self.ring.read_latest(self.n_samples))
+        else:
+            self.load_triggered(frame)
+        if self.bank.version != version:
+            self.acq.update(self.bank.data, self.acq_bins)
+
+    def load_triggered(self, frame):
+        """
+        Load the window aligned to the newest trigger point.
+        The search runs over the last 2 * n_samples of the capture
+        history, which holds every acquired sample in order. Without a
+        trigger the bank is left alone, except in auto mode.
+        """
+        trig = self.trigger
+        n = self.n_samples
+        if (
+            frame.changed is not None and not frame.changed.any() and
+            trig.status == "TRIG'D" and trig.mode != "single"
+        ):
+            # Identical periodic frame: the aligned window is unchanged
+            return
+
+        with self.ring.lock:
+            span = self.ring.read_latest(2 * n)
+            start = self.ring.end - span.shape[1]
+            pos = trig.locate(span[self.trigger_source], start, n, frame.fs)
+            if pos is not None:
+                first = int(np.floor(pos))
+                self.trigger_shift = pos - first
+                self.bank.write_all(self.ring.read(first, first + n))
+                return
+
+        if trig.status == "AUTO":
+            self.trigger_shift = 0.0
+            self.bank.write_all(frame.data, frame.changed)
+
+    # ---------- ANALYSIS ----------
+    # The *_job() methods describe an analysis of the current record as
+    # (func, data, *args) with stateless func, so it can run here or on
+    # a DSPExecutor (the GUI pipelines it across frames); both give the
+    # same numbers at the same .fs.
+    def _rows(self, rows):
+        data = self.bank.data
+        if rows is None or len(rows) == self.n_channels:
+            return data
+        return data[rows]
+
+    def measure_job(self, names=None, rows=None):
+        """Measurement of rows (default: all) as (func, data, *args)."""
+        names = self.measure.required if names is None else tuple(names)
+        return measure_rows, self._rows(rows), self.fs, names
+
+    def measurements(self, names=None, rows=None):
+        """
+        {name: per-row values} for the current record, all rows in one
+        vectorized pass (names default to what displays require).
+        """
+        func, *args = self.measure_job(names, rows)
+        return func(*args)
+
+    def spectrum_job(self, index):
+        """
+        Raw spectrum of one channel as (func, data, *args); feed its
+        (freqs, mags) result to self.spectrum.process().
+        """
+        spec = self.spectrum
+        return (amplitude_spectrum, self.bank.data[index:index + 1],
+                self.fs, spec.window, spec.zero_pad)
+
+    def spectrum_of(self, index):
+        """(freqs, values) of one channel through the spectrum engine."""
+        func, *args = self.spectrum_job(index)
+        freqs, mag = func(*args)
+        return self.spectrum.process(freqs, mag[0])
+
+    # ---------- HEADLESS ----------
+    def acquire(self):
+        """
+        Pull one frame from the source, record it in the history and
+        load it into the bank. Returns the AcquiredFrame, or None if
+        the source had nothing ready.
+        """
+        result = self.produce()
+        if result is None:
+            return None
+        data, fs, *changed = result
+        frame = AcquiredFrame(self.frames, data, fs, time.time(), *changed)
+        self.frames += 1
+        self.store_history(frame)
+        self.load(frame)
+        return frame
+
+    def run(self, frames=None, seconds=None, on_frame=None):
+        """
+        Acquire as fast as the source delivers until `frames` frames
+        or `seconds` have passed (or a replayed capture ends), calling
+        on_frame(frame) after each. Returns the number of frames.
+        """
+        if frames is None and seconds is None:
+            raise ValueError("run() needs frames or seconds")
+        self.trigger.arm()
+        self.synthetic.settings = self.generator_settings()
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        count = 0
+        while frames is None or count < frames:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            frame = self.acquire()
+            if frame is None:
+                if getattr(self.source, "finished", False):
+                    break
+                continue
+            count += 1
+            if on_frame is not None:
+                on_frame(frame)
+        return count
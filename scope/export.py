@@ -0,0 +1,210 @@
+"""
+export.py
+
+Bulk export of channel data to CSV, NPY, NPZ or raw binary.
+Data is pulled through a read(start, stop) -> (channels, n) callable
+(an in-memory array, DeepRecord.read, ...) one chunk at a time and
+streamed to the file, so memory use is set by the chunk size, not the
+record length. CSV rows are formatted a whole chunk at a time with one
+%-format call; NPY, NPZ and binary files get a JSON sidecar
+(<file>.json) describing sampling rate, layout and channel settings.
+ExportJob runs an export on a background thread with progress and
+cancellation.
+This file contains no UI code and no plotting code.
+"""
+import json
+import os
+import threading
+import time
+import zipfile
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+FORMATS = ("csv", "npy", "npz", "bin")
+EXTENSIONS = {".csv": "csv", ".npy": "npy", ".npz": "npz",
+              ".bin": "bin", ".raw": "bin"}
+CHUNK = 1 << 16           # samples per channel per write
+CSV_ROWS = 8192           # rows per format call (bounds GIL hold time)
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its job was cancelled."""
+
+
+def format_for(path):
+    """Export format implied by the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unknown export file type: {ext!r}")
+    return EXTENSIONS[ext]
+
+
+def array_reader(data):
+    """read(start, stop) over an in-memory (channels, n) array."""
+    data = np.asarray(data)
+    return lambda start, stop: data[:, start:stop]
+
+
+def export_data(path, read, start, stop, fs, channels, fmt=None,
+                dtype=np.float32, chunk=CHUNK, progress=None):
+    """
+    Write samples [start, stop) of every channel to path.
+
+    read(a, b) returns the (channels, b - a) samples; channels is a
+    list of dicts (name, scale, offset, ...) for the header/sidecar.
+    progress(done, total) is called after every chunk and may raise
+    ExportCancelled to abort. Returns the number of samples written.
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    start, stop = int(start), int(stop)
+    if stop <= start:
+        raise ValueError(f"Empty export range [{start}, {stop})")
+    dtype = np.dtype(dtype).newbyteorder("<")
+    n = stop - start
+    # NPZ streams one member at a time: one pass over the data each
+    passes = len(channels) if fmt == "npz" else 1
+    done = 0
+
+    def blocks():
+        """(offset, (channels, m) block) pieces of [start, stop)."""
+        nonlocal done
+        for a in range(start, stop, chunk):
+            b = min(a + chunk, stop)
+            yield a, np.asarray(read(a, b))
+            done += b - a
+            if progress is not None:
+                progress(done, n * passes)
+
+    writer = {
+        "csv": _write_csv, "npy": _write_npy,
+        "npz": _write_npz, "bin": _write_bin,
+    }[fmt]
+    layout = writer(path, blocks, start, n, fs, channels, dtype)
+    if fmt != "csv":
+        _write_sidecar(path, fmt, layout, start, n, fs, channels, dtype)
+    return n
+
+
+def _write_csv(path, blocks, start, n, fs, channels, dtype):
+    names = [ch["name"] for ch in channels]
+    # One "%.9g,...\n" template per row, applied to a whole chunk
+    row = ",".join(["%.9g"] * (len(names) + 1)) + "\n"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(["time"] + names) + "\n")
+        for a, data in blocks():
+            table = np.empty((data.shape[1], len(names) + 1))
+            table[:, 0] = np.arange(a, a + data.shape[1]) / fs
+            table[:, 1:] = data.T
+            for i in range(0, len(table), CSV_ROWS):
+                part = table[i:i + CSV_ROWS]
+                f.write((row * len(part)) % tuple(part.ravel()))
+    return "rows"
+
+
+def _write_npy(path, blocks, start, n, fs, channels, dtype):
+    out = npy_format.open_memmap(
+        path, mode="w+", dtype=dtype, shape=(len(channels), n))
+    for a, data in blocks():
+        out[:, a - start:a - start + data.shape[1]] = data
+    out.flush()
+    del out
+    return "channels x samples"
+
+
+def _write_npz(path, blocks, start, n, fs, channels, dtype):
+    # One uncompressed .npy member per channel, as np.savez writes
+    # them, so np.load(path)["CH1"] works
+    header = {"descr": npy_format.dtype_to_descr(dtype),
+              "fortran_order": False, "shape": (n,)}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED,
+                         allowZip64=True) as zf:
+        for i, ch in enumerate(channels):
+            name = f"{ch['name']}.npy"
+            with zf.open(name, "w", force_zip64=True) as member:
+                npy_format.write_array_header_2_0(member, header)
+                for _, data in blocks():
+                    member.write(data[i].astype(dtype).tobytes())
+    return "one array per channel"
+
+
+def _write_bin(path, blocks, start, n, fs, channels, dtype):
+    with open(path, "wb") as f:
+        for _, data in blocks():
+            # Interleaved: all channels of sample 0, then sample 1, ...
+            f.write(np.ascontiguousarray(data.T, dtype=dtype).tobytes())
+    return "samples x channels (interleaved)"
+
+
+def _write_sidecar(path, fmt, layout, start, n, fs, channels, dtype):
+    meta = {
+        "file": os.path.basename(path),
+        "format": fmt,
+        "dtype": dtype.str,
+        "layout": layout,
+        "fs": fs,
+        "start_sample": start,
+        "n_samples": n,
+        "n_channels": len(channels),
+        "channels": list(channels),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+class ExportJob:
+    """
+    export_data() on a daemon thread.
+
+    Poll .progress (0..1), .done and .error from the UI; cancel()
+    stops the export after the current chunk and removes the
+    partial file.
+    """
+
+    def __init__(self, path, read, start, stop, fs, channels, **options):
+        self.path = path
+        self.progress = 0.0
+        self.done = False
+        self.error = None
+        self.cancelled = False
+        self._args = (path, read, start, stop, fs, channels)
+        self._options = options
+        self._thread = threading.Thread(
+            target=self._run, name="export", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _on_progress(self, done, total):
+        self.progress = done / total
+        if self.cancelled:
+            raise ExportCancelled(self.path)
+
+    def _run(self):
+        try:
+            export_data(*self._args, progress=self._on_progress,
+                        **self._options)
+        except Exception as exc:
+            self.error = exc
+            for partial in (self.path, self.path + ".json"):
+                if os.path.exists(partial):
+                    os.remove(partial)
+        finally:
+            self.done = True
+
+    def status_text(self):
+        """Short status, e.g. 'Export 42%' or 'Export done'."""
+        if not self.done:
+            return f"Export {self.progress:.0%}"
+        if isinstance(self.error, ExportCancelled):
+            return "Export cancelled"
+        if self.error is not None:
+            return f"Export failed: {self.error}"
+        return "Export done"
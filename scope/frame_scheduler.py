@@ -0,0 +1,120 @@
+"""
+frame_scheduler.py
+
+Adaptive frame pacing for the real-time oscilloscope loop.
+Measures how long each frame takes, computes the delay until the next
+one for a target frame rate, counts frames that could not be delivered
+in time and slows down secondary work (FFT, measurements) under load.
+This file contains no UI code and no plotting code.
+"""
+import math
+import time
+
+
+class FrameScheduler:
+    """
+    Frame timing for an after()-driven loop.
+
+    Usage per frame:
+        scheduler.begin_frame()
+        ... work, using scheduler.due("fft") for secondary tasks ...
+        delay_ms = scheduler.end_frame()
+        widget.after(delay_ms, loop)
+
+    Only one frame is ever pending, so late frames are coalesced into
+    the next one instead of queueing up behind the Tk event loop.
+    """
+
+    def __init__(self, target_fps=60.0, max_divider=8, clock=None):
+        self.target_fps = float(target_fps)
+        self.max_divider = int(max_divider)   # slowest secondary rate
+        self.clock = clock or time.perf_counter
+        self.reset()
+
+    @property
+    def period(self):
+        return 1.0 / self.target_fps
+
+    def reset(self):
+        """Forget all timing history (call when the loop restarts)."""
+        self.frame_index = 0
+        self.frame_time = 0.0        # smoothed work time per frame (s)
+        self.fps = 0.0               # smoothed delivered frame rate
+        self.skipped_total = 0       # frames missed since reset
+        self.skipped_recent = 0      # frames missed in the last second
+        self._frame_start = None
+        self._last_start = None
+        self._window_start = None
+        self._window_skipped = 0
+        self._last_run = {}
+
+    # ---------- PER-FRAME TIMING ----------
+    def begin_frame(self):
+        now = self.clock()
+        if self._last_start is not None:
+            interval = now - self._last_start
+            if interval > 0:
+                self.fps = self._smooth(self.fps, 1.0 / interval)
+            # Every whole period beyond the first is a dropped frame
+            missed = max(0, int(interval / self.period + 0.5) - 1)
+            self.skipped_total += missed
+            self._window_skipped += missed
+
+        if self._window_start is None:
+            self._window_start = now
+        elif now - self._window_start >= 1.0:
+            self.skipped_recent = self._window_skipped
+            self._window_skipped = 0
+            self._window_start = now
+
+        self._last_start = now
+        self._frame_start = now
+        return now
+
+    def end_frame(self):
+        """Finish the frame and return the delay (ms) until the next one."""
+        now = self.clock()
+        start = self._frame_start if self._frame_start is not None else now
+        work = now - start
+        self.frame_time = self._smooth(self.frame_time, work)
+        self.frame_index += 1
+
+        # Leave the Tk event loop some idle time even when overloaded,
+        # proportional to the work so input stays responsive
+        remaining = self.period - work
+        min_idle = max(0.001, 0.25 * work)
+        return int(round(1000 * max(remaining, min_idle)))
+
+    # ---------- LOAD SHEDDING ----------
+    @property
+    def load(self):
+        """Work time as a fraction of the frame budget (1.0 = full)."""
+        return self.frame_time / self.period
+
+    def divider(self, base_every=1):
+        """How many frames apart a secondary task should run right now."""
+        scale = max(1, math.ceil(self.load)) if self.load > 1.0 else 1
+        return min(self.max_divider, max(1, int(base_every)) * scale)
+
+    def due(self, task, base_every=1):
+        """Return True if the named secondary task should run this frame."""
+        last = self._last_run.get(task)
+        if last is None or self.frame_index - last >= self.divider(base_every):
+            self._last_run[task] = self.frame_index
+            return True
+        return False
+
+    # ---------- STATUS ----------
+    @property
+    def skipping(self):
+        return self.skipped_recent > 0 or self._window_skipped > 0
+
+    def status_text(self):
+        """Short status-bar text: frame rate, or the recent skip count."""
+        if self.skipping:
+            return f"RT: SKIP {max(self.skipped_recent, self._window_skipped)}"
+        return f"RT: {self.fps:.0f} FPS"
+
+    @staticmethod
+    def _smooth(prev, value, alpha=0.2):
+        return value if prev == 0.0 else prev + alpha * (value - prev)
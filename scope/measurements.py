@@ -0,0 +1,296 @@
+"""
+measurements.py
+
+Batched automatic measurements for oscilloscope channels.
+All requested measurements are computed in one vectorized pass over a
+(channels, samples) block. Intermediates such as min/max, sum of
+squares and mid-level crossings are computed once and shared, and
+measurements nobody asked for are not computed at all.
+Mid-level crossings use the trigger's hysteresis, so noise around the
+level does not count as extra cycles; pulse top and base come from the
+histogram mode of each half of the signal.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+# Hysteresis band of the mid-level crossings, as a fraction of pk-pk
+HYSTERESIS = 0.1
+# Histogram bins used to find the pulse top and base
+LEVEL_BINS = 64
+
+MEASUREMENTS = (
+    "peak",       # max |x|
+    "pk2pk",      # max - min
+    "mean",
+    "rms",
+    "ac_rms",     # RMS with the mean removed
+    "freq",       # from mid-level rising crossings, with hysteresis (Hz)
+    "period",     # 1 / freq (s)
+    "duty",       # % of whole periods spent above mid-level
+    "rise",       # 10 % -> 90 % of the first rising edge (s)
+    "fall",       # 90 % -> 10 % of the first falling edge (s)
+    "overshoot",  # (max - top) / amplitude (%), top = histogram mode
+)
+
+LABELS = {
+    "peak": "Peak", "pk2pk": "Pk-Pk", "mean": "Mean", "rms": "RMS",
+    "ac_rms": "AC RMS", "freq": "Freq", "period": "Period",
+    "duty": "Duty", "rise": "Rise", "fall": "Fall",
+    "overshoot": "Overshoot",
+}
+
+UNITS = {
+    "peak": "", "pk2pk": "", "mean": "", "rms": "", "ac_rms": "",
+    "freq": "Hz", "period": "s", "duty": "%",
+    "rise": "s", "fall": "s", "overshoot": "%",
+}
+
+
+class _Frame:
+    """Lazily computed intermediates shared by all measurements."""
+
+    def __init__(self, data, fs):
+        self.x = np.atleast_2d(np.asarray(data, dtype=float))
+        self.fs = float(fs)
+        self.n = self.x.shape[1]
+        self._cache = {}
+
+    def get(self, name):
+        if name not in self._cache:
+            self._cache[name] = getattr(self, "_" + name)()
+        return self._cache[name]
+
+    def _max(self):
+        return self.x.max(axis=1)
+
+    def _min(self):
+        return self.x.min(axis=1)
+
+    def _mean(self):
+        return self.x.mean(axis=1)
+
+    def _sumsq(self):
+        # Row-wise sum of squares without a temporary x*x array
+        return np.einsum("ij,ij->i", self.x, self.x)
+
+    def _mid(self):
+        return 0.5 * (self.get("max") + self.get("min"))
+
+    def _above(self):
+        return self.x > self.get("mid")[:, None]
+
+    def _top_base(self):
+        """
+        Pulse top and base: the most common level in the upper and
+        lower half of the signal's histogram.
+
+        When that mode sits in the outermost bin the signal has no flat
+        top (sine, triangle) or no overshoot, and max/min are used.
+        """
+        x = self.x
+        lo = self.get("min")
+        span = self.get("max") - lo
+        nb = LEVEL_BINS
+        rows = x.shape[0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scaled = (x - lo[:, None]) * (nb / span)[:, None]
+        idx = np.clip(np.nan_to_num(scaled), 0, nb - 1).astype(np.intp)
+        idx += (np.arange(rows) * nb)[:, None]
+        counts = np.bincount(idx.ravel(), minlength=rows * nb)
+        counts = counts.reshape(rows, nb)
+
+        half = nb // 2
+        top_bin = half + counts[:, half:].argmax(axis=1)
+        base_bin = counts[:, :half].argmax(axis=1)
+        width = span / nb
+        top = np.where(top_bin == nb - 1, self.get("max"),
+                       lo + (top_bin + 0.5) * width)
+        base = np.where(base_bin == 0, lo, lo + (base_bin + 0.5) * width)
+        return top, base
+
+    def _cycles(self):
+        """
+        First/last interpolated rising crossing and cycle count.
+
+        Same rule as trigger.find_edges(), run over every row at once:
+        a rising crossing is the first sample at or above mid after one
+        below mid - band; samples inside the band keep the state.
+        """
+        x = self.x
+        rows = x.shape[0]
+        mid = self.get("mid")[:, None]
+        band = HYSTERESIS * (self.get("max") - self.get("min"))[:, None]
+        high = x >= mid
+        row, col = np.nonzero((x < mid - band) | high)
+        is_high = high[row, col]
+        fire = np.flatnonzero(
+            ~is_high[:-1] & is_high[1:] & (row[:-1] == row[1:])
+        ) + 1
+        row, col = row[fire], col[fire]
+
+        y0 = x[row, col - 1]
+        y1 = x[row, col]
+        frac = (mid[row, 0] - y0) / np.where(y1 != y0, y1 - y0, 1.0)
+        edges = col - 1 + np.clip(frac, 0.0, 1.0)
+
+        # Edges are sorted by row, then by time
+        count = np.bincount(row, minlength=rows)
+        t_first = np.zeros(rows)
+        t_last = np.zeros(rows)
+        if len(edges):
+            stop = np.cumsum(count)
+            found = count > 0
+            t_first[found] = edges[(stop - count)[found]]
+            t_last[found] = edges[stop[found] - 1]
+        return count, t_first, t_last
+
+    def crossing_time(self, idx, level):
+        """Sub-sample position where x crosses level between idx, idx+1."""
+        idx = idx[:, None]
+        y0 = np.take_along_axis(self.x, idx, axis=1)[:, 0]
+        y1 = np.take_along_axis(self.x, idx + 1, axis=1)[:, 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.clip((level - y0) / (y1 - y0), 0.0, 1.0)
+        return idx[:, 0] + np.nan_to_num(frac)
+
+    def edge(self, first_level, second_level, rising):
+        """Time (s) between two level crossings of the first edge."""
+        x = self.x
+        cols = np.arange(self.n - 1)
+
+        def crossings(level):
+            above = x > level[:, None]
+            if rising:
+                return ~above[:, :-1] & above[:, 1:]
+            return above[:, :-1] & ~above[:, 1:]
+
+        first = crossings(first_level)
+        has_first = first.any(axis=1)
+        i_first = first.argmax(axis=1)
+
+        second = crossings(second_level) & (cols >= i_first[:, None])
+        has_second = second.any(axis=1)
+        i_second = second.argmax(axis=1)
+
+        t = (self.crossing_time(i_second, second_level)
+             - self.crossing_time(i_first, first_level)) / self.fs
+        return np.where(has_first & has_second, t, np.nan)
+
+
+class MeasurementEngine:
+    """
+    Computes a configurable set of measurements for many channels.
+
+    Displays register the measurements they show with require();
+    compute() then only evaluates the union of those (or an explicit
+    list of names) and returns {name: array of one value per channel}.
+    Undefined values (e.g. frequency of a DC signal) are NaN.
+    """
+
+    def __init__(self):
+        self._consumers = {}
+
+    def require(self, consumer, names):
+        """Register (or replace) the measurements a display uses."""
+        unknown = set(names) - set(MEASUREMENTS)
+        if unknown:
+            raise ValueError(f"Unknown measurements: {sorted(unknown)}")
+        self._consumers[consumer] = tuple(names)
+
+    def release(self, consumer):
+        self._consumers.pop(consumer, None)
+
+    @property
+    def required(self):
+        """Measurements used by at least one display, in table order."""
+        used = set()
+        for names in self._consumers.values():
+            used.update(names)
+        return tuple(m for m in MEASUREMENTS if m in used)
+
+    def compute(self, data, fs, names=None):
+        """Measure every row of data (channels, samples) in one pass."""
+        names = self.required if names is None else tuple(names)
+        frame = _Frame(data, fs)
+        if frame.n < 2:
+            nan = np.full(frame.x.shape[0], np.nan)
+            return {name: nan.copy() for name in names}
+        return {name: getattr(self, "_m_" + name)(frame) for name in names}
+
+    # ---------- MEASUREMENTS ----------
+    def _m_peak(self, f):
+        return np.maximum(np.abs(f.get("max")), np.abs(f.get("min")))
+
+    def _m_pk2pk(self, f):
+        return f.get("max") - f.get("min")
+
+    def _m_mean(self, f):
+        return f.get("mean")
+
+    def _m_rms(self, f):
+        return np.sqrt(f.get("sumsq") / f.n)
+
+    def _m_ac_rms(self, f):
+        mean = f.get("mean")
+        return np.sqrt(np.maximum(f.get("sumsq") / f.n - mean * mean, 0.0))
+
+    def _m_freq(self, f):
+        count, t_first, t_last = f.get("cycles")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            freq = (count - 1) * f.fs / (t_last - t_first)
+        return np.where(count >= 2, freq, np.nan)
+
+    def _m_period(self, f):
+        with np.errstate(divide="ignore"):
+            return 1.0 / self._m_freq(f)
+
+    def _m_duty(self, f):
+        count, t_first, t_last = f.get("cycles")
+        cols = np.arange(f.n)
+        # Whole periods only: samples between the first and the last
+        # rising crossing
+        window = (cols > t_first[:, None]) & (cols <= t_last[:, None])
+        high = (f.get("above") & window).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            duty = 100.0 * high / window.sum(axis=1)
+        return np.where(count >= 2, duty, np.nan)
+
+    def _levels(self, f):
+        top, base = f.get("top_base")
+        amp = top - base
+        return base + 0.1 * amp, base + 0.9 * amp
+
+    def _m_rise(self, f):
+        lo, hi = self._levels(f)
+        return f.edge(lo, hi, rising=True)
+
+    def _m_fall(self, f):
+        lo, hi = self._levels(f)
+        return f.edge(hi, lo, rising=False)
+
+    def _m_overshoot(self, f):
+        top, base = f.get("top_base")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return 100.0 * (f.get("max") - top) / (top - base)
+
+
+def measure_rows(block, fs, names):
+    """
+    Stateless measurement of a (channels, samples) block, for running
+    on worker threads or processes.
+    """
+    return MeasurementEngine().compute(block, fs, names)
+
+
+def format_value(name, value):
+    """Format one measurement value for display ("--" if undefined)."""
+    if value is None or not np.isfinite(value):
+        return "--"
+    unit = UNITS.get(name, "")
+    if unit == "s":
+        return f"{value * 1e3:.3f} ms"
+    if unit == "Hz":
+        return f"{value:.2f} Hz"
+    if unit == "%":
+        return f"{value:.1f} %"
+    return f"{value:.3f}"
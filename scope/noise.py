@@ -0,0 +1,155 @@
+"""
+noise.py
+
+Pooled noise source for the signal generator.
+Noise is drawn from a seeded numpy.random.Generator (PCG64 or SFC64)
+into large preallocated float32 pools. Callers get slices of the pool,
+so a frame costs no random-number generation and no allocation. The
+next pool is filled on a background thread while the current one is
+being used. Colored noise (pink 1/f, brown 1/f^2) is shaped over the
+whole pool at fill time, so consecutive slices stay correlated; each
+new pool starts by cross-fading out of the continuation of the last
+one, so there is no jump at a pool swap. noise() scales into a buffer
+it keeps, so generating a frame allocates nothing either.
+Equal seeds give equal sequences, for reproducible test runs.
+This file contains no UI code and no plotting code.
+"""
+import threading
+
+import numpy as np
+
+COLORS = ("white", "pink", "brown")
+BIT_GENERATORS = {"PCG64": np.random.PCG64, "SFC64": np.random.SFC64}
+
+# Power-spectrum exponent: PSD ~ 1 / f**alpha
+_ALPHA = {"white": 0.0, "pink": 1.0, "brown": 2.0}
+
+
+class _Pool:
+    """Double-buffered stream of unit-RMS noise of one color."""
+
+    def __init__(self, color, size, bit_generator, background):
+        self.color = color
+        self.rng = np.random.Generator(bit_generator)
+        self.background = background
+        self._active = np.empty(size, dtype=np.float32)
+        self._spare = np.empty(size, dtype=np.float32)
+        self._pos = 0
+        # Colored noise: samples that continue the last filled pool,
+        # faded into the start of the next one
+        self.overlap = min(4096, size // 4) if _ALPHA[color] else 0
+        self._tail = None
+        self._filler = None
+        self._fill(self._active)
+        self._refill_spare()
+
+    @property
+    def size(self):
+        return len(self._active)
+
+    def _fill(self, buf):
+        alpha = _ALPHA[self.color]
+        if not alpha:
+            self.rng.standard_normal(out=buf, dtype=np.float32)
+            return
+        # Shape the spectrum of the pool plus overlap, then renormalize
+        n, ov = len(buf), self.overlap
+        shaped = self.rng.standard_normal(n + ov)
+        spec = np.fft.rfft(shaped)
+        f = np.arange(len(spec), dtype=np.float64)
+        f[0] = np.inf                           # no DC component
+        spec *= f ** (-alpha / 2)
+        shaped = np.fft.irfft(spec, n=n + ov)
+        shaped /= max(float(np.std(shaped)), 1e-12)
+        if self._tail is not None and ov:
+            # Equal-power cross-fade from the previous pool's
+            # continuation; starts exactly where that pool ended
+            ramp = np.linspace(0.0, 0.5 * np.pi, ov)
+            shaped[:ov] = (self._tail * np.cos(ramp)
+                           + shaped[:ov] * np.sin(ramp))
+        # The spectrum is circular, so shaped[n:] continues shaped[:n]
+        self._tail = shaped[n:].copy()
+        buf[:] = shaped[:n]
+
+    def _refill_spare(self):
+        if self.background:
+            self._filler = threading.Thread(
+                target=self._fill, args=(self._spare,),
+                name=f"noise-{self.color}", daemon=True
+            )
+            self._filler.start()
+        else:
+            self._fill(self._spare)
+
+    def _wait_spare(self):
+        if self._filler is not None:
+            self._filler.join()
+            self._filler = None
+
+    def take(self, n):
+        """n samples as a float32 view, valid until the next take()."""
+        if n > self.size:
+            # Grow both buffers (rare: record longer than the pool)
+            self._wait_spare()
+            self._active = np.empty(n, dtype=np.float32)
+            self._spare = np.empty(n, dtype=np.float32)
+            self._fill(self._active)
+            self._pos = 0
+            self._refill_spare()
+        elif self._pos + n > self.size:
+            # Switch pools; the used one is refilled in the background
+            self._wait_spare()
+            self._active, self._spare = self._spare, self._active
+            self._pos = 0
+            self._refill_spare()
+        out = self._active[self._pos:self._pos + n]
+        self._pos += n
+        return out
+
+
+class NoiseSource:
+    """
+    Unit-RMS noise of any color in COLORS, handed out as pool slices.
+
+    Each color draws from its own stream, derived from seed, so the
+    sequence of one color does not depend on how the others are used.
+    Not thread-safe: use one NoiseSource per consuming thread.
+    """
+
+    def __init__(self, seed=None, pool_size=1 << 20,
+                 bit_generator="PCG64", background=True):
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"Unknown bit generator: {bit_generator!r}")
+        self.pool_size = int(pool_size)
+        self.bit_generator = bit_generator
+        self.background = background
+        seeds = np.random.SeedSequence(seed).spawn(len(COLORS))
+        self._seeds = dict(zip(COLORS, seeds))
+        self._pools = {}
+        self._scaled = np.empty(0)
+
+    def _pool(self, color):
+        pool = self._pools.get(color)
+        if pool is None:
+            if color not in COLORS:
+                raise ValueError(f"Unknown noise color: {color!r}")
+            bits = BIT_GENERATORS[self.bit_generator](self._seeds[color])
+            pool = _Pool(color, self.pool_size, bits, self.background)
+            self._pools[color] = pool
+        return pool
+
+    def take(self, n, color="white"):
+        """n samples (float32 view, valid until the next take())."""
+        return self._pool(color).take(int(n))
+
+    def noise(self, n, amp=1.0, color="white", out=None):
+        """
+        n noise samples with RMS amp, scaled into out. Without out they
+        go into a buffer of this source, valid until the next noise().
+        """
+        n = int(n)
+        if out is None:
+            if len(self._scaled) < n:
+                self._scaled = np.empty(n)
+            out = self._scaled[:n]
+        return np.multiply(self.take(n, color), amp, out=out)
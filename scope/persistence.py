@@ -0,0 +1,115 @@
+"""
+persistence.py
+
+Digital-phosphor style persistence display.
+Every acquired waveform is rasterized into a per-channel 2-D intensity
+histogram (amplitude bin x time bin) with one np.bincount over all
+waveforms at once. Adding waveforms is cheap and happens on the
+acquisition thread, as often as they arrive; the decay and the
+conversion to an RGBA image happen only when the screen refreshes.
+This file contains no UI code and no plotting code.
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class PersistenceMap:
+    """
+    Intensity histograms of n_channels channels over a fixed
+    amplitude range y_range, with n_time x n_amp bins each.
+
+    decay is the time constant in seconds with which old hits fade;
+    None keeps them forever (infinite persistence).
+    """
+
+    def __init__(self, n_channels, n_time=500, n_amp=256,
+                 y_range=(-5.0, 5.0), decay=2.0, clock=None):
+        self.n_channels = n_channels
+        self.n_time = int(n_time)
+        self.n_amp = int(n_amp)
+        self.y_range = (float(y_range[0]), float(y_range[1]))
+        self.decay = decay
+        self.clock = clock or time.perf_counter
+        self.lock = threading.Lock()
+        self.waveforms = 0            # waveforms added since clear()
+        self._shape = (n_channels, self.n_amp, self.n_time)
+        self._hist = np.zeros(self._shape, dtype=np.float32)
+        self._pending = np.zeros(self._shape, dtype=np.int64)
+        self._time_index = {}         # samples per waveform -> time bins
+        self._last_fold = self.clock()
+
+    def clear(self):
+        with self.lock:
+            self._hist.fill(0.0)
+            self._pending.fill(0)
+            self.waveforms = 0
+            self._last_fold = self.clock()
+
+    def _time_bins(self, n):
+        bins = self._time_index.get(n)
+        if bins is None:
+            bins = np.arange(n) * self.n_time // n
+            self._time_index[n] = bins
+        return bins
+
+    def add(self, waves):
+        """
+        Rasterize waveforms into the histograms.
+        waves: (channels, samples) for one waveform per channel, or
+        (channels, k, samples) for k waveforms per channel, in the
+        display units of y_range. Samples outside it are dropped.
+        """
+        waves = np.asarray(waves)
+        if waves.ndim == 2:
+            waves = waves[:, None, :]
+        n_ch, k, n = waves.shape
+        if k == 0 or n == 0:
+            return
+
+        lo, hi = self.y_range
+        amp = (waves - lo) * (self.n_amp / (hi - lo))
+        inside = (amp >= 0) & (amp < self.n_amp)
+        # Flat bin: (channel, amplitude, time) in C order
+        flat = (
+            np.arange(n_ch)[:, None, None] * (self.n_amp * self.n_time) +
+            amp.astype(np.int64, copy=False) * self.n_time +
+            self._time_bins(n)
+        )
+        counts = np.bincount(flat[inside], minlength=self._pending.size)
+        with self.lock:
+            self._pending += counts.reshape(self._shape)
+            self.waveforms += k
+
+    def image(self, colors, rows=None):
+        """
+        Fold in pending hits (applying the decay for the elapsed time)
+        and return an (n_amp, n_time, 4) float RGBA image that blends
+        the given rows in their RGBA colors. Intensity is logarithmic,
+        so single rare hits stay visible next to dense traces.
+        """
+        with self.lock:
+            now = self.clock()
+            if self.decay:
+                self._hist *= np.float32(
+                    np.exp(-(now - self._last_fold) / self.decay))
+            self._last_fold = now
+            self._hist += self._pending
+            self._pending.fill(0)
+            hist = self._hist if rows is None else self._hist[rows]
+            if not len(hist):
+                # No channel shown: fully transparent
+                return np.zeros((self.n_amp, self.n_time, 4),
+                                dtype=np.float32)
+
+            peak = hist.reshape(len(hist), -1).max(axis=1)
+            scale = 1.0 / np.log1p(np.maximum(peak, 1e-6))
+            level = np.log1p(hist) * scale[:, None, None]
+
+        colors = np.asarray(colors, dtype=np.float32)[:, :3]
+        rgba = np.empty((self.n_amp, self.n_time, 4), dtype=np.float32)
+        rgba[..., :3] = np.einsum("chw,cr->hwr", level, colors)
+        np.clip(rgba[..., :3], 0.0, 1.0, out=rgba[..., :3])
+        rgba[..., 3] = level.max(axis=0)
+        return rgba
@@ -0,0 +1,280 @@
+"""
+pyramid.py
+
+Multi-resolution min/max index ("mipmap") for long records.
+Level 0 summarizes every `block` samples by their min, max, sum and
+sum of squares; each further level summarizes `factor` blocks of the
+level below. The index is built incrementally as samples are appended
+and can be saved next to a capture and reloaded with it.
+
+Min/max are kept in the data's own dtype (exact, since they are
+samples) and sum/sum of squares in float64, so the whole index costs
+(2 * itemsize + 16) / block * factor / (factor - 1) bytes per sample
+and channel. For float32 data and 64-sample blocks that is 0.5 bytes,
+1/8 of the record; DeepRecord uses 1024-sample blocks (under 1 %) and
+reads raw samples for zooms finer than that.
+
+With it, a view at any zoom level renders from the level whose blocks
+are just finer than a screen pixel, in O(visible pixels), and region
+statistics combine a handful of coarse blocks plus at most two partial
+blocks of raw samples at the region edges.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+STATS = ("min", "max", "sum", "sq")
+
+
+class _Level:
+    """Growable per-channel arrays of block statistics."""
+
+    def __init__(self, n_channels, capacity=64, dtype=np.float64):
+        self.count = 0
+        self.data = {
+            name: np.empty((n_channels, capacity), dtype=_dtype(name, dtype))
+            for name in STATS
+        }
+
+    def extend(self, stats):
+        k = stats["min"].shape[1]
+        cap = self.data["min"].shape[1]
+        if self.count + k > cap:
+            new_cap = max(2 * cap, self.count + k)
+            for name in STATS:
+                old = self.data[name]
+                grown = np.empty((len(old), new_cap), dtype=old.dtype)
+                grown[:, :self.count] = old[:, :self.count]
+                self.data[name] = grown
+        for name in STATS:
+            self.data[name][:, self.count:self.count + k] = stats[name]
+        self.count += k
+
+    def view(self, name, a=0, b=None):
+        b = self.count if b is None else b
+        return self.data[name][:, a:b]
+
+
+def _dtype(name, dtype):
+    """Storage dtype of a statistic: sums always accumulate in float64."""
+    return dtype if name in ("min", "max") else np.float64
+
+
+def _reduce(groups):
+    """Block statistics of (channels, k, m) raw groups."""
+    groups = np.asarray(groups, dtype=np.float64)
+    return {
+        "min": groups.min(axis=2),
+        "max": groups.max(axis=2),
+        "sum": groups.sum(axis=2),
+        "sq": np.einsum("ckm,ckm->ck", groups, groups),
+    }
+
+
+class MinMaxPyramid:
+    """
+    Min/max/sum/sum-of-squares pyramid over n_channels channels.
+
+    Level L blocks span block * factor**L samples. Methods that need
+    raw samples at unaligned edges take raw(start, stop) -> (channels,
+    n), e.g. DeepRecord.read. dtype is the storage type of min/max;
+    pass the data's dtype (e.g. float32) so they stay exact.
+    """
+
+    def __init__(self, n_channels, block=64, factor=4, dtype=np.float64):
+        self.n_channels = n_channels
+        self.block = int(block)
+        self.factor = int(factor)
+        self.dtype = np.dtype(dtype)
+        self.length = 0                   # samples appended
+        self.levels = [_Level(n_channels, dtype=self.dtype)]
+        self._tail = np.empty((n_channels, 0))
+
+    def block_size(self, level):
+        return self.block * self.factor ** level
+
+    # ---------- BUILD ----------
+    def append(self, data):
+        """Index a new (channels, k) block of samples."""
+        data = np.asarray(data, dtype=np.float64)
+        self.length += data.shape[1]
+        if self._tail.shape[1]:
+            data = np.concatenate([self._tail, data], axis=1)
+        n_full = data.shape[1] // self.block * self.block
+        self._tail = data[:, n_full:].copy()
+        if n_full == 0:
+            return
+
+        groups = data[:, :n_full].reshape(self.n_channels, -1, self.block)
+        self.levels[0].extend(_reduce(groups))
+        self._propagate()
+
+    def _propagate(self):
+        """Fill coarser levels from newly completed finer blocks."""
+        f = self.factor
+        level = 0
+        while self.levels[level].count >= f:
+            below = self.levels[level]
+            if level + 1 == len(self.levels):
+                self.levels.append(_Level(self.n_channels, dtype=self.dtype))
+            above = self.levels[level + 1]
+            done = above.count * f
+            n_new = (below.count - done) // f
+            if n_new == 0:
+                break
+            stop = done + n_new * f
+
+            def grouped(name):
+                return below.view(name, done, stop).reshape(
+                    self.n_channels, n_new, f)
+            above.extend({
+                "min": grouped("min").min(axis=2),
+                "max": grouped("max").max(axis=2),
+                "sum": grouped("sum").sum(axis=2),
+                "sq": grouped("sq").sum(axis=2),
+            })
+            level += 1
+
+    # ---------- PERSISTENCE ----------
+    def save(self, path):
+        """Write the index as an .npz file (arrays per level)."""
+        arrays = {
+            f"L{i}_{name}": level.view(name)
+            for i, level in enumerate(self.levels) for name in STATS
+        }
+        meta = np.array([self.n_channels, self.block, self.factor,
+                         self.length, len(self.levels)])
+        np.savez(path, meta=meta, tail=self._tail, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            n_channels, block, factor, length, n_levels = f["meta"]
+            pyramid = cls(int(n_channels), int(block), int(factor),
+                          dtype=f["L0_min"].dtype)
+            pyramid.length = int(length)
+            pyramid._tail = f["tail"]
+            pyramid.levels = []
+            for i in range(int(n_levels)):
+                level = _Level(pyramid.n_channels, capacity=0,
+                               dtype=pyramid.dtype)
+                level.extend({name: f[f"L{i}_{name}"] for name in STATS})
+                pyramid.levels.append(level)
+        return pyramid
+
+    # ---------- QUERIES ----------
+    def level_for(self, samples_per_pixel):
+        """Coarsest level whose blocks fit in one pixel, or None."""
+        if samples_per_pixel < self.block:
+            return None
+        level = 0
+        while (
+            level + 1 < len(self.levels) and
+            self.block_size(level + 1) <= samples_per_pixel
+        ):
+            level += 1
+        return level
+
+    def render(self, start, stop, n_pixels, raw):
+        """
+        (xs, ys) min/max display points for [start, stop) as one pair
+        per pixel column, or None when pixels are finer than level-0
+        blocks (read the raw samples instead). Pixel edges snap to the
+        chosen level's blocks, which are narrower than a pixel.
+        """
+        start = max(0, int(start))
+        stop = min(int(stop), self.length)
+        n_pixels = max(int(n_pixels), 1)
+        level = self.level_for((stop - start) / n_pixels)
+        if level is None:
+            return None
+
+        size = self.block_size(level)
+        lvl = self.levels[level]
+        edges = np.linspace(start, stop, n_pixels + 1).astype(np.int64)
+        blocks = edges // size
+        # Pixels made of whole, completed blocks: vectorized reduceat
+        covered = int(np.searchsorted(blocks[1:], lvl.count, side="right"))
+        lo = np.empty((self.n_channels, n_pixels))
+        hi = np.empty((self.n_channels, n_pixels))
+        if covered:
+            first, last = blocks[0], blocks[covered]
+            idx = blocks[:covered] - first
+            lo[:, :covered] = np.minimum.reduceat(
+                lvl.view("min", first, last), idx, axis=1)
+            hi[:, :covered] = np.maximum.reduceat(
+                lvl.view("max", first, last), idx, axis=1)
+        # The last pixels reach into incomplete blocks: exact query
+        for i in range(covered, n_pixels):
+            stats = self.stats(edges[i], max(edges[i + 1], edges[i] + 1),
+                               raw)
+            lo[:, i] = stats["min"]
+            hi[:, i] = stats["max"]
+
+        ys = np.empty((self.n_channels, 2 * n_pixels))
+        ys[:, 0::2] = lo
+        ys[:, 1::2] = hi
+        return np.repeat(edges[:-1], 2), ys
+
+    def stats(self, start, stop, raw):
+        """
+        Exact per-channel n, sum, mean, rms, min, max and peak of
+        [start, stop), from coarse blocks plus raw partial edges.
+        """
+        start = max(0, int(start))
+        stop = min(int(stop), self.length)
+        if stop <= start:
+            raise ValueError(f"Empty region [{start}, {stop})")
+
+        parts = []
+        b = self.block
+        lo = -(-start // b)                          # ceil
+        hi = min(stop // b, self.levels[0].count)
+        if lo >= hi:
+            parts.append(_reduce(raw(start, stop)[:, None, :]))
+        else:
+            if start < lo * b:
+                parts.append(_reduce(raw(start, lo * b)[:, None, :]))
+            if hi * b < stop:
+                parts.append(_reduce(raw(hi * b, stop)[:, None, :]))
+            parts.extend(self._block_ranges(lo, hi))
+
+        vmin = np.min([p["min"].min(axis=1) for p in parts], axis=0)
+        vmax = np.max([p["max"].max(axis=1) for p in parts], axis=0)
+        total = np.sum([p["sum"].sum(axis=1) for p in parts], axis=0)
+        sq = np.sum([p["sq"].sum(axis=1) for p in parts], axis=0)
+        count = stop - start
+        return {
+            "n": count,
+            "sum": total,
+            "mean": total / count,
+            "rms": np.sqrt(np.maximum(sq, 0.0) / count),
+            "min": vmin,
+            "max": vmax,
+            "peak": np.maximum(np.abs(vmin), np.abs(vmax)),
+        }
+
+    def _block_ranges(self, lo, hi):
+        """
+        Statistics slices covering level-0 blocks [lo, hi): unaligned
+        blocks at each end stay at the finer level, the aligned middle
+        moves up a level, so each level contributes < 2 * factor blocks.
+        """
+        f = self.factor
+        level = 0
+        while lo < hi:
+            if level + 1 < len(self.levels):
+                up_lo = -(-lo // f) * f
+                up_hi = min(hi // f, self.levels[level + 1].count) * f
+                if up_lo < up_hi:
+                    for a, b in ((lo, up_lo), (up_hi, hi)):
+                        if a < b:
+                            yield self._slice(level, a, b)
+                    lo, hi = up_lo // f, up_hi // f
+                    level += 1
+                    continue
+            yield self._slice(level, lo, hi)
+            break
+
+    def _slice(self, level, a, b):
+        lvl = self.levels[level]
+        return {name: lvl.view(name, a, b) for name in STATS}
@@ -0,0 +1,205 @@
+"""
+recorder.py
+
+Streaming recorder: writes every acquired frame to a capture file.
+The acquisition thread only puts frames on a bounded queue; a writer
+thread drains it and appends them to disk, so disk latency never
+reaches the acquisition or the UI. When the queue is full the frame is
+dropped (or, with on_full="block", the producer waits briefly first),
+and every drop is counted.
+
+Capture file layout (all little-endian):
+  file header   MAGIC, uint32 JSON length, JSON metadata (fs, dtype,
+                channel names and vertical settings, start time),
+                zero-padded to a multiple of 8 bytes
+  frames        FRAME_HEADER (magic, samples, index, timestamp, fs)
+                followed by the (channels, samples) data in C order
+  index         INDEX_DTYPE record per frame (where it starts and when)
+  footer        FOOTER: magic, frame count, index offset, dropped
+A file without a footer (recording cut short) is still readable by
+walking the frame headers.
+This file contains no UI code and no plotting code.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"KBKSCOPE"
+FORMAT_VERSION = 1
+FRAME_MAGIC = b"FRAM"
+FRAME_HEADER = struct.Struct("<4sIQdd")   # magic, samples, index, t, fs
+FOOTER_MAGIC = b"KBKINDEX"
+FOOTER = struct.Struct("<8sQQQ")          # magic, frames, offset, dropped
+INDEX_DTYPE = np.dtype([
+    ("offset", "<u8"),        # file offset of the frame's data
+    ("index", "<u8"),         # acquisition frame number
+    ("timestamp", "<f8"),
+    ("fs", "<f8"),
+    ("n_samples", "<u4"),
+])
+ON_FULL = ("drop", "block")
+
+
+def encode_header(meta):
+    """File header bytes for a metadata dict (padded to 8 bytes)."""
+    text = json.dumps(meta).encode("utf-8")
+    head = MAGIC + struct.pack("<I", len(text)) + text
+    return head + b"\0" * (-len(head) % 8)
+
+
+class StreamRecorder:
+    """
+    Background writer of AcquiredFrame objects to one capture file.
+
+    channels is a list of dicts (name, scale, offset, probe, coupling)
+    stored in the header. submit() is safe to call from the
+    acquisition thread; call close() to finish the file.
+    """
+
+    def __init__(self, path, fs, channels, dtype=np.float32,
+                 max_queue=64, on_full="drop", block_timeout=0.05,
+                 buffer_size=1 << 20):
+        if on_full not in ON_FULL:
+            raise ValueError(f"Unknown on_full policy: {on_full!r}")
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.on_full = on_full
+        self.block_timeout = block_timeout
+        self.n_channels = len(channels)
+
+        self.submitted = 0        # frames offered by the producer
+        self.written = 0          # frames on disk
+        self.dropped = 0          # frames lost to a full queue
+        self.bytes_written = 0
+        self.high_water = 0       # deepest the queue has been
+        self.error = None         # writer exception, if any
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._index = []
+        self._closed = False
+        self._count_lock = threading.Lock()
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._file = open(path, "wb", buffering=buffer_size)
+        header = encode_header({
+            "version": FORMAT_VERSION,
+            "fs": fs,
+            "dtype": self.dtype.str,
+            "n_channels": self.n_channels,
+            "channels": list(channels),
+            "start_time": time.time(),
+        })
+        self._file.write(header)
+        self._offset = len(header)
+
+        self._thread = threading.Thread(
+            target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def recording(self):
+        return not self._closed and self.error is None
+
+    @property
+    def pending(self):
+        """Frames queued but not yet written (the back-pressure)."""
+        return self._queue.qsize()
+
+    # ---------- PRODUCER SIDE ----------
+    def submit(self, frame):
+        """
+        Queue a frame for writing; returns False if it was dropped.
+        Never blocks longer than block_timeout.
+        """
+        if not self.recording:
+            return False
+        try:
+            if self.on_full == "block":
+                self._queue.put(frame, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(frame)
+        except queue.Full:
+            with self._count_lock:
+                self.submitted += 1
+                self.dropped += 1
+            return False
+        with self._count_lock:
+            self.submitted += 1
+            self.high_water = max(self.high_water, self._queue.qsize())
+        return True
+
+    def close(self, timeout=10.0):
+        """Write what is queued, then the index and footer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.error is not None or not self._thread.is_alive():
+            return                  # writer gone: nobody takes the sentinel
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # ---------- WRITER THREAD ----------
+    def _run(self):
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                self._write_frame(frame)
+            self._write_trailer()
+        except Exception as exc:    # disk full, file removed, ...
+            print(f"[Recorder] Write failed: {exc!r}")
+            self.error = exc
+            self._discard_queued()
+        finally:
+            self._file.close()
+
+    def _discard_queued(self):
+        """Empty the queue so a producer blocked on it gets going."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _write_frame(self, frame):
+        data = np.ascontiguousarray(frame.data, dtype=self.dtype)
+        if data.shape[0] != self.n_channels:
+            raise ValueError(
+                f"Frame has {data.shape[0]} channels, "
+                f"expected {self.n_channels}")
+        n = data.shape[1]
+        self._file.write(FRAME_HEADER.pack(
+            FRAME_MAGIC, n, frame.index, frame.timestamp, frame.fs))
+        self._file.write(memoryview(data).cast("B"))
+
+        offset = self._offset + FRAME_HEADER.size
+        self._index.append((offset, frame.index, frame.timestamp,
+                            frame.fs, n))
+        self._offset = offset + data.nbytes
+        self.written += 1
+        self.bytes_written = self._offset
+
+    def _write_trailer(self):
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        self._file.write(index.tobytes())
+        self._file.write(FOOTER.pack(
+            FOOTER_MAGIC, len(index), self._offset, self.dropped))
+
+    # ---------- STATUS ----------
+    def status_text(self):
+        """Short status, e.g. 'REC 12.3 MB' or 'REC DROP 4'."""
+        if self.error is not None:
+            return "REC: ERR"
+        if self.dropped:
+            return f"REC DROP {self.dropped}"
+        return f"REC {self.bytes_written / 1e6:.1f} MB"
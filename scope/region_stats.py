@@ -0,0 +1,113 @@
+"""
+region_stats.py
+
+Constant-time region statistics for cursor measurements.
+A RegionIndex is built once per acquisition from a (channels, samples)
+block. Afterwards the sum, mean, RMS, min, max and peak of any sample
+range are answered in O(1) per query for all channels at once, so
+cursors can be dragged across long records with a live readout.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+BLOCK = 64   # samples per block for the min/max index
+
+
+class _SparseTable:
+    """Range min or max over block values, O(1) per query."""
+
+    def __init__(self, values, reduce):
+        self.reduce = reduce
+        self.levels = [values]
+        width = 1
+        while 2 * width <= values.shape[1]:
+            prev = self.levels[-1]
+            self.levels.append(reduce(prev[:, :-width], prev[:, width:]))
+            width *= 2
+
+    def query(self, lo, hi):
+        """Reduce blocks lo..hi (inclusive) for every row."""
+        k = (hi - lo + 1).bit_length() - 1
+        level = self.levels[k]
+        return self.reduce(level[:, lo], level[:, hi - (1 << k) + 1])
+
+
+class RegionIndex:
+    """
+    Prefix sums plus a blocked sparse table over a (channels, n) block.
+
+    Sums and sums of squares come from prefix sums. Min/max use
+    in-block prefix/suffix scans for the partial blocks at both ends
+    and a sparse table over whole blocks in between. Memory is about
+    six times the record, instead of n log n for a plain sparse table.
+    """
+
+    def __init__(self, data, block=BLOCK):
+        x = np.atleast_2d(np.asarray(data, dtype=float))
+        self.data = x
+        self.n = x.shape[1]
+        self.block = block
+
+        zeros = np.zeros((x.shape[0], 1))
+        self._csum = np.concatenate([zeros, np.cumsum(x, axis=1)], axis=1)
+        self._csq = np.concatenate(
+            [zeros, np.cumsum(x * x, axis=1)], axis=1
+        )
+
+        # Pad to whole blocks with neutral values for min / max
+        n_blocks = -(-self.n // block)
+        pad = n_blocks * block - self.n
+        lo = np.pad(x, ((0, 0), (0, pad)), constant_values=np.inf)
+        hi = np.pad(x, ((0, 0), (0, pad)), constant_values=-np.inf)
+        lo = lo.reshape(x.shape[0], n_blocks, block)
+        hi = hi.reshape(x.shape[0], n_blocks, block)
+
+        flat = (x.shape[0], n_blocks * block)
+        self._prefix_min = np.minimum.accumulate(lo, axis=2).reshape(flat)
+        self._prefix_max = np.maximum.accumulate(hi, axis=2).reshape(flat)
+        self._suffix_min = np.minimum.accumulate(
+            lo[:, :, ::-1], axis=2)[:, :, ::-1].reshape(flat)
+        self._suffix_max = np.maximum.accumulate(
+            hi[:, :, ::-1], axis=2)[:, :, ::-1].reshape(flat)
+
+        self._table_min = _SparseTable(lo.min(axis=2), np.minimum)
+        self._table_max = _SparseTable(hi.max(axis=2), np.maximum)
+
+    def _min_max(self, a, b):
+        """Min and max of samples a..b-1 for every channel."""
+        first, last = a // self.block, (b - 1) // self.block
+        if first == last:
+            # Both ends in one block: at most `block` samples to scan
+            region = self.data[:, a:b]
+            return region.min(axis=1), region.max(axis=1)
+
+        lo = np.minimum(self._suffix_min[:, a], self._prefix_min[:, b - 1])
+        hi = np.maximum(self._suffix_max[:, a], self._prefix_max[:, b - 1])
+        if last - first > 1:
+            lo = np.minimum(lo, self._table_min.query(first + 1, last - 1))
+            hi = np.maximum(hi, self._table_max.query(first + 1, last - 1))
+        return lo, hi
+
+    def stats(self, a, b):
+        """
+        Statistics of the half-open sample range [a, b) per channel:
+        {"n", "sum", "mean", "rms", "min", "max", "peak"}.
+        """
+        a = max(0, int(a))
+        b = min(self.n, int(b))
+        if b <= a:
+            raise ValueError(f"Empty region [{a}, {b})")
+
+        count = b - a
+        total = self._csum[:, b] - self._csum[:, a]
+        sq = self._csq[:, b] - self._csq[:, a]
+        lo, hi = self._min_max(a, b)
+        return {
+            "n": count,
+            "sum": total,
+            "mean": total / count,
+            "rms": np.sqrt(np.maximum(sq, 0.0) / count),
+            "min": lo,
+            "max": hi,
+            "peak": np.maximum(np.abs(lo), np.abs(hi)),
+        }
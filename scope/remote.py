@@ -0,0 +1,164 @@
+"""
+remote.py
+
+Remote-control server for scripted automation.
+An asyncio server on its own thread accepts any number of TCP clients
+and reads SCPI-style lines: one or more ';'-separated commands per
+line, answered by one reply line. Commands are not executed on the
+server thread: each line becomes one job on a queue, and the
+application runs the jobs on its own thread by calling process() (the
+Tk loop does this from after()), within a time budget so clients can
+never starve the display. Replies travel back to the server thread,
+which encodes them; numpy arrays are sent as IEEE 488.2 binary blocks
+of little-endian float32, so the app thread never serializes data.
+This file contains no UI code and no plotting code.
+"""
+import asyncio
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .scpi import block_header
+
+SAMPLE_DTYPE = np.dtype("<f4")
+
+
+def encode_replies(replies):
+    """
+    One reply line for a job: str replies as text, bytes and arrays
+    as binary blocks, joined with ';'. None (set commands) is skipped;
+    a line with no replies at all sends nothing.
+    """
+    parts = []
+    for reply in replies:
+        if reply is None:
+            continue
+        if isinstance(reply, np.ndarray):
+            reply = np.ascontiguousarray(reply, dtype=SAMPLE_DTYPE)
+            reply = memoryview(reply).cast("B")
+        if isinstance(reply, str):
+            parts.append(reply.encode("ascii", "replace"))
+        else:
+            parts.append(block_header(len(reply)) + bytes(reply))
+    if not parts:
+        return b""
+    return b";".join(parts) + b"\n"
+
+
+class RemoteServer:
+    """
+    Line-based command server on host:port (port 0 picks a free one;
+    see .address once started).
+
+    handler(commands) is called on the thread that calls process(),
+    with the list of commands of one line, and returns one reply per
+    command (str, bytes, ndarray or None).
+    """
+
+    def __init__(self, handler, host="127.0.0.1", port=5025):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.address = None
+        self.clients = 0
+        self.error = None
+        self._jobs = queue.Queue()
+        self._loop = None
+        self._server = None
+        self._started = threading.Event()
+        self._thread = None
+
+    # ---------- SERVER THREAD ----------
+    def start(self, timeout=5.0):
+        """Start serving; raises if the port cannot be opened."""
+        self._thread = threading.Thread(
+            target=self._run, name="remote", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except Exception as exc:
+            self.error = exc
+            self._started.set()
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port)
+        self.address = self._server.sockets[0].getsockname()[:2]
+        self._started.set()
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    async def _serve(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                commands = [
+                    c.strip()
+                    for c in line.decode("ascii", "replace").split(";")
+                    if c.strip()
+                ]
+                if not commands:
+                    continue
+                # One job per line; this client waits for its replies
+                # before its next line is read
+                future = self._loop.create_future()
+                self._jobs.put((commands, future))
+                data = encode_replies(await future)
+                if data:
+                    writer.write(data)
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass                    # client left, or server stopping
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    # ---------- APPLICATION THREAD ----------
+    def process(self, budget=0.005):
+        """
+        Run queued jobs on the calling thread until the queue is empty
+        or `budget` seconds have passed; returns how many ran.
+        """
+        deadline = time.perf_counter() + budget
+        count = 0
+        while True:
+            try:
+                commands, future = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                replies = self.handler(commands)
+            except Exception as exc:   # keep serving; report in-band
+                print(f"[Remote] Command failed: {exc!r}")
+                replies = [f"ERROR {exc}" for _ in commands]
+            self._loop.call_soon_threadsafe(_resolve, future, replies)
+            count += 1
+            if time.perf_counter() >= deadline:
+                break
+        return count
+
+
+def _resolve(future, replies):
+    if not future.done():           # the client may have gone away
+        future.set_result(replies)
@@ -0,0 +1,234 @@
+"""
+replay.py
+
+Playback of capture files written by recorder.py.
+CaptureFile memory-maps a capture and serves each frame as a read-only
+view straight into the mapping (no copy, no read() call); the frame
+index comes from the file's trailer, so opening and seeking cost the
+same for a minute or a day of data. ReplaySource paces those frames
+by their recorded timestamps: in real time, faster or slower, as fast
+as the consumer takes them, or one frame per step().
+This file contains no UI code and no plotting code.
+"""
+import json
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .recorder import (
+    FOOTER, FOOTER_MAGIC, FRAME_HEADER, FRAME_MAGIC, INDEX_DTYPE, MAGIC
+)
+from .sources import SignalSource
+
+
+class CaptureFile:
+    """
+    Read-only view of one capture file.
+
+    .meta is the header dict (fs, dtype, channels, start_time, ...),
+    .index the INDEX_DTYPE record of every frame, .dropped the number
+    of frames the recorder had to drop (unknown, 0, if the file has no
+    footer because the recording was cut short).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        self.meta, self._data_start = self._read_header()
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.n_channels = int(self.meta["n_channels"])
+        self.fs = self.meta["fs"]
+        self.channels = self.meta["channels"]
+        self.dropped = 0
+        self.index = self._read_index()
+
+    def _read_header(self):
+        head = bytes(self._map[:len(MAGIC) + 4])
+        if head[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a capture file: {self.path}")
+        (size,) = struct.unpack("<I", head[len(MAGIC):])
+        start = len(MAGIC) + 4
+        meta = json.loads(bytes(self._map[start:start + size]))
+        end = start + size
+        return meta, end + (-end % 8)
+
+    def _read_index(self):
+        """Index from the trailer, or rebuilt from the frame headers."""
+        if len(self._map) >= self._data_start + FOOTER.size:
+            magic, count, offset, dropped = FOOTER.unpack(
+                bytes(self._map[-FOOTER.size:]))
+            if magic == FOOTER_MAGIC:
+                self.dropped = dropped
+                stop = offset + count * INDEX_DTYPE.itemsize
+                return np.frombuffer(
+                    self._map[offset:stop], dtype=INDEX_DTYPE)
+        return self._scan_frames()
+
+    def _scan_frames(self):
+        records = []
+        offset = self._data_start
+        row_bytes = self.n_channels * self.dtype.itemsize
+        while offset + FRAME_HEADER.size <= len(self._map):
+            magic, n, index, timestamp, fs = FRAME_HEADER.unpack(
+                bytes(self._map[offset:offset + FRAME_HEADER.size]))
+            data = offset + FRAME_HEADER.size
+            if magic != FRAME_MAGIC or data + n * row_bytes > len(self._map):
+                break               # trailer, or a frame cut short
+            records.append((data, index, timestamp, fs, n))
+            offset = data + n * row_bytes
+        return np.array(records, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def timestamps(self):
+        return self.index["timestamp"]
+
+    @property
+    def duration(self):
+        """Seconds between the first and the last frame."""
+        if len(self) < 2:
+            return 0.0
+        return float(self.timestamps[-1] - self.timestamps[0])
+
+    def close(self):
+        """
+        Drop the mapping so the file can be moved or deleted (Windows
+        locks a mapped file). Frames already returned keep it alive
+        until they are released; .index stays usable.
+        """
+        if self._map is not None:
+            self.index = np.array(self.index)
+            self._map = None
+
+    def frame(self, i):
+        """(data, fs) of frame i; data is a read-only view of the file."""
+        if self._map is None:
+            raise ValueError(f"Capture file is closed: {self.path}")
+        entry = self.index[i]
+        data = np.ndarray(
+            (self.n_channels, int(entry["n_samples"])), dtype=self.dtype,
+            buffer=self._map, offset=int(entry["offset"])
+        )
+        return data, float(entry["fs"])
+
+    def find_time(self, seconds):
+        """Index of the first frame at or after `seconds` into the file."""
+        if len(self) == 0:
+            return 0
+        target = self.timestamps[0] + seconds
+        return int(np.searchsorted(self.timestamps, target))
+
+
+class ReplaySource(SignalSource):
+    """
+    Paced playback of a CaptureFile (the file SignalSource).
+
+    speed is the playback rate (1.0 = as recorded); None plays frames
+    as fast as read() is called. While paused, only frames released
+    by step() are played. read() is meant for one consumer thread
+    (e.g. the acquisition worker); the controls may be called from
+    any thread.
+    """
+
+    paces_itself = True
+
+    def __init__(self, capture, speed=1.0, loop=False, paused=False,
+                 clock=None):
+        self.capture = capture
+        self.n_channels = capture.n_channels
+        self.speed = speed
+        self.loop = loop
+        self.paused = paused
+        self.clock = clock or time.perf_counter
+        self.position = 0         # next frame to play
+        self._steps = 0           # frames released while paused
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._anchor = None       # (wall time, frame) playback started
+
+    @property
+    def fs(self):
+        return self.capture.fs
+
+    def configure(self, **settings):
+        """Change speed / loop / paused; the pacing restarts from now."""
+        with self._lock:
+            for name, value in settings.items():
+                if not hasattr(self, name) or name.startswith("_") or (
+                    name in ("capture", "clock", "position", "n_channels")
+                ):
+                    raise AttributeError(f"Unknown replay setting: {name}")
+                setattr(self, name, value)
+            if self.speed is not None and self.speed <= 0:
+                raise ValueError(f"Speed must be positive: {self.speed!r}")
+            self._anchor = None
+        self._wake.set()
+
+    @property
+    def finished(self):
+        return not self.loop and self.position >= len(self.capture)
+
+    def close(self):
+        self.capture.close()
+
+    # ---------- NAVIGATION ----------
+    def seek(self, frame):
+        """Continue playback from frame index `frame`."""
+        with self._lock:
+            self.position = min(max(int(frame), 0), len(self.capture))
+            self._anchor = None
+        self._wake.set()
+
+    def seek_time(self, seconds):
+        """Continue playback from `seconds` into the capture."""
+        self.seek(self.capture.find_time(seconds))
+
+    def step(self, n=1):
+        """Pause, then release the next n frames."""
+        with self._lock:
+            self.paused = True
+            self._steps += n
+        self._wake.set()
+
+    # ---------- PLAYBACK ----------
+    def _due(self, i):
+        """Wall-clock time at which frame i should play."""
+        if self._anchor is None:
+            self._anchor = (self.clock(), i)
+        wall, first = self._anchor
+        ts = self.capture.timestamps
+        return wall + (ts[i] - ts[first]) / self.speed
+
+    def read(self, max_wait=0.05):
+        """
+        The next frame as (data, fs) once it is due, or None if none is
+        due within max_wait seconds (paused, finished, or not yet time).
+        """
+        wait = max_wait
+        with self._lock:
+            self._wake.clear()
+            if self.position >= len(self.capture) and self.loop:
+                self.position = 0
+                self._anchor = None
+            i = self.position
+            if i >= len(self.capture):
+                ready = False
+            elif self.paused:
+                ready = self._steps > 0
+                self._steps -= ready
+                self._anchor = None
+            elif self.speed is None:
+                ready = True
+            else:
+                wait = min(self._due(i) - self.clock(), max_wait)
+                ready = wait <= 0
+            if ready:
+                self.position = i + 1
+                return self.capture.frame(i)
+
+        self._wake.wait(wait)
+        return None
@@ -0,0 +1,96 @@
+"""
+ring_buffer.py
+
+Preallocated multi-channel ring buffer for continuous capture.
+Keeps the most recent `capacity` samples of every channel in one
+(channels, capacity) array, so history has a fixed memory cost however
+long the scope runs. Reads of the newest samples are zero-copy views
+unless the window wraps around, which costs a single concatenation.
+This file contains no UI code and no plotting code.
+"""
+import threading
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity history of (channels, samples) blocks.
+
+    Sample positions are absolute: the first sample ever written is 0,
+    and .start / .end give the range currently held. When a writer and
+    a reader live on different threads, both must hold .lock; views
+    returned by reads are only valid while it is held.
+    """
+
+    def __init__(self, n_channels, capacity, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._buf = np.zeros((n_channels, self.capacity), dtype=dtype)
+        self._head = 0          # next write position in _buf
+        self.total = 0          # samples written since creation/clear
+        self.lock = threading.Lock()
+
+    @property
+    def n_channels(self):
+        return self._buf.shape[0]
+
+    @property
+    def size(self):
+        """Number of samples currently held."""
+        return min(self.total, self.capacity)
+
+    @property
+    def start(self):
+        """Absolute index of the oldest held sample."""
+        return self.total - self.size
+
+    @property
+    def end(self):
+        """Absolute index one past the newest sample."""
+        return self.total
+
+    def clear(self):
+        self._head = 0
+        self.total = 0
+
+    def write(self, block):
+        """Append a (channels, k) block, overwriting the oldest samples."""
+        block = np.asarray(block)
+        k = block.shape[1]
+        if k == 0:
+            return
+        if k >= self.capacity:
+            # Only the newest `capacity` samples can survive
+            self._buf[:] = block[:, k - self.capacity:]
+            self._head = 0
+        else:
+            first = min(k, self.capacity - self._head)
+            self._buf[:, self._head:self._head + first] = block[:, :first]
+            if first < k:
+                self._buf[:, :k - first] = block[:, first:]
+            self._head = (self._head + k) % self.capacity
+        self.total += k
+
+    def read(self, start, stop):
+        """
+        Samples [start, stop) in absolute positions, clipped to what is
+        held. A view when contiguous, otherwise one concatenation.
+        """
+        start = max(int(start), self.start)
+        stop = min(int(stop), self.end)
+        if stop <= start:
+            return self._buf[:, :0]
+
+        # Position of absolute index i in _buf
+        offset = (self._head - self.total) % self.capacity
+        a = (start + offset) % self.capacity
+        b = a + (stop - start)
+        if b <= self.capacity:
+            return self._buf[:, a:b]
+        return np.concatenate(
+            [self._buf[:, a:], self._buf[:, :b - self.capacity]], axis=1
+        )
+
+    def read_latest(self, n):
+        """The newest n samples (fewer if not that many were written)."""
+        return self.read(self.end - int(n), self.end)
@@ -0,0 +1,347 @@
+"""
+scpi.py
+
+SCPI-style networked instrument: client, signal source and simulator.
+Waveforms travel as IEEE 488.2 definite-length binary blocks
+("#<digits><length><payload>\\n") of little-endian float32 samples, all
+channels of one record in one block. The client keeps one persistent
+TCP connection and pipelines requests: the next record is requested
+before the current one is read, so transfer and generation on the
+instrument overlap with processing here. A connection that fails in
+the middle of a reply is out of step for good; it is closed and a new
+one is opened on a later read.
+
+ScpiSimulator is a local loopback instrument for testing without
+hardware. It understands:
+  *IDN?                  identification
+  :CHAN:COUN?            number of channels
+  :ACQ:SRAT <hz> / ?     sampling rate
+  :SOUR<n>:FUNC <name>   waveform of channel n (dds.WAVEFORMS)
+  :SOUR<n>:FREQ <hz>     frequency of channel n
+  :SOUR<n>:VOLT <v>      amplitude of channel n
+  :WAV:DATA? <points>    next record, all channels, as one block
+  :SYST:ERR?             oldest error, or 0,"No error"
+This file contains no UI code and no plotting code.
+"""
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+
+from .dds import WAVEFORMS, DDSGenerator
+from .sources import SignalSource
+
+SAMPLE_DTYPE = np.dtype("<f4")
+
+
+def block_header(size):
+    """IEEE 488.2 definite-length block header for size bytes."""
+    length = str(size).encode("ascii")
+    if len(length) > 9:
+        raise ValueError("Block too large for a definite-length header")
+    return b"#" + str(len(length)).encode("ascii") + length
+
+
+def encode_block(payload):
+    """IEEE 488.2 definite-length block of payload bytes."""
+    return block_header(len(payload)) + payload + b"\n"
+
+
+def read_block(stream):
+    """Read one definite-length block from a buffered binary stream."""
+    head = stream.read(2)
+    if len(head) < 2 or head[:1] != b"#":
+        raise ConnectionError(f"Expected a binary block, got {head!r}")
+    digits = int(head[1:2])
+    if digits == 0:
+        raise ConnectionError("Indefinite-length blocks are not supported")
+    length = int(stream.read(digits))
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ConnectionError("Connection closed inside a block")
+    stream.read(1)                      # terminator
+    return payload
+
+
+class ScpiClient:
+    """
+    Persistent SCPI connection. write() sends without waiting; each
+    query reply is read in the order the queries were sent, which is
+    what makes pipelining (several writes, then the reads) work.
+    """
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self.sock.makefile("rb", buffering=1 << 16)
+
+    def write(self, *commands):
+        """Send one or more commands in a single packet."""
+        self.sock.sendall("".join(c + "\n" for c in commands).encode())
+
+    def read_line(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Instrument closed the connection")
+        return line.decode("ascii").strip()
+
+    def read_block(self):
+        return read_block(self._reader)
+
+    def query(self, command):
+        self.write(command)
+        return self.read_line()
+
+    def query_many(self, commands):
+        """Pipelined text queries: one send, then all the replies."""
+        self.write(*commands)
+        return [self.read_line() for _ in commands]
+
+    def close(self):
+        self._reader.close()
+        self.sock.close()
+
+
+class ScpiSource(SignalSource):
+    """
+    Records of n_samples points from a SCPI instrument, with up to
+    `depth` :WAV:DATA? requests in flight.
+
+    Each record is requested together with :ACQ:SRAT?, so .fs follows
+    rate changes made on the instrument. When a read fails the
+    connection is closed and ConnectionError raised; the next read
+    after retry_delay seconds reconnects.
+    """
+
+    paces_itself = True
+
+    def __init__(self, host, port, n_samples=500, depth=2, timeout=5.0,
+                 retry_delay=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.n_samples = int(n_samples)
+        self.depth = max(int(depth), 1)
+        self.retry_delay = retry_delay
+        self.client = None
+        self._retry_at = 0.0
+        self._connect()
+
+    def _connect(self):
+        self._in_flight = 0
+        self.client = ScpiClient(self.host, self.port, self.timeout)
+        try:
+            self.idn, n_channels, fs = self.client.query_many(
+                ["*IDN?", ":CHAN:COUN?", ":ACQ:SRAT?"])
+            self.n_channels = int(n_channels)
+            self.fs = float(fs)
+        except (OSError, ValueError) as exc:
+            self._disconnect()
+            raise ConnectionError(f"Instrument did not identify: {exc}")
+
+    def _disconnect(self):
+        """Drop a connection whose replies are out of step."""
+        if self.client is not None:
+            try:
+                self.client.close()
+            except OSError:
+                pass
+            self.client = None
+        self._in_flight = 0
+        self._retry_at = time.perf_counter() + self.retry_delay
+
+    def _reconnect(self):
+        if time.perf_counter() < self._retry_at:
+            raise ConnectionError(
+                f"Instrument at {self.host}:{self.port} is disconnected")
+        try:
+            self._connect()
+        except OSError:
+            self._retry_at = time.perf_counter() + self.retry_delay
+            raise
+
+    def read(self):
+        if self.client is None:
+            self._reconnect()
+        try:
+            if self._in_flight < self.depth:
+                request = [":ACQ:SRAT?", f":WAV:DATA? {self.n_samples}"]
+                self.client.write(*request * (self.depth - self._in_flight))
+                self._in_flight = self.depth
+            fs = float(self.client.read_line())
+            payload = self.client.read_block()
+            self._in_flight -= 1
+            data = np.frombuffer(payload, dtype=SAMPLE_DTYPE)
+            data = data.reshape(self.n_channels, -1)
+        except (OSError, ValueError) as exc:   # timeout, short read, ...
+            self._disconnect()
+            raise ConnectionError(f"Instrument read failed: {exc}") from exc
+        self.fs = fs
+        return data, fs
+
+    def query(self, command):
+        """Text query on the same connection (pending records dropped)."""
+        if self.client is None:
+            self._reconnect()
+        try:
+            while self._in_flight:
+                self.client.read_line()
+                self.client.read_block()
+                self._in_flight -= 1
+            return self.client.query(command)
+        except (OSError, ValueError) as exc:
+            self._disconnect()
+            raise ConnectionError(f"Instrument query failed: {exc}") from exc
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+# ---------- SIMULATOR ----------
+class _Instrument:
+    """State and command set of one simulated instrument connection."""
+
+    def __init__(self, n_channels, fs, frame_rate):
+        self.fs = fs
+        self.frame_rate = frame_rate
+        self.dds = DDSGenerator(n_channels)
+        self.channels = [
+            ["sine", 5.0 * (i + 1), 1.0] for i in range(n_channels)
+        ]
+        self.errors = []
+        self._next_frame = time.perf_counter()
+
+    def execute(self, command):
+        """Reply bytes for one command (None for commands that set)."""
+        header, _, arg = command.strip().partition(" ")
+        header = header.upper()
+        if header == "*IDN?":
+            return b"KBK,SIM-SCOPE,0,1.0\n"
+        if header == ":CHAN:COUN?":
+            return f"{len(self.channels)}\n".encode()
+        if header == ":ACQ:SRAT?":
+            return f"{self.fs!r}\n".encode()
+        if header == ":ACQ:SRAT":
+            return self._set_rate(header, arg)
+        if header == ":WAV:DATA?":
+            return self._waveform(header, arg)
+        if header == ":SYST:ERR?":
+            error = self.errors.pop(0) if self.errors else '0,"No error"'
+            return f"{error}\n".encode()
+        if header.startswith(":SOUR"):
+            return self._source(header, arg)
+        return self._error(-113, "Undefined header", command)
+
+    def _source(self, header, arg):
+        number, _, field = header[5:].partition(":")
+        try:
+            channel = self.channels[int(number) - 1]
+            if field == "FUNC" and arg.lower() in WAVEFORMS:
+                channel[0] = arg.lower()
+            elif field == "FREQ":
+                channel[1] = float(arg)
+            elif field == "VOLT":
+                channel[2] = float(arg)
+            else:
+                return self._error(-224, "Illegal parameter value", header)
+        except (ValueError, IndexError):
+            return self._error(-222, "Data out of range", header)
+        return None
+
+    def _set_rate(self, header, arg):
+        try:
+            fs = float(arg)
+        except ValueError:
+            return self._error(-224, "Illegal parameter value", header)
+        if not np.isfinite(fs) or fs <= 0:
+            return self._error(-222, "Data out of range", header)
+        self.fs = fs
+        return None
+
+    def _waveform(self, header, arg):
+        try:
+            n = int(arg or 500)
+        except ValueError:
+            return self._error(-224, "Illegal parameter value", header)
+        if n <= 0:
+            return self._error(-222, "Data out of range", header)
+        return encode_block(self._record(n).tobytes())
+
+    def _error(self, code, message, command):
+        self.errors.append(f'{code},"{message}; {command.strip()}"')
+        if command.strip().endswith("?"):
+            return b"\n"            # keep replies in step with queries
+        return None
+
+    def _record(self, n):
+        # Like a real scope: one record per trigger, at frame_rate
+        if self.frame_rate:
+            delay = self._next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_frame = (
+                max(self._next_frame, time.perf_counter()) +
+                1.0 / self.frame_rate)
+        data = np.empty((len(self.channels), n), dtype=SAMPLE_DTYPE)
+        for i, (name, freq, amp) in enumerate(self.channels):
+            data[i] = self.dds.generate(i, name, freq, amp, self.fs, n)
+        return data
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        inst = _Instrument(server.n_channels, server.fs, server.frame_rate)
+        self.connection.setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            for line in self.rfile:
+                for command in line.decode("ascii", "replace").split(";"):
+                    if not command.strip():
+                        continue
+                    reply = inst.execute(command)
+                    if reply is not None:
+                        self.wfile.write(reply)
+                self.wfile.flush()
+        except ConnectionError:
+            pass                # client went away with replies pending
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ScpiSimulator:
+    """
+    Simulated scope on host:port (port 0 picks a free one; see
+    .address). Every connection gets its own instrument state and
+    receives records at up to frame_rate per second (None: unlimited).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, n_channels=2, fs=500.0,
+                 frame_rate=60.0):
+        self._server = _Server((host, port), _Handler)
+        self._server.n_channels = n_channels
+        self._server.fs = fs
+        self._server.frame_rate = frame_rate
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="scpi-simulator",
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
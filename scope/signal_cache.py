@@ -0,0 +1,46 @@
+"""
+signal_cache.py
+
+Bounded LRU cache for generated signal blocks.
+When the generator settings and start phase of a channel repeat, the
+block it would produce is identical to one produced before, so the
+cached array is returned instead of regenerating it. Cached arrays are
+read-only because they are shared between frames.
+This file contains no UI code and no plotting code.
+"""
+from collections import OrderedDict
+
+
+class SignalCache:
+    """Least-recently-used mapping of generator keys to sample arrays."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = int(maxsize)
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """The cached array for key (marked most recent), or None."""
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value (made read-only), evicting the oldest entries."""
+        value.flags.writeable = False
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._items.clear()
@@ -0,0 +1,71 @@
+"""
+sources.py
+
+Signal sources: where acquired frames come from.
+A SignalSource delivers all channels as one (channels, samples) block
+per read() call, in the form AcquisitionWorker expects from its
+producer, so any source can feed the real-time pipeline unchanged:
+  SyntheticSource   the built-in generator (waveform.generate_signals)
+  ReplaySource      a recorded capture file (replay.py)
+  ScpiSource        a SCPI instrument over TCP (scpi.py)
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+import waveform
+
+
+class SignalSource:
+    """
+    Base class for frame sources.
+
+    read() returns (data, fs), (data, fs, changed) or None when no
+    frame is ready; data is (n_channels, samples). Sources whose read()
+    waits for data themselves (a file paced by its timestamps, an
+    instrument) set paces_itself, and are polled as fast as they
+    deliver instead of at the display rate. fs is the sampling rate
+    the source delivers at, when it knows it up front.
+    """
+
+    n_channels = None
+    fs = None
+    paces_itself = False
+
+    def read(self):
+        raise NotImplementedError
+
+    def close(self):
+        """Release files, sockets, ... (no-op by default)."""
+
+
+class SyntheticSource(SignalSource):
+    """
+    Phase-continuous generated signals.
+
+    .settings is a plain (channel_settings, n_samples, fs, roll) tuple,
+    replaced as a whole by the UI thread (see
+    HomePage._snapshot_acquisition); channel_settings are the tuples
+    of waveform.generate_signals. In roll mode each read is one tick
+    (fs / rate_hz samples) instead of a whole record.
+    """
+
+    def __init__(self, generator, noise, settings=None, rate_hz=60.0):
+        self.generator = generator
+        self.noise = noise
+        self.settings = settings
+        self.rate_hz = rate_hz
+
+    @property
+    def n_channels(self):
+        return len(self.generator.phase)
+
+    def read(self):
+        channels, n, fs, roll = self.settings
+        if roll:
+            # Slow timebase: a short block per tick
+            n = max(1, int(round(fs / self.rate_hz)))
+        block = np.asarray(waveform.generate_signals(
+            channels, n, fs=fs, generator=self.generator, noise=self.noise))
+        if roll:
+            return block, fs
+        return block, fs, self.generator.changed.copy()
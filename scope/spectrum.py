@@ -0,0 +1,179 @@
+"""
+spectrum.py
+
+Spectrum engine for the FFT view.
+Windowed real FFT with cached frequency axes and window arrays,
+optional zero-padding to a fast FFT length, averaging across frames
+and dB scaling. Magnitudes are single-sided peak amplitudes, corrected
+for the window's coherent gain, so a sine of amplitude A reads A.
+This file contains no UI code and no plotting code.
+"""
+import functools
+
+import numpy as np
+
+WINDOWS = ("rect", "hann", "flattop", "blackman")
+AVERAGING = ("none", "linear", "rms", "peak")
+
+# Flat-top window coefficients (SR785 / HFT-style 5-term)
+_FLATTOP = (0.21557895, 0.41663158, 0.277263158, 0.083578947, 0.006947368)
+
+
+def next_fast_len(n):
+    """Smallest 2^a * 3^b * 5^c that is >= n (fast for numpy's FFT)."""
+    n = int(n)
+    if n <= 1:
+        return 1
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # Smallest power of two bringing p35 up to at least n
+            quotient = -(-n // p35)
+            p2 = 1 << (quotient - 1).bit_length()
+            best = min(best, p2 * p35)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def window_array(name, n):
+    """Return the named window of length n (periodic form)."""
+    if name == "rect":
+        return np.ones(n)
+    # Periodic windows: evaluate n + 1 points and drop the last one
+    if name == "hann":
+        return np.hanning(n + 1)[:-1]
+    if name == "blackman":
+        return np.blackman(n + 1)[:-1]
+    if name == "flattop":
+        k = 2 * np.pi * np.arange(n) / n
+        w = np.zeros(n)
+        for i, a in enumerate(_FLATTOP):
+            w += (-1) ** i * a * np.cos(i * k)
+        return w
+    raise ValueError(f"Unknown window: {name!r}")
+
+
+@functools.lru_cache(maxsize=16)
+def _plan(n, fs, window, nfft):
+    """Frequency axis, window and amplitude scale, cached per size."""
+    win = window_array(window, n)
+    freqs = np.fft.rfftfreq(nfft, d=1.0 / fs)
+    # Single-sided amplitude: x2, except the DC (and Nyquist) bin
+    scale = np.full(len(freqs), 2.0 / win.sum())
+    scale[0] /= 2
+    if nfft % 2 == 0:
+        scale[-1] /= 2
+    for arr in (win, freqs, scale):
+        arr.flags.writeable = False     # shared between callers
+    return freqs, win, scale
+
+
+def amplitude_spectrum(sig, fs, window="hann", zero_pad=False):
+    """
+    Stateless windowed amplitude spectrum of one channel or of a
+    (channels, samples) block: returns (freqs, magnitudes).
+    Safe to run in worker threads or processes.
+    """
+    sig = np.asarray(sig, dtype=float)
+    n = sig.shape[-1]
+    nfft = next_fast_len(n) if zero_pad else n
+    freqs, win, scale = _plan(n, float(fs), window, nfft)
+    mag = np.abs(np.fft.rfft(sig * win, n=nfft, axis=-1))
+    mag *= scale
+    return freqs, mag
+
+
+class SpectrumEngine:
+    """
+    Reusable windowed FFT with averaging.
+
+    compute() returns (freqs, values). After each call, .changed tells
+    whether the output differs from the previous call, so the caller
+    can skip redrawing the spectrum plot.
+    """
+
+    def __init__(self, window="hann", zero_pad=False, averaging="none",
+                 n_avg=8, db=False):
+        self.window = window
+        self.zero_pad = zero_pad
+        self.averaging = averaging
+        self.n_avg = n_avg
+        self.db = db
+
+        self._acc = None          # averaging accumulator
+        self._acc_key = None
+        self._count = 0           # frames in the accumulator
+        self._last = None         # previous output values
+        self.changed = True
+
+    def configure(self, **settings):
+        """Change settings; averaging restarts if anything changed."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Unknown spectrum setting: {name}")
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.reset_average()
+        if self.window not in WINDOWS:
+            raise ValueError(f"Unknown window: {self.window!r}")
+        if self.averaging not in AVERAGING:
+            raise ValueError(f"Unknown averaging: {self.averaging!r}")
+
+    def reset_average(self):
+        self._acc = None
+        self._acc_key = None
+        self._count = 0
+        self._last = None
+
+    def compute(self, sig, fs):
+        """
+        Return (freqs, magnitude or dB) for one channel's samples, or
+        for a (channels, samples) block in a single vectorized FFT.
+        """
+        freqs, mag = amplitude_spectrum(sig, fs, self.window, self.zero_pad)
+        return self.process(freqs, mag)
+
+    def process(self, freqs, mag):
+        """
+        Apply averaging and dB scaling to a spectrum computed by
+        amplitude_spectrum() (possibly in a worker) with this engine's
+        window and zero-pad settings.
+        """
+        key = (mag.shape, float(freqs[-1]) if len(freqs) else 0.0)
+        out = self._average(key, mag)
+        if self.db:
+            out = 20 * np.log10(np.maximum(out, 1e-12))
+
+        self.changed = self._last is None or not np.array_equal(
+            out, self._last
+        )
+        self._last = out
+        return freqs, out
+
+    def _average(self, key, mag):
+        """Fold one magnitude frame into the accumulator (in place)."""
+        if self.averaging == "none":
+            return mag
+
+        if self._acc_key != key:
+            self._acc = np.zeros_like(mag)
+            self._acc_key = key
+            self._count = 0
+        acc = self._acc
+
+        # Cumulative mean for the first n_avg frames, then exponential
+        self._count = min(self._count + 1, max(int(self.n_avg), 1))
+        weight = 1.0 / self._count
+
+        if self.averaging == "linear":
+            acc += weight * (mag - acc)
+            return acc.copy()
+        if self.averaging == "rms":
+            acc += weight * (mag * mag - acc)
+            return np.sqrt(acc)
+        # peak hold
+        np.maximum(acc, mag, out=acc)
+        return acc.copy()
@@ -0,0 +1,137 @@
+"""
+trigger.py
+
+Edge trigger for the real-time oscilloscope.
+Edges are found with vectorized NumPy over the acquisition buffer: a
+sample arms the trigger once it is past the hysteresis band, and the
+first sample across the level after that fires it. The crossing point
+is interpolated linearly between the two samples around it, so the
+display can be aligned to a fraction of a sample. Holdoff suppresses
+re-triggering for a while after each trigger.
+This file contains no UI code and no plotting code.
+"""
+import numpy as np
+
+SLOPES = ("rising", "falling")
+MODES = ("auto", "normal", "single")
+
+
+def find_edges(y, level, slope="rising", hysteresis=0.0):
+    """
+    Sub-sample positions of all trigger crossings in y.
+
+    A rising edge needs y to drop below level - hysteresis first, so
+    noise around the level does not produce a burst of edges (mirror
+    image for falling edges). Returns a float array of indices.
+    """
+    y = np.asarray(y)
+    if slope == "falling":
+        y, level = -y, -level
+    elif slope != "rising":
+        raise ValueError(f"Unknown slope: {slope!r}")
+
+    low = y < level - abs(hysteresis)
+    high = y >= level
+    # Samples that decide the state; those inside the band keep it
+    events = np.flatnonzero(low | high)
+    if len(events) < 2:
+        return np.empty(0)
+    is_high = high[events]
+    # First high sample after a low one fires the trigger
+    fire = events[np.flatnonzero(~is_high[:-1] & is_high[1:]) + 1]
+
+    # Every sample between the arming one and `fire` is below level,
+    # so the crossing lies between fire - 1 and fire
+    y0 = y[fire - 1]
+    y1 = y[fire]
+    frac = (level - y0) / np.where(y1 != y0, y1 - y0, 1.0)
+    return fire - 1 + np.clip(frac, 0.0, 1.0)
+
+
+class TriggerEngine:
+    """
+    Edge trigger with auto / normal / single modes.
+
+    locate() picks the trigger point for the next display window.
+    After each call .status is one of:
+      "TRIG'D"  a trigger was found; show the aligned window
+      "AUTO"    auto mode gave up waiting; show the untriggered data
+      "WAIT"    no trigger yet; keep the previous display
+      "STOP"    single mode already fired; display is frozen until arm()
+    """
+
+    def __init__(self, level=0.0, slope="rising", mode="auto",
+                 hysteresis=0.05, holdoff=0.0, position=0.5,
+                 auto_frames=3):
+        self.level = level
+        self.slope = slope
+        self.mode = mode
+        self.hysteresis = hysteresis      # volts
+        self.holdoff = holdoff            # seconds
+        self.position = position          # trigger point in the window
+        self.auto_frames = auto_frames    # misses before auto free-runs
+
+        self.status = "WAIT"
+        self._last = None                 # absolute position of last trigger
+        self._misses = 0
+        self._fired = False
+
+    def configure(self, **settings):
+        """Change settings; the trigger re-arms if anything changed."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Unknown trigger setting: {name}")
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.arm()
+        if self.slope not in SLOPES:
+            raise ValueError(f"Unknown slope: {self.slope!r}")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown trigger mode: {self.mode!r}")
+
+    def arm(self):
+        """Forget the previous trigger (and re-arm single mode)."""
+        self._last = None
+        self._misses = 0
+        self._fired = False
+        self.status = "WAIT"
+
+    def locate(self, y, start, n_window, fs):
+        """
+        Absolute start (float) of an n_window display window aligned to
+        the newest usable trigger in y, or None (see .status).
+
+        y holds one channel's samples at absolute positions start,
+        start + 1, ...; only edges with a full window around them count.
+        """
+        if self.mode == "single" and self._fired:
+            self.status = "STOP"
+            return None
+
+        pre = self.position * (n_window - 1)
+        lo = int(np.ceil(pre))
+        hi = len(y) - n_window + lo
+        edges = np.empty(0)
+        if hi > lo:
+            # One sample of margin on the left for the interpolation
+            edges = find_edges(
+                y[lo - 1:hi + 1] if lo else y[:hi + 1],
+                self.level, self.slope, self.hysteresis
+            ) + max(lo - 1, 0) + start
+            edges = edges[(edges >= start + pre) & (edges <= start + hi)]
+            if self._last is not None and len(edges):
+                edges = edges[edges >= self._last + self.holdoff * fs]
+
+        if len(edges):
+            self._last = float(edges[-1])
+            self._misses = 0
+            self._fired = True
+            self.status = "TRIG'D"
+            return self._last - pre
+
+        self._misses += 1
+        if self.mode == "auto" and self._misses >= self.auto_frames:
+            self.status = "AUTO"
+        else:
+            self.status = "WAIT"
+        return None
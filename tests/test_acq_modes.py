@@ -0,0 +1,83 @@
+# tests/test_acq_modes.py
+
+import numpy as np
+import pytest
+
+from scope.acq_modes import AcqEngine
+
+
+def records(count, shape=(2, 8), seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(size=shape) for _ in range(count)]
+
+
+def test_boxcar_is_the_mean_of_the_last_n_records():
+    engine = AcqEngine("average", n_avg=3, averaging="boxcar")
+    history = records(7)
+    for i, record in enumerate(history):
+        data = record.copy()
+        engine.update(data)
+        window = history[max(0, i - 2):i + 1]
+        np.testing.assert_allclose(data, np.mean(window, axis=0))
+    assert engine.status_text() == "ACQ: AVG 3/3"
+
+
+def test_exponential_starts_as_a_plain_mean():
+    engine = AcqEngine("average", n_avg=4)
+    history = records(6)
+    expected = None
+    for i, record in enumerate(history):
+        data = record.copy()
+        engine.update(data)
+        if i < 4:
+            expected = np.mean(history[:i + 1], axis=0)
+        else:
+            expected = expected + (record - expected) / 4
+        np.testing.assert_allclose(data, expected)
+
+
+def test_envelope_accumulates_min_max_per_bin():
+    engine = AcqEngine("envelope")
+    history = records(5)
+    for record in history:
+        engine.update(record.copy(), n_bins=4)
+    stack = np.stack(history).reshape(5, 2, 4, 2)
+    xs, ys = engine.points()
+    np.testing.assert_allclose(ys[:, 0::2], stack.min(axis=(0, 3)))
+    np.testing.assert_allclose(ys[:, 1::2], stack.max(axis=(0, 3)))
+    np.testing.assert_array_equal(xs[0], [0, 0, 2, 2, 4, 4, 6, 6])
+    assert engine.shows_min_max
+    assert engine.status_text() == "ACQ: ENV 5"
+
+
+def test_peak_detect_shows_only_the_latest_record():
+    engine = AcqEngine("peak")
+    history = records(3)
+    for record in history:
+        engine.update(record.copy(), n_bins=2)
+    last = history[-1].reshape(2, 2, 4)
+    _, ys = engine.points(rows=[1])
+    np.testing.assert_allclose(ys[0, 0::2], last[1].min(axis=1))
+    np.testing.assert_allclose(ys[0, 1::2], last[1].max(axis=1))
+
+
+def test_settings_change_restarts_accumulation():
+    engine = AcqEngine("envelope")
+    engine.update(np.full((1, 4), 5.0))
+    engine.configure(mode="envelope")
+    assert engine.count == 1
+    engine.configure(n_avg=4)
+    assert engine.count == 0
+    engine.update(np.zeros((1, 4)))
+    _, ys = engine.points()
+    np.testing.assert_allclose(ys, 0.0)
+    with pytest.raises(ValueError):
+        engine.configure(mode="roll")
+
+
+def test_sample_mode_leaves_the_record_alone():
+    engine = AcqEngine()
+    data = np.arange(8.0).reshape(2, 4)
+    engine.update(data)
+    np.testing.assert_array_equal(data, np.arange(8.0).reshape(2, 4))
+    assert not engine.shows_min_max
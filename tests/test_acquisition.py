@@ -0,0 +1,83 @@
+# tests/test_acquisition.py
+
+import threading
+import time
+
+import numpy as np
+
+from scope.acquisition import AcquisitionWorker, FrameSlot
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_slot_keeps_the_newest_frame():
+    slot = FrameSlot()
+    slot.publish("a")
+    slot.publish("b")
+    assert slot.take() == "b"
+    assert slot.take() is None
+    assert (slot.published, slot.taken, slot.dropped) == (2, 1, 1)
+
+
+def test_failing_sink_does_not_stop_acquisition():
+    seen = []
+
+    def broken(frame):
+        raise OSError("disk full")
+    worker = AcquisitionWorker(
+        lambda: (np.zeros((1, 4)), 100.0), rate_hz=200,
+        sinks=[broken, seen.append])
+    worker.start()
+    try:
+        assert wait_for(lambda: worker.slot.published >= 5)
+        assert isinstance(worker.error, OSError)
+        assert len(seen) >= 5             # later sinks still run
+    finally:
+        worker.stop()
+    assert not worker.running
+
+
+def test_error_clears_when_the_producer_recovers():
+    calls = []
+
+    def producer():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("no instrument")
+        return np.zeros((1, 4)), 100.0
+    worker = AcquisitionWorker(producer, rate_hz=200)
+    worker.start()
+    try:
+        assert wait_for(lambda: worker.slot.published >= 1)
+        assert wait_for(lambda: worker.error is None)
+    finally:
+        worker.stop()
+
+
+def test_restart_while_stopping_never_runs_two_threads():
+    release = threading.Event()
+
+    def slow():
+        release.wait(2.0)
+        return np.zeros((1, 4)), 100.0
+    worker = AcquisitionWorker(slow, rate_hz=200)
+    worker.start()
+    time.sleep(0.05)
+    worker.stop(timeout=0.01)             # the producer is still busy
+    assert worker.running
+    worker.start()
+    release.set()
+    try:
+        time.sleep(0.05)
+        threads = [t for t in threading.enumerate()
+                   if t.name == "acquisition"]
+        assert len(threads) == 1
+        assert worker.running
+    finally:
+        worker.stop()
+    assert wait_for(lambda: not worker.running)
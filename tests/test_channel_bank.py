@@ -0,0 +1,67 @@
+# tests/test_channel_bank.py
+
+import numpy as np
+
+from scope.channel_bank import ChannelBank
+
+
+def test_write_all_bumps_only_changed_rows():
+    bank = ChannelBank(3, 4)
+    signals = np.arange(12.0).reshape(3, 4)
+    bank.write_all(signals)
+    np.testing.assert_array_equal(bank.row_version, [1, 1, 1])
+    assert bank.version == 1
+
+    signals[1] += 10
+    bank.write_all(signals, changed=[False, True, False])
+    np.testing.assert_array_equal(bank.row_version, [1, 2, 1])
+    np.testing.assert_array_equal(bank.data, signals)
+    assert bank.version == 2
+
+
+def test_write_all_with_nothing_changed_is_a_no_op():
+    bank = ChannelBank(2, 4)
+    bank.write_all(np.ones((2, 4)))
+    bank.write_all(np.ones((2, 4)), changed=[False, False])
+    np.testing.assert_array_equal(bank.row_version, [1, 1])
+    assert bank.version == 1
+
+
+def test_invalid_rows_are_written_even_if_unchanged():
+    bank = ChannelBank(2, 4)
+    bank.write_all(np.ones((2, 4)))
+    bank.invalidate(0)
+    bank.write_all(np.full((2, 4), 2.0), changed=[False, False])
+    np.testing.assert_array_equal(bank.row_version, [3, 1])
+    np.testing.assert_array_equal(bank.data[0], 2.0)
+    assert bank.valid.all()
+
+
+def test_length_change_rewrites_every_row():
+    bank = ChannelBank(2, 4)
+    bank.write_all(np.ones((2, 4)))
+    bank.write_all(np.zeros((2, 6)), changed=[False, False])
+    assert bank.n_samples == 6
+    np.testing.assert_array_equal(bank.row_version, [2, 2])
+
+
+def test_single_write_bumps_its_row():
+    bank = ChannelBank(2, 4)
+    bank.write(1, np.ones(4))
+    np.testing.assert_array_equal(bank.row_version, [0, 1])
+    assert bank.signal(0) is None
+    # A new record length invalidates the other channels
+    bank.write(0, np.ones(8))
+    assert bank.valid.tolist() == [True, False]
+
+
+def test_display_applies_coupling_and_scale():
+    bank = ChannelBank(3, 4)
+    bank.write_all(np.array([[1.0, 3.0, 1.0, 3.0]] * 3))
+    bank.scale[:] = 2.0
+    bank.offset[:] = 1.0
+    bank.set_coupling(1, "AC")
+    bank.set_coupling(2, "GND")
+    np.testing.assert_allclose(bank.display(), [[3, 7, 3, 7],
+                                                [-1, 3, -1, 3],
+                                                [1, 1, 1, 1]])
@@ -0,0 +1,91 @@
+# tests/test_dds.py
+
+import numpy as np
+import pytest
+
+from scope.dds import DDSGenerator, make_table
+from scope.signal_cache import SignalCache
+
+FS = 1000.0
+# Largest error of a 4096-entry table lookup on a unit sine
+TABLE_STEP = 2 * np.pi / 4096
+
+
+def test_blocks_continue_the_phase():
+    one = DDSGenerator(1)
+    whole = one.generate(0, "sine", 13.7, 1.0, FS, 1200)
+
+    split = DDSGenerator(1)
+    parts = [split.generate(0, "sine", 13.7, 1.0, FS, n)
+             for n in (500, 300, 400)]
+    np.testing.assert_allclose(np.concatenate(parts), whole, atol=TABLE_STEP)
+
+
+def test_matches_the_ideal_sine():
+    dds = DDSGenerator(1)
+    out = np.concatenate([dds.generate(0, "sine", 5.3, 2.0, FS, 250)
+                          for _ in range(4)])
+    ideal = 2.0 * np.sin(2 * np.pi * 5.3 * np.arange(1000) / FS)
+    np.testing.assert_allclose(out, ideal, atol=2 * TABLE_STEP)
+
+
+def test_frequency_change_is_glitch_free():
+    dds = DDSGenerator(1)
+    low = dds.generate(0, "sine", 5.0, 1.0, FS, 333)
+    high = dds.generate(0, "sine", 40.0, 1.0, FS, 333)
+    signal = np.concatenate([low, high])
+    # No sample-to-sample jump bigger than the faster sine's slope
+    max_step = 2 * np.pi * 40.0 / FS + TABLE_STEP
+    assert np.abs(np.diff(signal)).max() <= max_step
+    # The new frequency starts from the phase the old one reached
+    start = 5.0 * 333 / FS
+    ideal = np.sin(2 * np.pi * (start + 40.0 * np.arange(333) / FS))
+    np.testing.assert_allclose(high, ideal, atol=2 * TABLE_STEP)
+
+
+def test_whole_periods_end_where_they_began():
+    dds = DDSGenerator(2)
+    dds.generate(0, "square", 10.0, 1.0, FS, 500)
+    dds.generate(1, "triangle", 7.3, 1.0, FS, 500)
+    assert dds.phase[0] == 0
+    assert dds.phase[1] != 0
+    dds.reset(1)
+    assert not dds.phase.any()
+
+
+def test_changed_flags_follow_the_keys():
+    dds = DDSGenerator(2)
+    dds.generate(0, "sine", 10.0, 1.0, FS, 500)
+    dds.generate(1, "sine", 7.3, 1.0, FS, 500)
+    assert dds.changed.tolist() == [True, True]
+
+    # Ch1 repeats exactly (whole periods); Ch2 moved on in phase
+    dds.generate(0, "sine", 10.0, 1.0, FS, 500)
+    dds.generate(1, "sine", 7.3, 1.0, FS, 500)
+    assert dds.changed.tolist() == [False, True]
+
+    dds.generate(0, "sine", 10.0, 0.5, FS, 500)
+    assert dds.changed[0]
+    dds.mark(1)
+    assert dds.changed[1]
+
+
+def test_repeating_blocks_come_from_the_cache():
+    cache = SignalCache()
+    dds = DDSGenerator(1, cache=cache)
+    first = dds.generate(0, "sine", 10.0, 1.0, FS, 500)
+    second = dds.generate(0, "sine", 10.0, 1.0, FS, 500)
+    assert second is first
+    assert not second.flags.writeable
+    assert cache.hits == 1
+
+
+def test_arbitrary_table_is_normalized():
+    dds = DDSGenerator(1, cache=SignalCache())
+    dds.set_table("arb", [0.0, 2.0, 0.0, -4.0])
+    assert np.abs(dds.tables["arb"]).max() == pytest.approx(1.0)
+    assert len(dds.cache) == 0
+    with pytest.raises(ValueError):
+        dds.set_table("arb", [1.0])
+    with pytest.raises(ValueError):
+        make_table("noise")
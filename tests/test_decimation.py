@@ -0,0 +1,42 @@
+# tests/test_decimation.py
+
+import numpy as np
+import pytest
+
+from scope.decimation import decimate, minmax_decimate
+
+
+def test_minmax_keeps_a_single_sample_glitch():
+    y = np.zeros(100003)
+    y[77777] = 5.0
+    xs, ys = minmax_decimate(y, 100)
+    assert len(ys) == 2 * 101          # 100 bins plus the remainder
+    assert ys.max() == 5.0
+    assert 77777 in xs
+
+
+def test_minmax_points_are_in_time_order():
+    rng = np.random.default_rng(3)
+    y = rng.normal(size=(2, 5000))
+    xs, ys = minmax_decimate(y, 64)
+    assert np.all(np.diff(xs, axis=-1) >= 0)
+    np.testing.assert_array_equal(np.take_along_axis(y, xs, axis=-1), ys)
+
+
+def test_short_input_is_unchanged():
+    y = np.arange(10.0)
+    xs, ys = decimate(y, 100)
+    np.testing.assert_array_equal(xs, np.arange(10))
+    np.testing.assert_array_equal(ys, y)
+
+
+def test_lttb_returns_requested_points_with_endpoints():
+    y = np.sin(np.linspace(0, 20, 10000))
+    xs, ys = decimate(y, 50, method="lttb")
+    assert len(xs) == 100
+    assert xs[0] == 0 and xs[-1] == 9999
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        decimate(np.zeros(10), 5, method="cubic")
@@ -0,0 +1,105 @@
+# tests/test_deep_record.py
+
+import numpy as np
+import pytest
+
+from scope.deep_record import CHUNK, DeepRecord
+
+# Long enough to span three read chunks, not a multiple of any block
+LENGTH = 2 * CHUNK + 12345
+
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("deep"))
+    rng = np.random.default_rng(18)
+    data = rng.normal(size=(2, LENGTH)).astype(np.float32)
+    data[1] += np.linspace(-3, 3, LENGTH, dtype=np.float32)
+    record = DeepRecord(path, 2, LENGTH + 1000, fs=1e6)
+    for a in range(0, LENGTH, 300007):
+        record.append(data[:, a:a + 300007])
+    record.flush()
+    yield record, data
+    record.close()
+
+
+def brute_min_max(data, edges):
+    lo = np.array([data[:, a:b].min(axis=1)
+                   for a, b in zip(edges[:-1], edges[1:])]).T
+    hi = np.array([data[:, a:b].max(axis=1)
+                   for a, b in zip(edges[:-1], edges[1:])]).T
+    return lo, hi
+
+
+def test_read_across_chunks(recorded):
+    record, data = recorded
+    assert record.length == LENGTH
+    a, b = CHUNK - 10, 2 * CHUNK + 10
+    np.testing.assert_array_equal(record.read(a, b), data[:, a:b])
+    pieces = list(record.chunks(a, b))
+    assert [offset for offset, _ in pieces] == [a, a + CHUNK]
+    np.testing.assert_array_equal(
+        np.concatenate([p for _, p in pieces], axis=1), data[:, a:b])
+
+
+def test_close_zoom_window_across_a_chunk_boundary(recorded):
+    record, data = recorded
+    start, stop, n_pixels = CHUNK - 3001, CHUNK + 2999, 100
+    xs, ys = record.window(start, stop, n_pixels)
+    edges = np.linspace(start, stop, n_pixels + 1).astype(np.int64)
+    lo, hi = brute_min_max(data, edges)
+    np.testing.assert_array_equal(xs, np.repeat(edges[:-1], 2))
+    np.testing.assert_allclose(ys[:, 0::2], lo)
+    np.testing.assert_allclose(ys[:, 1::2], hi)
+
+
+def test_wide_window_from_the_index(recorded):
+    record, data = recorded
+    # 4096 samples per pixel: whole blocks of index level 3
+    stop = 512 * 4096
+    xs, ys = record.window(0, stop, 512)
+    lo, hi = brute_min_max(data, np.arange(0, stop + 1, 4096))
+    np.testing.assert_allclose(ys[:, 0::2], lo)
+    np.testing.assert_allclose(ys[:, 1::2], hi)
+
+    # The whole record, including the unindexed tail
+    _, ys = record.window(0, LENGTH, 640)
+    np.testing.assert_allclose(ys.min(axis=1), data.min(axis=1))
+    np.testing.assert_allclose(ys.max(axis=1), data.max(axis=1))
+
+
+def test_raw_window_when_zoomed_in(recorded):
+    record, data = recorded
+    xs, ys = record.window(CHUNK - 50, CHUNK + 50, 100)
+    np.testing.assert_array_equal(xs, np.arange(CHUNK - 50, CHUNK + 50))
+    np.testing.assert_array_equal(ys, data[:, CHUNK - 50:CHUNK + 50])
+
+
+@pytest.mark.parametrize("start, stop", [
+    (777, LENGTH - 333),
+    (CHUNK - 5, CHUNK + 7),
+    (0, LENGTH),
+])
+def test_stats_match_the_raw_data(recorded, start, stop):
+    record, data = recorded
+    region = data[:, start:stop].astype(np.float64)
+    stats = record.stats(start, stop)
+    assert stats["n"] == stop - start
+    np.testing.assert_allclose(stats["mean"], region.mean(axis=1),
+                               rtol=1e-6, atol=1e-9)
+    np.testing.assert_allclose(stats["rms"],
+                               np.sqrt((region ** 2).mean(axis=1)),
+                               rtol=1e-6)
+    np.testing.assert_allclose(stats["min"], region.min(axis=1))
+    np.testing.assert_allclose(stats["max"], region.max(axis=1))
+
+
+def test_reopened_record_uses_the_saved_index(recorded):
+    record, data = recorded
+    reopened = DeepRecord(record.path, mode="r")
+    assert reopened.length == LENGTH
+    assert reopened.pyramid.length == LENGTH
+    stats = reopened.stats(100, LENGTH - 100)
+    np.testing.assert_allclose(stats["max"],
+                               data[:, 100:LENGTH - 100].max(axis=1))
+    reopened.close()
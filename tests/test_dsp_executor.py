@@ -0,0 +1,80 @@
+# tests/test_dsp_executor.py
+
+import time
+
+import numpy as np
+import pytest
+
+from scope.dsp_executor import DSPExecutor
+from scope.measurements import measure_rows
+from scope.spectrum import amplitude_spectrum
+
+FS = 1000.0
+
+
+def block(rows=5, n=1000):
+    t = np.arange(n) / FS
+    freqs = 10.0 + 7.0 * np.arange(rows)
+    return np.sin(2 * np.pi * freqs[:, None] * t)
+
+
+def merge_measurements(results):
+    return {name: np.concatenate([r[name] for r in results])
+            for name in results[0]}
+
+
+def merge_spectra(results):
+    return results[0][0], np.vstack([mags for _, mags in results])
+
+
+@pytest.fixture(params=["serial", "thread", "process"])
+def executor(request):
+    executor = DSPExecutor(request.param, max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_modes_give_the_same_results(executor):
+    data = block()
+    names = ("freq", "rms", "pk2pk")
+    expected = measure_rows(data, FS, names)
+    got = merge_measurements(executor.run(measure_rows, data, FS, names))
+    for name in names:
+        np.testing.assert_allclose(got[name], expected[name])
+
+    freqs, mags = amplitude_spectrum(data, FS, "hann")
+    got_freqs, got_mags = merge_spectra(
+        executor.run(amplitude_spectrum, data, FS, "hann"))
+    np.testing.assert_array_equal(got_freqs, freqs)
+    np.testing.assert_allclose(got_mags, mags)
+
+
+def test_submit_and_collect(executor):
+    data = block()
+    assert executor.collect("fft") is None
+    assert executor.submit("fft", amplitude_spectrum, data, FS, tag="all")
+    # The caller may overwrite its buffer right after submitting
+    data[:] = 0.0
+    deadline = time.monotonic() + 30
+    result = None
+    while result is None and time.monotonic() < deadline:
+        result = executor.collect("fft")
+        time.sleep(0.01)
+    tag, results = result
+    assert tag == "all"
+    _, mags = merge_spectra(results)
+    np.testing.assert_allclose(mags, amplitude_spectrum(block(), FS)[1])
+    # Each finished job is returned once
+    assert executor.collect("fft") is None
+
+
+def test_chunks_cover_every_row_once():
+    executor = DSPExecutor("thread", max_workers=4)
+    assert executor._chunks(10) == [(0, 2), (2, 5), (5, 7), (7, 10)]
+    assert executor._chunks(2) == [(0, 1), (1, 2)]
+    executor.shutdown()
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        DSPExecutor("gpu")
@@ -0,0 +1,70 @@
+# tests/test_engine.py
+
+import numpy as np
+
+from scope.acquisition import AcquiredFrame
+from scope.engine import ScopeEngine
+from scope.recorder import StreamRecorder
+from scope.replay import CaptureFile, ReplaySource
+
+
+def test_generator_run_and_measurements():
+    engine = ScopeEngine(n_channels=2, n_samples=500, fs=1000.0, seed=0)
+    engine.set_channel(0, freq=10.0)
+    engine.set_channel(1, sig_type="square", freq=20.0, amp=2.0)
+    assert engine.run(frames=3) == 3
+    results = engine.measurements(["freq", "pk2pk"])
+    np.testing.assert_allclose(results["freq"], [10.0, 20.0], rtol=1e-3)
+    np.testing.assert_allclose(results["pk2pk"], [2.0, 4.0], rtol=1e-2)
+    freqs, values = engine.spectrum_of(0)
+    assert freqs[np.argmax(values)] == 10.0
+
+
+def test_jobs_match_the_direct_analysis():
+    engine = ScopeEngine(fs=500.0, seed=0)
+    engine.run(frames=2)
+    func, *args = engine.measure_job(["rms"], rows=np.array([1]))
+    np.testing.assert_allclose(func(*args)["rms"],
+                               engine.measurements(["rms"])["rms"][1:])
+    func, data, fs, *_ = engine.spectrum_job(0)
+    assert data.shape == (1, engine.n_samples) and fs == 500.0
+
+
+def test_replay_is_analysed_at_the_recorded_rate(tmp_path):
+    recording = ScopeEngine(fs=1000.0, seed=0)
+    path = str(tmp_path / "c.kbkrec")
+    channels = [{"name": "CH1"}, {"name": "CH2"}]
+    recorder = StreamRecorder(path, recording.fs, channels,
+                              on_full="block", block_timeout=5.0)
+    recording.run(frames=3, on_frame=recorder.submit)
+    recorder.close()
+
+    replay = ScopeEngine(fs=500.0)
+    replay.set_source(ReplaySource(CaptureFile(path), speed=None))
+    assert replay.fs == 1000.0
+    assert replay.run(frames=10) == 3     # stops at the end of the file
+    np.testing.assert_allclose(
+        replay.measurements(["freq"])["freq"][0], 5.0, rtol=1e-3)
+
+    replay.set_source(None)
+    replay.run(frames=1)
+    assert replay.fs == 500.0
+
+
+def test_acquisition_mode_is_applied_on_load():
+    engine = ScopeEngine(n_samples=100)
+    engine.acq.configure(mode="average", n_avg=4, averaging="boxcar")
+    rng = np.random.default_rng(3)
+    records = [rng.normal(size=(2, 100)) for _ in range(6)]
+    for i, data in enumerate(records):
+        frame = AcquiredFrame(i, data, 1000.0, float(i))
+        engine.store_history(frame)
+        engine.load(frame, roll=True)
+    np.testing.assert_allclose(engine.bank.data,
+                               np.mean(records[-4:], axis=0))
+
+    engine.acq.configure(mode="envelope")
+    engine.acq_bins = 10
+    engine.run(frames=2)
+    assert engine.acq.shows_min_max
+    assert engine.acq.points()[1].shape == (2, 20)
@@ -0,0 +1,82 @@
+# tests/test_export.py
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from scope.export import ExportJob, array_reader, export_data, format_for
+
+CHANNELS = [{"name": "CH1"}, {"name": "CH2"}]
+FS = 250.0
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    return rng.normal(size=(2, 1000)).astype(np.float32)
+
+
+def export(tmp_path, data, name, start=100, stop=900):
+    path = str(tmp_path / name)
+    n = export_data(path, array_reader(data), start, stop, FS, CHANNELS,
+                    chunk=128)
+    assert n == stop - start
+    return path
+
+
+def test_csv(tmp_path, data):
+    path = export(tmp_path, data, "out.csv")
+    with open(path) as f:
+        assert f.readline().strip() == "time,CH1,CH2"
+    table = np.loadtxt(path, delimiter=",", skiprows=1)
+    np.testing.assert_allclose(table[:, 0], np.arange(100, 900) / FS)
+    np.testing.assert_allclose(table[:, 1:].T, data[:, 100:900], rtol=1e-6)
+
+
+def test_npy_with_sidecar(tmp_path, data):
+    path = export(tmp_path, data, "out.npy")
+    np.testing.assert_array_equal(np.load(path), data[:, 100:900])
+    with open(path + ".json") as f:
+        meta = json.load(f)
+    assert meta["fs"] == FS
+    assert meta["start_sample"] == 100 and meta["n_samples"] == 800
+    assert meta["channels"] == CHANNELS
+
+
+def test_npz(tmp_path, data):
+    path = export(tmp_path, data, "out.npz")
+    with np.load(path) as f:
+        np.testing.assert_array_equal(f["CH1"], data[0, 100:900])
+        np.testing.assert_array_equal(f["CH2"], data[1, 100:900])
+
+
+def test_bin_is_interleaved(tmp_path, data):
+    path = export(tmp_path, data, "out.bin")
+    raw = np.fromfile(path, dtype="<f4").reshape(-1, 2)
+    np.testing.assert_array_equal(raw.T, data[:, 100:900])
+
+
+def test_bad_requests(tmp_path, data):
+    with pytest.raises(ValueError):
+        format_for("out.xlsx")
+    with pytest.raises(ValueError):
+        export_data(str(tmp_path / "e.npy"), array_reader(data), 5, 5, FS,
+                    CHANNELS)
+
+
+def test_cancelled_job_removes_the_partial_file(tmp_path, data):
+    path = str(tmp_path / "c.npy")
+    go = threading.Event()
+
+    def gated_read(a, b):
+        go.wait(5.0)
+        return data[:, a:b]
+    job = ExportJob(path, gated_read, 0, 1000, FS, CHANNELS, chunk=100)
+    job.cancel()
+    go.set()
+    job.join(5.0)
+    assert job.done
+    assert job.status_text() == "Export cancelled"
+    assert not (tmp_path / "c.npy").exists()
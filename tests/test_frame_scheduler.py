@@ -0,0 +1,76 @@
+# tests/test_frame_scheduler.py
+
+from scope.frame_scheduler import FrameScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_frame(scheduler, clock, work, tasks=()):
+    scheduler.begin_frame()
+    ran = [task for task in tasks if scheduler.due(task)]
+    clock.now += work
+    delay = scheduler.end_frame()
+    clock.now += delay / 1000.0
+    return delay, ran
+
+
+def test_light_frames_keep_the_target_rate():
+    clock = FakeClock()
+    scheduler = FrameScheduler(target_fps=50.0, clock=clock)
+    for _ in range(100):
+        delay, ran = run_frame(scheduler, clock, 0.005, ["fft"])
+        assert ran == ["fft"]
+    assert delay == 15
+    assert scheduler.divider() == 1
+    assert scheduler.skipped_total == 0
+    assert scheduler.status_text() == "RT: 50 FPS"
+
+
+def test_overload_backs_off_secondary_work_and_recovers():
+    clock = FakeClock()
+    scheduler = FrameScheduler(target_fps=50.0, max_divider=8, clock=clock)
+    runs = 0
+    for _ in range(60):
+        delay, ran = run_frame(scheduler, clock, 0.050, ["fft"])
+        runs += len(ran)
+    # 50 ms of work in a 20 ms budget: the idle gap stays proportional
+    assert delay == round(1000 * 0.25 * 0.050)
+    assert scheduler.load > 2.0
+    assert scheduler.divider() == 3
+    assert runs < 30
+    assert scheduler.skipped_total > 0
+    assert scheduler.status_text().startswith("RT: SKIP")
+
+    # Once the load drops the divider and the skip counter settle again
+    for _ in range(150):
+        run_frame(scheduler, clock, 0.002, ["fft"])
+    assert scheduler.divider() == 1
+    assert not scheduler.skipping
+    _, ran = run_frame(scheduler, clock, 0.002, ["fft"])
+    assert ran == ["fft"]
+
+
+def test_divider_is_capped():
+    clock = FakeClock()
+    scheduler = FrameScheduler(target_fps=100.0, max_divider=4, clock=clock)
+    for _ in range(30):
+        run_frame(scheduler, clock, 0.200)
+    assert scheduler.divider() == 4
+    assert scheduler.divider(base_every=3) == 4
+
+
+def test_reset_forgets_history():
+    clock = FakeClock()
+    scheduler = FrameScheduler(clock=clock)
+    for _ in range(10):
+        run_frame(scheduler, clock, 0.1, ["fft"])
+    scheduler.reset()
+    assert scheduler.frame_time == 0.0
+    assert scheduler.skipped_total == 0
+    assert scheduler.due("fft")
@@ -0,0 +1,74 @@
+# tests/test_headless.py
+
+import pytest
+
+import headless
+from main import parse_args
+from scope.engine import ScopeEngine
+from scope.recorder import StreamRecorder
+
+
+@pytest.mark.parametrize("argv", [
+    ["--frames", "0"],
+    ["--frames", "2", "--channels", "0"],
+    ["--frames", "2", "--samples", "-1"],
+    ["--seconds", "0"],
+    ["--frames", "2", "--signal", "sine:fast"],
+    ["--frames", "2", "--signal", "sawtooth"],
+    ["--frames", "2", "--source", "localhost"],
+    ["--frames", "2", "--source", "localhost:70000"],
+    ["--frames", "2", "--measure", "bogus"],
+])
+def test_bad_arguments_are_rejected(argv):
+    with pytest.raises(SystemExit) as info:
+        parse_args(["--headless"] + argv)
+    assert info.value.code == 2
+
+
+def test_good_arguments():
+    args = parse_args(["--headless", "--frames", "2", "--signal",
+                       "square:10:2", "--source", "scope:5025",
+                       "--measure", "freq", "--acquire", "average"])
+    assert headless.parse_signal(args.signal[0]) == {
+        "sig_type": "square", "freq": 10.0, "amp": 2.0}
+    assert headless.parse_address(args.source) == ("scope", 5025)
+    assert headless.parse_address("5025") == ("127.0.0.1", 5025)
+
+
+def test_run_writes_measurements(tmp_path):
+    output = tmp_path / "out.csv"
+    args = parse_args(["--headless", "--frames", "3", "--measure", "freq",
+                       "--output", str(output), "--signal", "sine:10"])
+    assert headless.run(args) == 0
+    lines = output.read_text().splitlines()
+    assert lines[0] == "frame,time,channel,freq"
+    assert lines[1].endswith(",CH1,10")
+
+
+def test_missing_source_is_reported(tmp_path, capsys):
+    args = parse_args(["--headless", "--frames", "1",
+                       "--source", str(tmp_path / "missing.kbkrec")])
+    assert headless.run(args) == 1
+    assert "[Headless] Cannot open" in capsys.readouterr().err
+
+
+def test_source_is_closed_after_the_run(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.kbkrec")
+    engine = ScopeEngine(seed=0)
+    channels = [{"name": "CH1"}, {"name": "CH2"}]
+    recorder = StreamRecorder(path, engine.fs, channels, on_full="block")
+    engine.run(frames=3, on_frame=recorder.submit)
+    recorder.close()
+
+    opened = []
+    real_open = headless.open_source
+
+    def open_source(spec, n_samples):
+        opened.append(real_open(spec, n_samples))
+        return opened[-1]
+    monkeypatch.setattr(headless, "open_source", open_source)
+    args = parse_args(["--headless", "--frames", "2", "--source", path,
+                       "--output", str(tmp_path / "out.csv")])
+    assert headless.run(args) == 0
+    with pytest.raises(ValueError):
+        opened[0].capture.frame(0)
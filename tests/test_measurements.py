@@ -0,0 +1,81 @@
+# tests/test_measurements.py
+
+import numpy as np
+
+from scope.measurements import MEASUREMENTS, MeasurementEngine, measure_rows
+
+FS = 500.0
+T = np.arange(500) / FS
+
+
+def test_clean_sine():
+    sine = np.sin(2 * np.pi * 5 * T)
+    r = measure_rows(sine, FS, MEASUREMENTS)
+    np.testing.assert_allclose(r["freq"], 5.0)
+    np.testing.assert_allclose(r["period"], 0.2)
+    np.testing.assert_allclose(r["duty"], 50.0, atol=0.5)
+    np.testing.assert_allclose(r["rms"], 1 / np.sqrt(2), atol=1e-3)
+    np.testing.assert_allclose(r["pk2pk"], 2.0, atol=1e-3)
+    # No flat top: the histogram falls back to max, so no overshoot
+    np.testing.assert_allclose(r["overshoot"], 0.0)
+
+
+def test_noisy_sine_frequency_uses_hysteresis():
+    rng = np.random.default_rng(5)
+    noisy = np.sin(2 * np.pi * 5 * T) + rng.normal(0, 0.05, T.size)
+    r = measure_rows(noisy, FS, ("freq", "period", "duty"))
+    np.testing.assert_allclose(r["freq"], 5.0, rtol=0.01)
+    np.testing.assert_allclose(r["period"], 0.2, rtol=0.01)
+    np.testing.assert_allclose(r["duty"], 50.0, atol=2.0)
+
+
+def test_square_duty_and_overshoot():
+    square = np.where((T * 5) % 1.0 < 0.3, 1.0, -1.0)
+    r = measure_rows(square, FS, ("freq", "duty", "overshoot"))
+    np.testing.assert_allclose(r["freq"], 5.0)
+    np.testing.assert_allclose(r["duty"], 30.0, atol=0.5)
+    np.testing.assert_allclose(r["overshoot"], 0.0)
+
+    # Ringing after each rising edge: 20 % over the settled top
+    ringing = square.copy()
+    rises = np.flatnonzero(np.diff(square) > 0) + 1
+    ringing[rises] = 1.4
+    r = measure_rows(ringing, FS, ("overshoot",))
+    np.testing.assert_allclose(r["overshoot"], 20.0, atol=2.0)
+
+
+def test_rows_are_independent_and_dc_is_undefined():
+    block = np.vstack([np.sin(2 * np.pi * 10 * T), np.full(T.size, 0.5)])
+    r = MeasurementEngine().compute(block, FS, ("freq", "mean"))
+    np.testing.assert_allclose(r["freq"][0], 10.0)
+    assert np.isnan(r["freq"][1])
+    np.testing.assert_allclose(r["mean"], [0.0, 0.5], atol=1e-12)
+
+
+def test_only_required_measurements_are_computed():
+    engine = MeasurementEngine()
+    engine.require("table", ("rms", "freq"))
+    engine.require("overlay", ("peak",))
+    assert engine.required == ("peak", "rms", "freq")
+    r = engine.compute(np.sin(2 * np.pi * 5 * T), FS)
+    assert set(r) == {"peak", "rms", "freq"}
+
+
+def test_block_crossings_match_find_edges_per_row():
+    from scope.measurements import HYSTERESIS, _Frame
+    from scope.trigger import find_edges
+
+    rng = np.random.default_rng(9)
+    block = np.vstack([
+        np.sin(2 * np.pi * f * T) + rng.normal(0, 0.05, T.size)
+        for f in (3.0, 7.5, 11.0)
+    ] + [np.full(T.size, 0.2)])
+    count, t_first, t_last = _Frame(block, FS).get("cycles")
+    for i, row in enumerate(block):
+        mid = 0.5 * (row.max() + row.min())
+        edges = find_edges(row, mid, "rising",
+                           HYSTERESIS * (row.max() - row.min()))
+        assert count[i] == len(edges)
+        if len(edges):
+            assert t_first[i] == edges[0]
+            assert t_last[i] == edges[-1]
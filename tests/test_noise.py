@@ -0,0 +1,51 @@
+# tests/test_noise.py
+
+import numpy as np
+import pytest
+
+from scope.noise import NoiseSource
+
+
+def stream(source, color, blocks=40, n=1000):
+    return np.concatenate(
+        [np.array(source.take(n, color), dtype=float) for _ in range(blocks)])
+
+
+def test_equal_seeds_give_equal_sequences():
+    a = NoiseSource(seed=42, pool_size=4096, background=False)
+    b = NoiseSource(seed=42, pool_size=4096, background=False)
+    b.take(500, "pink")                   # other colors do not interfere
+    np.testing.assert_array_equal(stream(a, "white", 10),
+                                  stream(b, "white", 10))
+
+
+@pytest.mark.parametrize("color", ["white", "pink", "brown"])
+def test_unit_rms(color):
+    source = NoiseSource(seed=1, pool_size=1 << 15, background=False)
+    assert abs(stream(source, color).std() - 1.0) < 0.2
+
+
+def test_noise_scales_into_a_reused_buffer():
+    source = NoiseSource(seed=2, pool_size=4096, background=False)
+    first = source.noise(256, 2.0)
+    second = source.noise(256, 2.0)
+    assert np.shares_memory(first, second)
+    out = np.empty(256)
+    assert source.noise(256, 0.5, out=out) is out
+    assert abs(out.std() - 0.5) < 0.15
+
+
+def test_brown_noise_is_continuous_across_pool_swaps():
+    pool = 4096
+    source = NoiseSource(seed=3, pool_size=pool, background=False)
+    x = stream(source, "brown", blocks=64, n=512)
+    steps = np.abs(np.diff(x))
+    at_swap = steps[pool - 1::pool]
+    assert len(at_swap) >= 6
+    # A swap is no bigger a step than an ordinary sample-to-sample one
+    assert at_swap.max() < 5 * np.percentile(steps, 99)
+
+
+def test_unknown_color():
+    with pytest.raises(ValueError):
+        NoiseSource(background=False).take(10, "purple")
@@ -0,0 +1,39 @@
+# tests/test_persistence.py
+
+import numpy as np
+
+from scope.persistence import PersistenceMap
+
+RED, GREEN = (1.0, 0.0, 0.0, 1.0), (0.0, 1.0, 0.0, 1.0)
+
+
+def test_hits_show_in_the_channel_color():
+    pmap = PersistenceMap(2, n_time=50, n_amp=20, decay=None)
+    pmap.add(np.vstack([np.full(50, 2.0), np.full(50, -2.0)]))
+    image = pmap.image([RED, GREEN])
+    assert image.shape == (20, 50, 4)
+    lit = image[..., 3] > 0
+    assert lit.sum() == 100               # one row per channel
+    assert image[..., 0].max() == 1.0 and image[..., 1].max() == 1.0
+
+
+def test_no_rows_give_a_transparent_image():
+    pmap = PersistenceMap(2, n_time=50, n_amp=20)
+    pmap.add(np.zeros((2, 50)))
+    for rows in ([], np.array([], dtype=int)):
+        image = pmap.image(np.zeros((0, 4)), rows)
+        assert image.shape == (20, 50, 4)
+        assert not image.any()
+
+
+def test_decay_fades_old_hits():
+    now = [0.0]
+    pmap = PersistenceMap(1, n_time=10, n_amp=10, decay=1.0,
+                          clock=lambda: now[0])
+    pmap.add(np.zeros((1, 10)))
+    first = pmap.image([RED])[..., 3].max()
+    now[0] = 5.0
+    pmap.add(np.full((1, 10), 3.0))
+    image = pmap.image([RED])
+    # Log intensity: the faded hits stay visible, but dimmer
+    assert 0 < image[..., 3].min(where=image[..., 3] > 0, initial=1) < first
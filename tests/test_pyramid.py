@@ -0,0 +1,94 @@
+# tests/test_pyramid.py
+
+import numpy as np
+
+from scope.pyramid import STATS, MinMaxPyramid
+
+
+def build(data, chunk=777):
+    pyramid = MinMaxPyramid(data.shape[0], block=8, factor=4)
+    for a in range(0, data.shape[1], chunk):
+        pyramid.append(data[:, a:a + chunk])
+    return pyramid
+
+
+def test_stats_match_brute_force():
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(2, 20000))
+    pyramid = build(data)
+
+    def raw(a, b):
+        return data[:, a:b]
+
+    for _ in range(100):
+        a, b = sorted(rng.integers(0, data.shape[1] + 1, size=2))
+        if b <= a:
+            continue
+        stats = pyramid.stats(a, b, raw)
+        region = data[:, a:b]
+        np.testing.assert_allclose(stats["min"], region.min(axis=1))
+        np.testing.assert_allclose(stats["max"], region.max(axis=1))
+        np.testing.assert_allclose(stats["mean"], region.mean(axis=1),
+                                   atol=1e-9)
+        np.testing.assert_allclose(
+            stats["rms"], np.sqrt((region ** 2).mean(axis=1)), atol=1e-9)
+
+
+def test_render_keeps_every_extreme():
+    data = np.zeros((1, 100000))
+    data[0, 54321] = 7.0
+    data[0, 9999] = -3.0
+    pyramid = build(data, chunk=4096)
+
+    def raw(a, b):
+        return data[:, a:b]
+
+    xs, ys = pyramid.render(0, data.shape[1], 200, raw)
+    assert ys.shape == (1, 400)
+    assert ys.max() == 7.0
+    assert ys.min() == -3.0
+    # Fine zoom: raw samples are needed instead
+    assert pyramid.render(0, 100, 200, raw) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(2)
+    data = rng.normal(size=(2, 5000))
+    pyramid = build(data)
+    path = tmp_path / "index.npz"
+    pyramid.save(path)
+    loaded = MinMaxPyramid.load(path)
+
+    def raw(a, b):
+        return data[:, a:b]
+
+    assert loaded.length == pyramid.length
+    for name in ("min", "max", "sum"):
+        np.testing.assert_allclose(loaded.stats(13, 4999, raw)[name],
+                                   pyramid.stats(13, 4999, raw)[name])
+
+
+def test_float32_index_is_exact_and_small(tmp_path):
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(2, 1 << 18)).astype(np.float32)
+    pyramid = MinMaxPyramid(2, block=1024, factor=4, dtype=np.float32)
+    pyramid.append(data)
+
+    def raw(a, b):
+        return data[:, a:b]
+
+    stats = pyramid.stats(100, data.shape[1] - 100, raw)
+    np.testing.assert_array_equal(stats["min"],
+                                  data[:, 100:-100].min(axis=1))
+    np.testing.assert_array_equal(stats["max"],
+                                  data[:, 100:-100].max(axis=1))
+    used = sum(level.view(name).nbytes
+               for level in pyramid.levels for name in STATS)
+    assert used < 0.01 * data.nbytes
+
+    path = tmp_path / "index.npz"
+    pyramid.save(path)
+    loaded = MinMaxPyramid.load(path)
+    assert loaded.dtype == np.float32
+    assert loaded.levels[0].view("min").dtype == np.float32
+    assert loaded.levels[0].view("sum").dtype == np.float64
@@ -0,0 +1,79 @@
+# tests/test_recorder.py
+
+import time
+
+import numpy as np
+
+from scope.acquisition import AcquiredFrame
+from scope.recorder import FOOTER, StreamRecorder
+from scope.replay import CaptureFile
+
+CHANNELS = [{"name": "CH1", "scale": 2.0}, {"name": "CH2", "scale": 1.0}]
+
+
+def frames(count, n=100, fs=1000.0):
+    rng = np.random.default_rng(6)
+    return [
+        AcquiredFrame(i, rng.normal(size=(2, n)).astype(np.float32), fs,
+                      1000.0 + i * 0.1)
+        for i in range(count)
+    ]
+
+
+def record(path, items, **options):
+    recorder = StreamRecorder(path, 1000.0, CHANNELS, **options)
+    for frame in items:
+        assert recorder.submit(frame)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "c.kbkrec")
+    items = frames(5)
+    recorder = record(path, items, on_full="block", block_timeout=5.0)
+    assert recorder.written == 5 and recorder.error is None
+
+    capture = CaptureFile(path)
+    assert len(capture) == 5
+    assert capture.fs == 1000.0
+    assert capture.channels == CHANNELS
+    np.testing.assert_allclose(capture.duration, 0.4)
+    for frame, i in zip(items, range(5)):
+        data, fs = capture.frame(i)
+        np.testing.assert_array_equal(data, frame.data)
+        assert fs == 1000.0
+    assert capture.find_time(0.25) == 3
+
+
+def test_file_without_footer_is_still_readable(tmp_path):
+    path = str(tmp_path / "cut.kbkrec")
+    record(path, frames(3), on_full="block", block_timeout=5.0)
+    with open(path, "r+b") as f:
+        f.seek(-FOOTER.size, 2)
+        f.truncate()
+    capture = CaptureFile(path)
+    assert len(capture) == 3
+    np.testing.assert_array_equal(capture.frame(2)[0], frames(3)[2].data)
+
+
+def test_close_returns_when_the_writer_died_with_a_full_queue(tmp_path):
+    recorder = StreamRecorder(str(tmp_path / "x.kbkrec"), 1000.0, CHANNELS,
+                              max_queue=4)
+
+    def fail(frame):
+        time.sleep(0.1)
+        raise OSError("disk full")
+    recorder._write_frame = fail
+    for frame in frames(10):
+        recorder.submit(frame)
+    assert recorder.dropped > 0
+    deadline = time.time() + 2.0
+    while recorder.error is None and time.time() < deadline:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    recorder.close(timeout=2.0)
+    assert time.perf_counter() - start < 0.5
+    assert recorder.status_text() == "REC: ERR"
+    assert not recorder.submit(frames(1)[0])
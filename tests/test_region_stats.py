@@ -0,0 +1,45 @@
+# tests/test_region_stats.py
+
+import numpy as np
+import pytest
+
+from scope.region_stats import RegionIndex
+
+
+def brute(data, a, b):
+    region = data[:, a:b]
+    return {
+        "sum": region.sum(axis=1),
+        "mean": region.mean(axis=1),
+        "rms": np.sqrt((region * region).mean(axis=1)),
+        "min": region.min(axis=1),
+        "max": region.max(axis=1),
+        "peak": np.abs(region).max(axis=1),
+    }
+
+
+def test_random_regions_match_brute_force():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(3, 1000))
+    index = RegionIndex(data, block=16)
+    for _ in range(200):
+        a, b = sorted(rng.integers(0, 1001, size=2))
+        if b - a < 1:
+            continue
+        stats = index.stats(a, b)
+        expected = brute(data, a, b)
+        assert stats["n"] == b - a
+        for name, value in expected.items():
+            np.testing.assert_allclose(stats[name], value, atol=1e-9)
+
+
+def test_region_is_clipped_to_the_record():
+    data = np.arange(10.0)[None, :]
+    stats = RegionIndex(data).stats(-5, 50)
+    assert stats["n"] == 10
+    assert stats["max"][0] == 9.0
+
+
+def test_empty_region_raises():
+    with pytest.raises(ValueError):
+        RegionIndex(np.zeros((1, 10))).stats(5, 5)
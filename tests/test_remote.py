@@ -0,0 +1,117 @@
+# tests/test_remote.py
+
+import io
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from scope.remote import RemoteServer, encode_replies
+from scope.scpi import read_block
+from views.remote_control import RemoteControl
+
+
+def test_encode_replies():
+    assert encode_replies([None, None]) == b""
+    assert encode_replies(["1", None, "2"]) == b"1;2\n"
+    data = np.arange(3, dtype=float)
+    line = encode_replies([data])
+    assert line == b"#212" + data.astype("<f4").tobytes() + b"\n"
+    assert np.array_equal(
+        np.frombuffer(read_block(io.BytesIO(line)), "<f4"), data)
+
+
+def test_server_runs_jobs_on_the_processing_thread():
+    seen = []
+
+    def handler(commands):
+        seen.append(threading.current_thread())
+        return [c.upper() if c.endswith("?") else None for c in commands]
+
+    server = RemoteServer(handler, port=0).start()
+    stop = threading.Event()
+
+    def pump():
+        while not stop.is_set():
+            server.process()
+            stop.wait(0.005)
+    pumper = threading.Thread(target=pump)
+    pumper.start()
+    try:
+        with socket.create_connection(server.address, timeout=5) as sock:
+            reader = sock.makefile("rb")
+            sock.sendall(b"a?;set 1;b?\n")
+            assert reader.readline() == b"A?;B?\n"
+    finally:
+        stop.set()
+        pumper.join()
+        server.stop()
+    assert seen == [pumper]
+
+
+class Var:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Channel:
+    def __init__(self):
+        self.signal_type_var = Var("sine")
+        self.freq_var = Var(5.0)
+        self.amp_var = Var(1.0)
+        self.noise_var = Var(0.0)
+        self.scale = 1.0
+        self.offset = 0.0
+
+
+class Home:
+    def __init__(self):
+        self.sampling_rate = Var(500.0)
+        self.channels = [Channel(), Channel()]
+
+
+@pytest.fixture
+def remote():
+    return RemoteControl(Home())
+
+
+def errors(remote):
+    out = []
+    while True:
+        error = remote.execute([":SYST:ERR?"])[0]
+        if error.startswith("0,"):
+            return out
+        out.append(error.split(",")[0])
+
+
+@pytest.mark.parametrize("command", [
+    ":ACQ:SRAT 0", ":ACQ:SRAT -100", ":ACQ:SRAT 1e9", ":ACQ:SRAT nan",
+    ":CHAN1:FREQ 0", ":CHAN1:AMPL 50", ":CHAN2:NOIS -1",
+])
+def test_out_of_range_values_are_rejected(remote, command):
+    assert remote.execute([command]) == [None]
+    assert errors(remote) == ["-222"]
+    assert remote.home.sampling_rate.get() == 500.0
+    assert remote.home.channels[0].freq_var.get() == 5.0
+
+
+def test_values_in_range_are_applied(remote):
+    replies = remote.execute([
+        ":ACQ:SRAT 1000", ":CHAN2:FREQ 12.5", ":CHAN2:FUNC SQUARE",
+        ":ACQ:SRAT?", ":CHAN2:FREQ?", ":CHAN2:FUNC?"])
+    assert replies == [None, None, None, "1000.0", "12.5", "square"]
+    assert errors(remote) == []
+
+
+def test_bad_commands_keep_replies_in_step(remote):
+    replies = remote.execute([":NOPE?", ":CHAN1:FREQ abc", "*IDN?"])
+    assert replies[0] == "" and replies[1] is None
+    assert replies[2].startswith("KBK")
+    assert errors(remote) == ["-113", "-104"]
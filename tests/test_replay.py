@@ -0,0 +1,75 @@
+# tests/test_replay.py
+
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from scope.acquisition import AcquiredFrame
+from scope.recorder import StreamRecorder
+from scope.replay import CaptureFile, ReplaySource
+
+CHANNELS = [{"name": "CH1"}, {"name": "CH2"}]
+
+
+def frames(count, n=100, fs=1000.0):
+    rng = np.random.default_rng(6)
+    return [
+        AcquiredFrame(i, rng.normal(size=(2, n)).astype(np.float32), fs,
+                      1000.0 + i * 0.1)
+        for i in range(count)
+    ]
+
+
+def record(path, items):
+    recorder = StreamRecorder(path, 1000.0, CHANNELS, on_full="block",
+                              block_timeout=5.0)
+    for frame in items:
+        assert recorder.submit(frame)
+    recorder.close()
+
+
+def test_replay_plays_every_frame_then_finishes(tmp_path):
+    path = str(tmp_path / "r.kbkrec")
+    items = frames(4)
+    record(path, items)
+    source = ReplaySource(CaptureFile(path), speed=None)
+    assert source.fs == 1000.0
+    played = [source.read() for _ in range(4)]
+    for (data, fs), frame in zip(played, items):
+        np.testing.assert_array_equal(data, frame.data)
+    assert source.finished
+    assert source.read(max_wait=0) is None
+
+
+def test_replay_step_while_paused(tmp_path):
+    path = str(tmp_path / "s.kbkrec")
+    record(path, frames(3))
+    source = ReplaySource(CaptureFile(path), paused=True)
+    assert source.read(max_wait=0) is None
+    source.step(2)
+    assert source.read(max_wait=0) is not None
+    assert source.read(max_wait=0) is not None
+    assert source.read(max_wait=0) is None
+    assert source.position == 2
+
+
+def test_close_releases_the_file(tmp_path):
+    path = str(tmp_path / "c.kbkrec")
+    record(path, frames(2))
+    source = ReplaySource(CaptureFile(path), speed=None)
+    source.read()
+    source.close()
+    assert len(source.capture) == 2
+    with pytest.raises(ValueError):
+        source.capture.frame(0)
+    gc.collect()
+    os.remove(path)
+
+
+def test_not_a_capture_file(tmp_path):
+    path = tmp_path / "x.kbkrec"
+    path.write_bytes(b"hello, world" * 4)
+    with pytest.raises(ValueError):
+        CaptureFile(str(path))
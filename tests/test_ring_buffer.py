@@ -0,0 +1,58 @@
+# tests/test_ring_buffer.py
+
+import numpy as np
+
+from scope.ring_buffer import RingBuffer
+
+
+def block(start, stop, channels=2):
+    """Sample i of channel c holds 1000 * c + i."""
+    return np.arange(start, stop) + 1000.0 * np.arange(channels)[:, None]
+
+
+def test_reads_before_wrapping_are_views():
+    ring = RingBuffer(2, 10)
+    ring.write(block(0, 6))
+    assert (ring.start, ring.end, ring.size) == (0, 6, 6)
+    out = ring.read(1, 4)
+    np.testing.assert_array_equal(out, block(1, 4))
+    assert out.base is not None
+
+
+def test_wrap_around_overwrites_the_oldest_samples():
+    ring = RingBuffer(2, 10)
+    for start in range(0, 37, 3):
+        ring.write(block(start, start + 3))
+    assert (ring.start, ring.end, ring.size) == (29, 39, 10)
+    np.testing.assert_array_equal(ring.read_latest(10), block(29, 39))
+    # A window across the seam of the buffer
+    np.testing.assert_array_equal(ring.read(30, 38), block(30, 38))
+
+
+def test_reads_are_clipped_to_what_is_held():
+    ring = RingBuffer(1, 8)
+    ring.write(block(0, 20, channels=1))
+    np.testing.assert_array_equal(ring.read(0, 15), block(12, 15, 1))
+    assert ring.read(25, 30).shape == (1, 0)
+    np.testing.assert_array_equal(ring.read_latest(100), block(12, 20, 1))
+
+
+def test_block_larger_than_capacity_keeps_the_newest():
+    ring = RingBuffer(2, 5)
+    ring.write(block(0, 3))
+    ring.write(block(3, 15))
+    assert (ring.start, ring.end) == (10, 15)
+    np.testing.assert_array_equal(ring.read_latest(5), block(10, 15))
+    ring.write(block(15, 18))
+    np.testing.assert_array_equal(ring.read_latest(5), block(13, 18))
+
+
+def test_clear_and_empty_writes():
+    ring = RingBuffer(2, 5)
+    ring.write(block(0, 4))
+    ring.write(np.empty((2, 0)))
+    assert ring.total == 4
+    ring.clear()
+    assert ring.size == 0
+    ring.write(block(0, 2))
+    np.testing.assert_array_equal(ring.read_latest(5), block(0, 2))
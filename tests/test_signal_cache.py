@@ -0,0 +1,49 @@
+# tests/test_signal_cache.py
+
+import numpy as np
+
+from scope.signal_cache import SignalCache
+
+
+def test_hits_and_misses():
+    cache = SignalCache()
+    assert cache.get("a") is None
+    stored = cache.put("a", np.zeros(3))
+    assert cache.get("a") is stored
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stored_arrays_are_read_only():
+    cache = SignalCache()
+    value = cache.put("a", np.zeros(3))
+    assert not value.flags.writeable
+
+
+def test_least_recently_used_is_evicted():
+    cache = SignalCache(maxsize=2)
+    cache.put("a", np.zeros(1))
+    cache.put("b", np.ones(1))
+    cache.get("a")                   # "b" is now the oldest
+    cache.put("c", np.full(1, 2.0))
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_put_refreshes_an_existing_key():
+    cache = SignalCache(maxsize=2)
+    cache.put("a", np.zeros(1))
+    cache.put("b", np.zeros(1))
+    cache.put("a", np.ones(1))
+    cache.put("c", np.zeros(1))
+    assert cache.get("b") is None
+    np.testing.assert_array_equal(cache.get("a"), [1.0])
+
+
+def test_clear():
+    cache = SignalCache()
+    cache.put("a", np.zeros(1))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
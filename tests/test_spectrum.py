@@ -0,0 +1,90 @@
+# tests/test_spectrum.py
+
+import numpy as np
+import pytest
+
+from scope.spectrum import SpectrumEngine, amplitude_spectrum, next_fast_len
+
+
+def tone(amplitude, f, fs=1000.0, n=1000, phase=0.0):
+    return amplitude * np.sin(2 * np.pi * f * np.arange(n) / fs + phase)
+
+
+def test_next_fast_len():
+    assert next_fast_len(1) == 1
+    assert next_fast_len(500) == 500
+    assert next_fast_len(1001) == 1024
+    assert next_fast_len(7) == 8
+    assert next_fast_len(11) == 12
+
+
+@pytest.mark.parametrize("f", [50.0, 50.25, 50.5, 123.37])
+def test_flattop_reads_the_amplitude_between_bins(f):
+    freqs, mag = amplitude_spectrum(tone(2.5, f), 1000.0, "flattop")
+    assert mag.max() == pytest.approx(2.5, rel=0.002)
+    assert abs(freqs[np.argmax(mag)] - f) <= 1.0
+
+
+def test_hann_scalloping_is_larger_than_flattop():
+    _, mag = amplitude_spectrum(tone(1.0, 50.5), 1000.0, "hann")
+    assert mag.max() < 0.9
+
+
+def test_block_matches_per_channel():
+    block = np.vstack([tone(1.0, 40.0), tone(0.5, 90.0)])
+    _, mags = amplitude_spectrum(block, 1000.0, "hann", zero_pad=True)
+    for row, sig in zip(mags, block):
+        np.testing.assert_allclose(
+            row, amplitude_spectrum(sig, 1000.0, "hann", zero_pad=True)[1])
+
+
+def test_linear_and_rms_averaging():
+    frames = [np.full(4, 1.0), np.full(4, 3.0)]
+    freqs = np.arange(4.0)
+
+    linear = SpectrumEngine(averaging="linear", n_avg=8)
+    for mag in frames:
+        _, out = linear.process(freqs, mag)
+    np.testing.assert_allclose(out, 2.0)
+
+    rms = SpectrumEngine(averaging="rms", n_avg=8)
+    for mag in frames:
+        _, out = rms.process(freqs, mag)
+    np.testing.assert_allclose(out, np.sqrt(5.0))
+
+
+def test_averaging_turns_exponential_after_n_avg():
+    engine = SpectrumEngine(averaging="linear", n_avg=2)
+    freqs = np.arange(1.0)
+    for value in (0.0, 0.0, 4.0):
+        _, out = engine.process(freqs, np.array([value]))
+    np.testing.assert_allclose(out, 2.0)
+
+
+def test_peak_hold_and_reset():
+    engine = SpectrumEngine(averaging="peak")
+    freqs = np.arange(2.0)
+    engine.process(freqs, np.array([1.0, 5.0]))
+    _, out = engine.process(freqs, np.array([3.0, 2.0]))
+    np.testing.assert_allclose(out, [3.0, 5.0])
+    engine.configure(averaging="linear")
+    _, out = engine.process(freqs, np.array([3.0, 2.0]))
+    np.testing.assert_allclose(out, [3.0, 2.0])
+
+
+def test_changed_flag_and_db():
+    engine = SpectrumEngine(db=True)
+    freqs = np.arange(2.0)
+    _, out = engine.process(freqs, np.array([1.0, 0.1]))
+    np.testing.assert_allclose(out, [0.0, -20.0])
+    assert engine.changed
+    engine.process(freqs, np.array([1.0, 0.1]))
+    assert not engine.changed
+
+
+def test_unknown_settings_are_rejected():
+    engine = SpectrumEngine()
+    with pytest.raises(ValueError):
+        engine.configure(window="kaiser")
+    with pytest.raises(AttributeError):
+        engine.configure(_acc=None)
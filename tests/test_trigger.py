@@ -0,0 +1,52 @@
+# tests/test_trigger.py
+
+import numpy as np
+import pytest
+
+from scope.trigger import TriggerEngine, find_edges
+
+
+def test_edges_of_a_sine_are_interpolated():
+    fs, f = 1000.0, 7.0
+    y = np.sin(2 * np.pi * f * np.arange(1000) / fs + 0.3)
+    edges = find_edges(y, 0.0, "rising")
+    # Rising zero crossings of sin(2 pi f t + 0.3)
+    expected = (np.arange(1, 8) - 0.3 / (2 * np.pi)) * fs / f
+    np.testing.assert_allclose(edges, expected, atol=1e-2)
+    falling = find_edges(y, 0.0, "falling")
+    assert len(falling) == 7
+    assert np.all(np.abs(falling - edges) > 10)
+
+
+def test_hysteresis_suppresses_noise_bursts():
+    rng = np.random.default_rng(4)
+    t = np.arange(2000) / 1000.0
+    y = np.sin(2 * np.pi * 5 * t) + rng.normal(0, 0.05, t.size)
+    # The edge at t = 0 is not armed: nine edges in ten periods
+    assert len(find_edges(y, 0.0, "rising", 0.3)) == 9
+    assert len(find_edges(y, 0.0, "rising", 0.0)) > 9
+
+
+def test_unknown_slope():
+    with pytest.raises(ValueError):
+        find_edges(np.zeros(5), 0.0, "sideways")
+
+
+def test_single_mode_fires_once_until_rearmed():
+    y = np.sin(2 * np.pi * 5 * np.arange(1000) / 500.0)
+    trig = TriggerEngine(mode="single")
+    assert trig.locate(y, 0, 200, 500.0) is not None
+    assert trig.status == "TRIG'D"
+    assert trig.locate(y, 0, 200, 500.0) is None
+    assert trig.status == "STOP"
+    trig.arm()
+    assert trig.locate(y, 0, 200, 500.0) is not None
+
+
+def test_auto_mode_free_runs_after_misses():
+    trig = TriggerEngine(mode="auto", auto_frames=2)
+    flat = np.zeros(1000)
+    trig.locate(flat, 0, 200, 500.0)
+    assert trig.status == "WAIT"
+    trig.locate(flat, 0, 200, 500.0)
+    assert trig.status == "AUTO"
@@ -0,0 +1,88 @@
+# views/blit_manager.py
+
+
+class BlitManager:
+    """
+    Blit-based redraw helper for a matplotlib canvas.
+
+    The static part of the figure (axes, grid, ticks, labels, legend)
+    is rendered once and cached as a background. Each update restores
+    that background and redraws only the registered animated artists.
+
+    Animated artists come in two layers: traces, and an overlay drawn
+    on top of them (cursors, measurement box). After each trace update
+    the traces are cached too, so update_overlay() can redraw the
+    overlay alone without re-rendering the traces.
+
+    The background is re-captured on every full draw, which matplotlib
+    triggers itself on resize. Call invalidate() after anything that
+    changes the static part (theme, axis limits, legend).
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._background = None
+        self._trace_background = None
+        self._artists = []
+        self._overlay = []
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_artists(self, artists, overlay=()):
+        """Replace the animated trace and overlay artist lists."""
+        new = [art for art in list(artists) + list(overlay) if art is not None]
+        for art in self._artists + self._overlay:
+            if art not in new:
+                art.set_animated(False)
+        self._artists = [art for art in artists if art is not None]
+        self._overlay = [art for art in overlay if art is not None]
+        for art in new:
+            art.set_animated(True)
+        # Cached traces may now contain artists that moved to overlay
+        self._trace_background = None
+
+    @property
+    def has_background(self):
+        """True when the cached background matches the screen."""
+        return self._background is not None
+
+    def invalidate(self):
+        """Drop the cached background; the next update does a full draw."""
+        self._background = None
+        self._trace_background = None
+
+    def _on_draw(self, event):
+        """Cache the freshly drawn background, then draw the artists."""
+        canvas = self.canvas
+        self._background = canvas.copy_from_bbox(canvas.figure.bbox)
+        self._draw_layers()
+
+    def _draw_layers(self):
+        fig = self.canvas.figure
+        for art in self._artists:
+            fig.draw_artist(art)
+        if self._overlay:
+            self._trace_background = self.canvas.copy_from_bbox(fig.bbox)
+            for art in self._overlay:
+                fig.draw_artist(art)
+
+    def update(self):
+        """Redraw traces and overlay on top of the cached background."""
+        canvas = self.canvas
+        if self._background is None:
+            # Full draw fires draw_event, which caches the background
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_layers()
+            canvas.blit(canvas.figure.bbox)
+
+    def update_overlay(self):
+        """Redraw only the overlay layer on top of the cached traces."""
+        if self._trace_background is None:
+            self.update()
+            return
+        canvas = self.canvas
+        canvas.restore_region(self._trace_background)
+        for art in self._overlay:
+            canvas.figure.draw_artist(art)
+        canvas.blit(canvas.figure.bbox)
@@ -1,15 +1,43 @@
 # views/home_page.py
 
+import os
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, messagebox, ttk
 from views.themed_frame import ThemedFrame
 
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.colors import to_rgba
 from matplotlib.figure import Figure
 from matplotlib.offsetbox import AnchoredText
 
+from .blit_manager import BlitManager
+from .remote_control import FIELD_RANGES, RATE_RANGE, RemoteControl
 from .scope_channel import ScopeChannel
+from scope.acq_modes import (
+    AVERAGING as ACQ_AVERAGING, MODES as ACQ_MODES
+)
+from scope.acquisition import AcquisitionWorker
+from scope.deep_record import DeepRecord
+from scope.decimation import decimate
+from scope.dsp_executor import DSPExecutor
+from scope.engine import ScopeEngine
+from scope.export import ExportJob, array_reader
+from scope.frame_scheduler import FrameScheduler
+from scope.measurements import LABELS, format_value
+from scope.noise import COLORS as NOISE_COLORS
+from scope.persistence import PersistenceMap
+from scope.recorder import StreamRecorder
+from scope.region_stats import RegionIndex
+from scope.remote import RemoteServer
+from scope.replay import CaptureFile, ReplaySource
+from scope.scpi import ScpiSimulator, ScpiSource
+from scope.spectrum import AVERAGING, WINDOWS
+from scope.trigger import (
+    MODES as TRIGGER_MODES, SLOPES, find_edges
+)
 import waveform
 
 
@@ -79,11 +107,31 @@ class HomePage(ThemedFrame):
             ]
         n_init_channels = 2
 
+        # ---------- ENGINE ----------
+        # The GUI-free acquisition/analysis pipeline (scope.engine):
+        # sources, capture history, channel bank, trigger, measurements
+        # and spectrum. This page feeds it control snapshots from the
+        # Tk variables and draws what it holds; main.py --headless runs
+        # the same engine without any of this.
+        self.engine = ScopeEngine(
+            n_init_channels, self.n_samples,
+            fs=self.sampling_rate.get(),
+            ring_capacity=self.controller.shared_data.get(
+                "ring_capacity", 100000),
+            seed=self.controller.noise_seed
+        )
+
+        # All channel samples and vertical settings live in one bank;
+        # each ScopeChannel is a view over one row of it
+        self.bank = self.engine.bank
+
         for i in range(n_init_channels):
             ch = ScopeChannel(
                 name=f"CH{i+1}",
                 color=color_list[i],
-                enabled=True
+                enabled=True,
+                bank=self.bank,
+                index=i
             )
             self.channels.append(ch)
 
@@ -95,14 +143,163 @@ class HomePage(ThemedFrame):
         # Matplotlib line objects for cursor visuals
         self.cursor_lines = []
 
+        # Cursor being dragged ("a", "b" or None) and grab distance
+        self._drag_cursor = None
+        self.cursor_grab_px = 6
+
+        # O(1) region statistics, rebuilt lazily once per acquisition
+        self.region_index = None
+        self._region_version = None
+
         # ---------- MEASUREMENT OVERLAY ----------
         # Floating Tektronix-style measurement box inside the waveform plot
         self.measure_overlay = None
+        self.measure_overlay_text = None
+
+        # ---------- PERSISTENT WAVEFORM ARTISTS ----------
+        # One Line2D per channel, created once and updated in place.
+        # The axes are only rebuilt when the layout key changes.
+        self.wave_lines = []
+        self._wave_layout = None
+        self._wave_visible = None
+        # Per-row key of what each line currently shows; rows whose
+        # samples and vertical settings are unchanged are not redone
+        self._trace_keys = {}
+
+        # Blit the animated trace/cursor/overlay artists over a cached
+        # background instead of redrawing the whole figure every frame.
+        # Set to False to fall back to full canvas.draw() calls.
+        self.use_blit = True
+
+        # Display decimation: "minmax" (peak detect) or "lttb".
+        # Traces are reduced to the canvas width before plotting.
+        self.decimation = "minmax"
+
+        # ---------- SPECTRUM ENGINE ----------
+        # Windowed FFT with cached plans and averaging; the FFT line is
+        # persistent and the FFT canvas only redraws on new output
+        self.spectrum = self.engine.spectrum
+        self.fft_line = None
+        self._fft_layout = None
+        self._fft_submitted = None    # input of the last RT FFT job
+
+        # ---------- MEASUREMENT ENGINE ----------
+        # One vectorized pass over all enabled channels per update.
+        # Each display registers what it shows; the rest is skipped.
+        self.measure = self.engine.measure
+        self.measure_items = ("peak", "rms", "freq")
+        self.measure.require("label", self.measure_items)
+        self._measure_submitted = None    # input of the last RT job
+
+        # ---------- DSP EXECUTOR ----------
+        # Per-channel FFT/measurement work runs on a thread (or process)
+        # pool; RT frames collect the previous frame's results.
+        # DSP_MODE=serial runs everything inline for debugging.
+        self.dsp = DSPExecutor(mode=self.controller.dsp_mode)
 
         # ---------- REAL-TIME OSCILLOSCOPE STATE ----------
         # Flag used to start/stop the real-time update loop
         self.realtime_running = False
 
+        # Adaptive frame pacing: measures frame time, holds the target
+        # FPS and runs FFT/measurements less often when overloaded
+        self.scheduler = FrameScheduler(target_fps=60)
+        self._rt_after_id = None      # the single pending after() call
+        self._rt_status_text = None
+
+        # Signal production runs on a worker thread; the RT loop only
+        # takes the newest finished frame. The worker reads frames from
+        # the active SignalSource (see SIGNAL SOURCES below).
+        self.acquisition = None
+        self._drop_text = None
+        self._acq_error = None            # last error shown in the readout
+
+        # ---------- TRIGGER ----------
+        # Edge trigger on one source channel. The display window is cut
+        # from the capture history around the trigger point; the
+        # sub-sample part of that point shifts the traces on x
+        # (engine.trigger_source / engine.trigger_shift).
+        self.trigger = self.engine.trigger
+        self._trig_text = None
+
+        # ---------- ACQUISITION MODE ----------
+        # sample / average / peak detect / envelope, applied by the
+        # engine to every new record with in-place accumulators
+        self.acq_engine = self.engine.acq
+        self._acq_text = None
+
+        # ---------- PERSISTENCE ----------
+        # Every triggered waveform found in the capture history is
+        # rasterized into an intensity histogram on the acquisition
+        # thread; the screen shows it as one image behind the traces.
+        self.persistence = PersistenceMap(
+            len(self.channels), n_time=500, n_amp=256,
+            y_range=(-5.0, 5.0), decay=2.0
+        )
+        self.persist_image = None
+        self.persist_max_waves = 1024     # per frame, newest kept
+        self._persist_settings = None     # plain snapshot for the sink
+        self._persist_next = 0            # next absolute edge to use
+
+        # ---------- DEEP RECORD ----------
+        # Optional long capture into memory-mapped files on disk. After
+        # RT stops, the waveform shows a pan/zoom window of the record
+        # that only reads the visible range, so memory stays bounded.
+        self.deep_capacity = int(
+            self.controller.shared_data.get("deep_capacity", 10000000))
+        self.deep = None
+        self.deep_view = None             # (start, stop) shown, or None
+        self._deep_recording = False
+
+        # ---------- RECORDER ----------
+        # Streams every acquired frame to a capture file. The worker
+        # only queues frames; a writer thread does the disk I/O and
+        # frames that do not fit in the queue are dropped and counted.
+        self.recorder = None
+        self._rec_text = None
+        self._rec_closers = []            # threads finishing old files
+
+        # ---------- REPLAY ----------
+        # A recorded capture played back through the acquisition path
+        # in place of the generator (same sinks, trigger and displays)
+        self.replay = None
+        self._replay_text = None
+
+        # ---------- EXPORT ----------
+        # Exports stream to disk on their own thread; the UI polls
+        self.export_job = None
+
+        # ---------- CAPTURE HISTORY / ROLL MODE ----------
+        # Every acquired sample goes into a fixed-size ring buffer
+        # (written on the acquisition thread). Roll mode shows the
+        # newest n_samples of it, scrolling like a slow-timebase DSO.
+        self.ring = self.engine.ring
+
+        # ---------- SIGNAL GENERATOR ----------
+        # Phase-continuous generator, used only by the acquisition
+        # thread. Repeating blocks come from an LRU cache and are
+        # flagged unchanged, so the stages below can skip them.
+        # Pooled noise is filled in the background; NOISE_SEED fixes it.
+        self.dds = self.engine.dds
+        self.noise = self.engine.noise
+
+        # ---------- SIGNAL SOURCES ----------
+        # The acquisition worker reads the engine's active source: the
+        # generator (fed a plain snapshot of its controls, never the Tk
+        # variables), a replayed capture or a networked instrument.
+        self.synthetic = self.engine.synthetic
+        self.simulator = None             # local SCPI loopback instrument
+        # While the generator is the source, its Rate slider is the
+        # engine's analysis rate (other sources bring their own)
+        self.sampling_rate.trace_add("write", self._on_rate_changed)
+
+        # ---------- REMOTE CONTROL ----------
+        # Optional asyncio command server (REMOTE_PORT). Its commands
+        # run here on the Tk thread, a few ms' worth per poll.
+        self.remote = None
+        self.remote_poll_ms = 10
+        self.remote_budget = 0.005        # seconds of commands per poll
+
         # ---------- BUILD UI ----------
         self._build_channel_controls()
         self._build_signal_generator_panel()
@@ -111,6 +308,8 @@ class HomePage(ThemedFrame):
         self._build_measure_label()
 
         self._build_status_bar()  # Create Status bar
+        if self.controller.remote_port:
+            self.start_remote(self.controller.remote_port)
         self.start_realtime()  # Start real-time mode automatically (optional)
 
     # ---------- UI BUILDERS ----------
@@ -196,7 +395,8 @@ class HomePage(ThemedFrame):
                 row=0, column=0, sticky="w", padx=5, pady=2)
             ch.signal_type_var = tk.StringVar(value="sine")
             tk.OptionMenu(
-                tab, ch.signal_type_var, "sine", "square", "noise"
+                tab, ch.signal_type_var,
+                "sine", "square", "triangle", "saw", "arb", "noise"
             ).grid(row=0, column=1)
 
             # --- Frequency slider ---
@@ -204,7 +404,8 @@ class HomePage(ThemedFrame):
                 row=1, column=0, sticky="w", padx=5, pady=2)
             ch.freq_var = tk.DoubleVar(value=5.0)
             tk.Scale(
-                tab, from_=1, to=50,
+                tab, from_=FIELD_RANGES["FREQ"][0],
+                to=FIELD_RANGES["FREQ"][1],
                 orient="horizontal", variable=ch.freq_var, length=120
                 ).grid(row=1, column=1)
 
@@ -213,11 +414,27 @@ class HomePage(ThemedFrame):
                 row=2, column=0, sticky="w", padx=5, pady=2)
             ch.amp_var = tk.DoubleVar(value=1.0)
             tk.Scale(
-                tab, from_=0.1, to=5.0, resolution=0.1,
+                tab, from_=FIELD_RANGES["AMPL"][0],
+                to=FIELD_RANGES["AMPL"][1], resolution=0.1,
                 orient="horizontal",
                 variable=ch.amp_var, length=120
                     ).grid(row=2, column=1)
 
+            # --- Additive noise (RMS) and its color ---
+            tk.Label(tab, text="Noise:").grid(
+                row=3, column=0, sticky="w", padx=5, pady=2)
+            ch.noise_var = tk.DoubleVar(value=0.0)
+            tk.Scale(
+                tab, from_=FIELD_RANGES["NOIS"][0],
+                to=FIELD_RANGES["NOIS"][1], resolution=0.05,
+                orient="horizontal",
+                variable=ch.noise_var, length=120
+                    ).grid(row=3, column=1)
+            ch.noise_color_var = tk.StringVar(value="white")
+            tk.OptionMenu(
+                tab, ch.noise_color_var, *NOISE_COLORS
+            ).grid(row=3, column=2)
+
         # --- Global controls  ---
         ctrl_frame = tk.Frame(gen_frame)
         ctrl_frame.pack(fill="x", pady=5)
@@ -228,7 +445,7 @@ class HomePage(ThemedFrame):
 
         tk.Label(rate_frame, text="Rate (Hz):").pack(side="left", padx=5)
         tk.Scale(rate_frame,
-                 from_=100, to=5000, resolution=100,
+                 from_=RATE_RANGE[0], to=RATE_RANGE[1], resolution=100,
                  orient="horizontal",
                  variable=self.sampling_rate, length=120
                  ).pack()
@@ -259,6 +476,248 @@ class HomePage(ThemedFrame):
         tk.Button(btn_frame, text="Generate", command=self._generate_manual
                   ).pack(side="right", padx=10)
 
+        self.roll_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(btn_frame, text="Roll", variable=self.roll_var,
+                       command=self._on_roll_toggle
+                       ).pack(side="right", padx=5)
+
+        self.deep_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(btn_frame, text="Deep", variable=self.deep_var
+                       ).pack(side="right", padx=5)
+
+        self.rec_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(btn_frame, text="Rec", variable=self.rec_var,
+                       command=self._on_rec_toggle
+                       ).pack(side="right", padx=5)
+
+        self._build_fft_controls(gen_frame)
+        self._build_trigger_controls(gen_frame)
+        self._build_acq_controls(gen_frame)
+        self._build_deep_controls(gen_frame)
+        self._build_replay_controls(gen_frame)
+        self._build_export_controls(gen_frame)
+        self._build_source_controls(gen_frame)
+
+    def _build_fft_controls(self, parent):
+        """Create spectrum settings: window, averaging, zero-pad, dB."""
+        fft_frame = tk.Frame(parent)
+        fft_frame.pack(fill="x", pady=5)
+
+        tk.Label(fft_frame, text="FFT:").pack(side="left", padx=5)
+
+        self.fft_window_var = tk.StringVar(value=self.spectrum.window)
+        tk.OptionMenu(
+            fft_frame, self.fft_window_var, *WINDOWS,
+            command=self._on_fft_settings_changed
+        ).pack(side="left")
+
+        self.fft_avg_var = tk.StringVar(value=self.spectrum.averaging)
+        tk.OptionMenu(
+            fft_frame, self.fft_avg_var, *AVERAGING,
+            command=self._on_fft_settings_changed
+        ).pack(side="left")
+
+        self.fft_pad_var = tk.BooleanVar(value=self.spectrum.zero_pad)
+        tk.Checkbutton(
+            fft_frame, text="Pad", variable=self.fft_pad_var,
+            command=self._on_fft_settings_changed
+        ).pack(side="left")
+
+        self.fft_db_var = tk.BooleanVar(value=self.spectrum.db)
+        tk.Checkbutton(
+            fft_frame, text="dB", variable=self.fft_db_var,
+            command=self._on_fft_settings_changed
+        ).pack(side="left")
+
+    def _on_fft_settings_changed(self, *_):
+        self.spectrum.configure(
+            window=self.fft_window_var.get(),
+            averaging=self.fft_avg_var.get(),
+            zero_pad=self.fft_pad_var.get(),
+            db=self.fft_db_var.get()
+        )
+        self._fft_layout = None   # axis labels depend on dB
+        self.update_fft()
+
+    def _build_trigger_controls(self, parent):
+        """Create trigger settings: source, slope, mode, level, arm."""
+        trig_frame = tk.Frame(parent)
+        trig_frame.pack(fill="x", pady=5)
+
+        tk.Label(trig_frame, text="Trig:").pack(side="left", padx=5)
+
+        names = [ch.name for ch in self.channels]
+        self.trig_source_var = tk.StringVar(
+            value=names[self.engine.trigger_source])
+        tk.OptionMenu(
+            trig_frame, self.trig_source_var, *names,
+            command=self._on_trigger_settings_changed
+        ).pack(side="left")
+
+        self.trig_slope_var = tk.StringVar(value=self.trigger.slope)
+        tk.OptionMenu(
+            trig_frame, self.trig_slope_var, *SLOPES,
+            command=self._on_trigger_settings_changed
+        ).pack(side="left")
+
+        self.trig_mode_var = tk.StringVar(value=self.trigger.mode)
+        tk.OptionMenu(
+            trig_frame, self.trig_mode_var, *TRIGGER_MODES,
+            command=self._on_trigger_settings_changed
+        ).pack(side="left")
+
+        self.trig_level_var = tk.DoubleVar(value=self.trigger.level)
+        tk.Scale(
+            trig_frame, from_=-5.0, to=5.0, resolution=0.05,
+            orient="horizontal", variable=self.trig_level_var, length=120,
+            command=self._on_trigger_settings_changed
+        ).pack(side="left", padx=5)
+
+        tk.Button(trig_frame, text="Arm", command=self.trigger.arm
+                  ).pack(side="left", padx=5)
+
+    def _on_trigger_settings_changed(self, *_):
+        names = [ch.name for ch in self.channels]
+        self.engine.trigger_source = names.index(self.trig_source_var.get())
+        self.trigger.configure(
+            slope=self.trig_slope_var.get(),
+            mode=self.trig_mode_var.get(),
+            level=float(self.trig_level_var.get())
+        )
+
+    def _build_acq_controls(self, parent):
+        """Create acquisition mode settings: mode, averaging, count."""
+        acq_frame = tk.Frame(parent)
+        acq_frame.pack(fill="x", pady=5)
+
+        tk.Label(acq_frame, text="Acq:").pack(side="left", padx=5)
+
+        self.acq_mode_var = tk.StringVar(value=self.acq_engine.mode)
+        tk.OptionMenu(
+            acq_frame, self.acq_mode_var, *ACQ_MODES,
+            command=self._on_acq_settings_changed
+        ).pack(side="left")
+
+        self.acq_avg_var = tk.StringVar(value=self.acq_engine.averaging)
+        tk.OptionMenu(
+            acq_frame, self.acq_avg_var, *ACQ_AVERAGING,
+            command=self._on_acq_settings_changed
+        ).pack(side="left")
+
+        self.acq_count_var = tk.IntVar(value=self.acq_engine.n_avg)
+        tk.OptionMenu(
+            acq_frame, self.acq_count_var, 2, 4, 8, 16, 32, 64, 128, 256,
+            command=self._on_acq_settings_changed
+        ).pack(side="left")
+
+        self.persist_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            acq_frame, text="Persist", variable=self.persist_var,
+            command=self._on_persist_changed
+        ).pack(side="left", padx=5)
+
+        # Fade time constant in seconds ("inf": never fade)
+        self.persist_decay_var = tk.StringVar(value="2")
+        tk.OptionMenu(
+            acq_frame, self.persist_decay_var, "0.5", "2", "10", "inf",
+            command=self._on_persist_changed
+        ).pack(side="left")
+
+    def _on_acq_settings_changed(self, *_):
+        self.acq_engine.configure(
+            mode=self.acq_mode_var.get(),
+            averaging=self.acq_avg_var.get(),
+            n_avg=int(self.acq_count_var.get())
+        )
+
+    def _on_persist_changed(self, *_):
+        decay = self.persist_decay_var.get()
+        self.persistence.decay = None if decay == "inf" else float(decay)
+        self.persistence.clear()
+        self._persist_next = 0
+        self.update_waveform()
+
+    def _build_deep_controls(self, parent):
+        """Create deep-record navigation: pan slider and zoom buttons."""
+        deep_frame = tk.Frame(parent)
+        deep_frame.pack(fill="x", pady=5)
+
+        tk.Label(deep_frame, text="Deep view:").pack(side="left", padx=5)
+
+        self.deep_pan_var = tk.DoubleVar(value=0.0)
+        tk.Scale(
+            deep_frame, from_=0.0, to=1.0, resolution=0.001,
+            orient="horizontal", variable=self.deep_pan_var, length=160,
+            showvalue=False, command=self._on_deep_pan
+        ).pack(side="left", padx=5)
+
+        tk.Button(deep_frame, text="Zoom +",
+                  command=lambda: self._zoom_deep(0.5)
+                  ).pack(side="left", padx=2)
+        tk.Button(deep_frame, text="Zoom -",
+                  command=lambda: self._zoom_deep(2.0)
+                  ).pack(side="left", padx=2)
+        tk.Button(deep_frame, text="Full",
+                  command=lambda: self.show_deep_window(0, None)
+                  ).pack(side="left", padx=2)
+
+    def _build_replay_controls(self, parent):
+        """Create capture playback controls: open, play/pause, step."""
+        replay_frame = tk.Frame(parent)
+        replay_frame.pack(fill="x", pady=5)
+
+        tk.Label(replay_frame, text="Replay:").pack(side="left", padx=5)
+        tk.Button(replay_frame, text="Open", command=self._choose_replay
+                  ).pack(side="left", padx=2)
+
+        self.replay_play_btn = tk.Button(
+            replay_frame, text="Pause", command=self._toggle_replay_pause)
+        self.replay_play_btn.pack(side="left", padx=2)
+        tk.Button(replay_frame, text="Step",
+                  command=self._step_replay
+                  ).pack(side="left", padx=2)
+
+        self.replay_speed_var = tk.StringVar(value="1")
+        tk.OptionMenu(
+            replay_frame, self.replay_speed_var,
+            "0.25", "1", "4", "16", "max",
+            command=self._on_replay_speed_changed
+        ).pack(side="left")
+
+        self.replay_label = tk.Label(replay_frame, text="")
+        self.replay_label.pack(side="left", padx=5)
+
+    def _build_export_controls(self, parent):
+        """Create export controls: export to file, cancel, progress."""
+        export_frame = tk.Frame(parent)
+        export_frame.pack(fill="x", pady=5)
+
+        self.export_btn = tk.Button(export_frame, text="Export",
+                                    command=self._choose_export)
+        self.export_btn.pack(side="left", padx=5)
+        tk.Button(export_frame, text="Cancel", command=self._cancel_export
+                  ).pack(side="left", padx=2)
+        self.export_label = tk.Label(export_frame, text="")
+        self.export_label.pack(side="left", padx=5)
+
+    def _build_source_controls(self, parent):
+        """Create instrument controls: address, connect, simulator."""
+        source_frame = tk.Frame(parent)
+        source_frame.pack(fill="x", pady=5)
+
+        tk.Label(source_frame, text="Instrument:").pack(side="left", padx=5)
+        self.instrument_var = tk.StringVar(value="127.0.0.1:5025")
+        tk.Entry(source_frame, textvariable=self.instrument_var, width=16
+                 ).pack(side="left", padx=2)
+        tk.Button(source_frame, text="Connect",
+                  command=self._on_connect_instrument
+                  ).pack(side="left", padx=2)
+        tk.Button(source_frame, text="Sim", command=self.start_simulator
+                  ).pack(side="left", padx=2)
+        tk.Button(source_frame, text="Live",
+                  command=lambda: self.set_source(None)
+                  ).pack(side="left", padx=2)
+
     def _build_waveform_area(self):
         """Create waveform plot area."""
         self.wave_frame = tk.Frame(self)
@@ -277,8 +736,16 @@ class HomePage(ThemedFrame):
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill="both", expand=True)
 
+        self.wave_blit = BlitManager(self.canvas)
+
         # Click for cursors
         self.canvas.mpl_connect("button_press_event", self._on_waveform_click)
+        # Drag cursors
+        self.canvas.mpl_connect("motion_notify_event", self._on_waveform_drag)
+        self.canvas.mpl_connect(
+            "button_release_event", self._on_waveform_release)
+        # Wheel zooms the deep-record view
+        self.canvas.mpl_connect("scroll_event", self._on_waveform_scroll)
 
     def _build_fft_area(self):
         """Create FFT plot area."""
@@ -321,6 +788,8 @@ class HomePage(ThemedFrame):
         self.status_frame.columnconfigure(3, weight=1)
         self.status_frame.columnconfigure(4, weight=1)
         self.status_frame.columnconfigure(5, weight=1)
+        self.status_frame.columnconfigure(6, weight=1)
+        self.status_frame.columnconfigure(7, weight=1)
 
         def make_block(parent, text, col):
             lbl = tk.Label(
@@ -346,6 +815,8 @@ class HomePage(ThemedFrame):
         self.sb_ch1 = make_block(self.status_frame, "CH1: ON", 3)
         self.sb_ch2 = make_block(self.status_frame, "CH2: ON", 4)
         self.sb_meas = make_block(self.status_frame, "MEAS: OFF", 5)
+        self.sb_drop = make_block(self.status_frame, "DROP: 0", 6)
+        self.sb_rec = make_block(self.status_frame, "REC: OFF", 7)
 
     # ---------- PER-CHANNEL SETTINGS UI ----------
     def _open_channel_menu(self, index: int):
@@ -409,17 +880,35 @@ class HomePage(ThemedFrame):
         )
 
     # ---------- SIGNAL GENERATION & PLOTTING ----------
-    def _generate_single_channel(self, sig_type, t, freq, amp):
+    def _generate_single_channel(self, sig_type, t, freq, amp,
+                                 noise_amp=0.0, noise_color="white"):
         """Legacy single-channel generator (used by Generate button)."""
-
-        if sig_type == "sine":
-            return amp * np.sin(2 * np.pi * freq * t)
-        if sig_type == "square":
-            return amp * np.sign(np.sin(2 * np.pi * freq * t))
-        if sig_type == "noise":
-            return amp * np.random.normal(0, 1, len(t))
-
-        return np.zeros_like(t)
+        return waveform.generate_channel(
+            sig_type, t, freq, amp, noise_amp, noise_color)
+
+    def _snapshot_generator(self):
+        """
+        Read the generator controls on the Tk thread and return plain
+        (sig_type, freq, amp, noise_amp, noise_color) tuples the
+        acquisition thread can use.
+        """
+        settings = []
+        for ch in self.channels:
+            if (
+                ch.signal_type_var is None or
+                ch.freq_var is None or
+                ch.amp_var is None
+            ):
+                settings.append(("off", 0.0, 0.0, 0.0, "white"))
+                continue
+            settings.append((
+                ch.signal_type_var.get(),
+                ch.freq_var.get(),
+                ch.amp_var.get(),
+                ch.noise_var.get() if ch.noise_var else 0.0,
+                ch.noise_color_var.get() if ch.noise_color_var else "white"
+            ))
+        return tuple(settings)
 
     def generate_signal(self):
         """Manual single-shot generation for CH1/CH2 (not real-time)."""
@@ -439,7 +928,9 @@ class HomePage(ThemedFrame):
                 ch.signal_type_var.get(),
                 t,
                 ch.freq_var.get(),
-                ch.amp_var.get()
+                ch.amp_var.get(),
+                ch.noise_var.get() if ch.noise_var else 0.0,
+                ch.noise_color_var.get() if ch.noise_color_var else "white"
             )
             ch.set_signal(sig)
 
@@ -449,82 +940,350 @@ class HomePage(ThemedFrame):
 
     def _generate_manual(self):
         self.stop_realtime()      # Stop RT so it doesn't overwrite your signal
+        self.deep_view = None     # Back to the live record
         self.generate_signal()    # Now generate CH1/CH2 signals
 
     def update_waveform(self):
-        """Plot all enabled channels with their scale/offset applied."""
+        """Plot all enabled channels with their scale/offset applied.
+
+        Lines are updated in place; the axes, labels and legend are only
+        rebuilt when the channel set or record length changes.
+        """
+        if self.deep_view is not None:
+            self._draw_deep_window()
+            return
+
+        bank = self.bank
+        layout = (
+            tuple(ch.name for ch in self.channels), bank.n_samples,
+            self._persist_enabled()
+        )
+        if layout != self._wave_layout:
+            self._rebuild_waveform_axes(layout)
+
+        rows = self._shown_rows()
+        stale = self._stale_rows(rows)
+        if len(stale):
+            if self.acq_engine.shows_min_max:
+                # Peak detect / envelope: min/max bins of the full record
+                x, y = self.acq_engine.points(stale)
+            else:
+                # One decimation and one vertical transform for all
+                # changed channels. Decimate first: the transform is
+                # linear, so applying it to the kept points gives the
+                # same picture.
+                x, y = decimate(
+                    self._rows_data(stale),
+                    self._plot_width_pixels(self.ax), self.decimation
+                )
+            if self.engine.trigger_shift:
+                # Put the trigger point exactly where it belongs on x
+                x = x - self.engine.trigger_shift
+            y = bank.to_display(y, stale)
+            for k, i in enumerate(stale):
+                self.wave_lines[i].set_data(x[k], y[k])
+
+        visible = tuple(i in rows for i in range(len(self.wave_lines)))
+        for line, show in zip(self.wave_lines, visible):
+            line.set_visible(show)
+
+        changed = len(stale) > 0 or visible != self._wave_visible
+        if self.persist_image is not None:
+            colors = [to_rgba(self.channels[i].color) for i in rows]
+            self.persist_image.set_data(
+                self.persistence.image(colors, rows))
+            changed = True
+        if visible != self._wave_visible:
+            self._wave_visible = visible
+            self._update_waveform_legend()
+            self.wave_blit.invalidate()
+
+        if changed:
+            limits = (self.ax.get_xlim(), self.ax.get_ylim())
+            self.ax.relim(visible_only=True)
+            self.ax.autoscale_view()
+            if (self.ax.get_xlim(), self.ax.get_ylim()) != limits:
+                self.wave_blit.invalidate()
+
+        # Nothing new and the screen is up to date: skip the redraw
+        if changed or not self.wave_blit.has_background:
+            self._redraw_waveform()
+
+    def _stale_rows(self, rows):
+        """Shown rows whose line does not match the bank any more."""
+        bank = self.bank
+        width = self._plot_width_pixels(self.ax)
+        stale = []
+        for i in rows:
+            key = (
+                bank.row_version[i], bank.scale[i], bank.offset[i],
+                bank.coupling[i], width, self.decimation,
+                self.engine.trigger_shift, self.acq_engine.shows_min_max
+            )
+            if self._trace_keys.get(i) != key:
+                self._trace_keys[i] = key
+                stale.append(i)
+        return np.array(stale, dtype=int)
+
+    def _persist_enabled(self):
+        var = getattr(self, "persist_var", None)
+        return bool(var is not None and var.get())
+
+    # ---------- DEEP RECORD VIEW ----------
+    def show_deep_window(self, start, stop):
+        """Show samples [start, stop) of the deep record (None: end)."""
+        if self.deep is None or self.deep.length < 2:
+            return
+        length = self.deep.length
+        stop = length if stop is None else stop
+        span = min(max(int(stop - start), 10), length)
+        start = int(min(max(start, 0), length - span))
+        self.deep_view = (start, start + span)
+        self._draw_deep_window()
+
+    def _zoom_deep(self, factor, center=None):
+        if self.deep_view is None:
+            return
+        start, stop = self.deep_view
+        if center is None:
+            center = (start + stop) / 2
+        span = (stop - start) * factor
+        self.show_deep_window(center - span / 2, center + span / 2)
+
+    def _on_deep_pan(self, *_):
+        if self.deep_view is None:
+            return
+        start, stop = self.deep_view
+        span = stop - start
+        start = self.deep_pan_var.get() * (self.deep.length - span)
+        self.show_deep_window(start, start + span)
+
+    def _on_waveform_scroll(self, event):
+        if self.deep_view is None or event.inaxes is not self.ax:
+            return
+        self._zoom_deep(0.5 if event.button == "up" else 2.0, event.xdata)
+
+    def _draw_deep_window(self):
+        """
+        Plot the visible part of the deep record: raw samples when they
+        fit on screen, otherwise a min/max pair per pixel column. Only
+        [start, stop) is read from disk, in bounded chunks.
+        """
+        start, stop = self.deep_view
+        x, y = self.deep.window(
+            start, stop, self._plot_width_pixels(self.ax))
+        rows = self._shown_rows()
+        y = self.bank.to_display(y, dc=y.mean(axis=1))
+
+        # Live layout is rebuilt when the view goes back to live data
+        self._wave_layout = None
+        if self.persist_image is not None:
+            self.persist_image.set_visible(False)
+        for i, line in enumerate(self.wave_lines):
+            line.set_visible(i in rows)
+            if i in rows:
+                line.set_data(x, y[i])
+        self.ax.set_xlim(start, stop - 1)
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view(scalex=False)
+        self.wave_blit.invalidate()
+        self._redraw_waveform()
+
+        stats = self.deep.stats(start, stop)
+        parts = [
+            f"{self.channels[i].name}  "
+            f"Peak: {format_value('peak', stats['peak'][i])}   "
+            f"RMS: {format_value('rms', stats['rms'][i])}"
+            for i in rows
+        ]
+        self.measure_label.config(
+            text=f"Deep [{start}:{stop}]   " + "   |   ".join(parts))
+
+    def _start_deep_record(self):
+        """Open a fresh deep record for this RT run (Deep checked)."""
+        self.deep_view = None
+        self._deep_recording = bool(self.deep_var.get())
+        if not self._deep_recording:
+            return
+        if self.deep is not None:
+            self.deep.close()
+            self.deep = None
+        self.deep = DeepRecord(
+            self.controller.deep_record_dir, len(self.channels),
+            self.deep_capacity, fs=self.engine.fs
+        )
+
+    def _finish_deep_record(self):
+        """Flush the record and switch the display to the deep view."""
+        self._deep_recording = False
+        self.deep.flush()
+        self.deep_pan_var.set(0.0)
+        self.show_deep_window(0, None)
+
+    def _store_deep(self, frame):
+        """Acquisition-thread sink: append every frame to the record."""
+        if self._deep_recording:
+            self.deep.append(frame.data)
+
+    def _shown_rows(self):
+        """Bank rows of channels that are enabled and have a signal."""
+        enabled = np.array([bool(var.get()) for var in self.channel_vars])
+        return np.flatnonzero(enabled & self.bank.valid)
+
+    def _rows_data(self, rows):
+        """Samples of the given bank rows (no copy when all are used)."""
+        data = self.bank.data
+        if len(rows) == self.bank.n_channels:
+            return data
+        return data[rows]
+
+    def _plot_width_pixels(self, ax):
+        """Width of the axes on screen, used to size the decimation."""
+        return max(int(ax.bbox.width), 1)
+
+    def _redraw_waveform(self):
+        """Push the waveform figure to the screen (blit or full draw)."""
+        if self.use_blit:
+            self.wave_blit.update()
+        else:
+            self.canvas.draw()
+
+    def _redraw_overlay(self):
+        """Redraw cursors and measurement box without the traces."""
+        if self.use_blit:
+            self.wave_blit.update_overlay()
+        else:
+            self.canvas.draw_idle()
+
+    def _sync_blit_artists(self):
+        """Register traces, cursors and overlay as animated artists."""
+        self.wave_blit.set_artists(
+            [self.persist_image] + self.wave_lines,
+            overlay=self.cursor_lines + [self.measure_overlay]
+        )
+
+    def _rebuild_waveform_axes(self, layout):
+        """Clear the waveform axes and create one line per channel."""
         self.ax.clear()
         self.ax.set_title("Signal Waveform")
         self.ax.set_xlabel("Sample")
         self.ax.set_ylabel("Amplitude")
 
-        for ch, var in zip(self.channels, self.channel_vars):
-            if var.get() and ch.signal is not None:
-                y = ch.scale * ch.signal + ch.offset
-                self.ax.plot(y, color=ch.color, label=ch.name)
-
-        if any(var.get() for var in self.channel_vars):
-            self.ax.legend(loc="upper left")
+        self.wave_lines = []
+        for ch in self.channels:
+            (line,) = self.ax.plot([], [], color=ch.color, label=ch.name)
+            self.wave_lines.append(line)
+
+        _, n, persist = layout
+        if n > 1:
+            self.ax.set_xlim(0, n - 1)
+
+        # Persistence image under the traces, spanning its fixed range
+        self.persist_image = None
+        if persist:
+            lo, hi = self.persistence.y_range
+            self.persist_image = self.ax.imshow(
+                np.zeros((1, 1, 4)), extent=(0, max(n - 1, 1), lo, hi),
+                origin="lower", aspect="auto", interpolation="nearest",
+                zorder=0
+            )
 
-        self.canvas.draw()
+        # ax.clear() dropped the cursor and overlay artists: re-add them
+        self.cursor_lines = []
+        self.measure_overlay = None
+        self._add_cursor_artists()
+        if self.measure_overlay_text is not None:
+            self._add_measure_overlay(self.measure_overlay_text)
+
+        self._wave_layout = layout
+        self._wave_visible = None
+        self._trace_keys = {}
+        self._sync_blit_artists()
+        self.wave_blit.invalidate()
+
+    def _update_waveform_legend(self):
+        """Show a legend entry for each visible channel only."""
+        handles = [line for line in self.wave_lines if line.get_visible()]
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if handles:
+            self.ax.legend(handles=handles, loc="upper left")
+
+    def update_fft(self, pipelined=False):
+        """Compute and plot the spectrum of the first enabled channel.
+
+        Only the FFT canvas is redrawn, and only when the spectrum
+        engine output changed (or the plotted channel changed).
+        With pipelined=True the FFT runs on the DSP executor and the
+        result submitted on the previous frame is plotted.
+        """
+        ch = self._get_first_enabled_channel()
+        layout = (ch.name if ch else None, self.spectrum.db)
+        rebuilt = layout != self._fft_layout
+        if rebuilt:
+            self.spectrum.reset_average()
+            self._rebuild_fft_axes(ch, layout)
 
-    def update_fft(self):
-        """Compute and plot FFT of the first enabled channel."""
-        enabled_channels = [
-            (ch, var) for ch, var in zip(self.channels, self.channel_vars)
-            if var.get() and ch.signal is not None
-        ]
-        if not enabled_channels:
-            self.ax_fft.clear()
-            self.ax_fft.set_title("FFT Spectrum")
-            self.ax_fft.set_xlabel("Frequency (Hz)")
-            self.ax_fft.set_ylabel("Magnitude")
-            self.canvas_fft.draw()
+        if ch is None or ch.signal is None:
+            if rebuilt:
+                self.canvas_fft.draw_idle()
             return
 
-        # Runtime + Pylance safety
-        ch, _ = enabled_channels[0]
-        sig = ch.signal
-        if sig is None:
+        if pipelined:
+            # The engine's analysis, run on the DSP executor
+            func, data, *args = self.engine.spectrum_job(ch.index)
+            setup = (ch.name, *args)
+            done = self.dsp.collect("fft")
+            # Same samples and settings as the last job: nothing to redo
+            job = (setup, self.bank.row_version[ch.index])
+            if job != self._fft_submitted and self.dsp.submit(
+                "fft", func, data, *args, tag=setup
+            ):
+                self._fft_submitted = job
+            # Drop results computed for another channel or settings
+            if done is None or done[0] != setup:
+                return
+            freqs, mag = done[1][0]
+            freqs, values = self.spectrum.process(freqs, mag[0])
+        else:
+            freqs, values = self.engine.spectrum_of(ch.index)
+        if not (rebuilt or self.spectrum.changed):
             return
-        # -------------------------------
 
-        fs = self.sampling_rate.get()
-        n = len(sig)
-
-        freqs = np.fft.rfftfreq(n, d=1.0 / fs)
-        spectrum = np.abs(np.fft.rfft(sig))
+        freqs, values = decimate(
+            values, self._plot_width_pixels(self.ax_fft),
+            self.decimation, x=freqs
+        )
+        self.fft_line.set_data(freqs, values)
+        self.ax_fft.relim()
+        self.ax_fft.autoscale_view()
+        self.canvas_fft.draw_idle()
 
-        # placeholder:
+    def _rebuild_fft_axes(self, ch, layout):
+        """Clear the FFT axes and create the spectrum line for ch."""
         self.ax_fft.clear()
-        self.ax_fft.plot(freqs, spectrum, color=ch.color)
-        self.ax_fft.set_title(f"FFT Spectrum ({ch.name})")
+        title = "FFT Spectrum" if ch is None else f"FFT Spectrum ({ch.name})"
+        self.ax_fft.set_title(title)
         self.ax_fft.set_xlabel("Frequency [Hz]")
-        self.ax_fft.set_ylabel("Magnitude")
-        self.canvas.draw()
-        pass
+        self.ax_fft.set_ylabel(
+            "Magnitude [dB]" if self.spectrum.db else "Magnitude"
+        )
+        self.fft_line = None
+        if ch is not None:
+            (self.fft_line,) = self.ax_fft.plot([], [], color=ch.color)
+        self._fft_layout = layout
 
     def compute_measurements(self, signal):
         """Compute basic measurements for a given signal (used by Generate)."""
-        peak = np.max(np.abs(signal))
-        rms = np.sqrt(np.mean(signal ** 2))
-
-        fs = self.sampling_rate.get()
-        n = len(signal)
-        freqs = np.fft.fftfreq(n, d=1 / fs)
-        fft_vals = np.abs(np.fft.fft(signal))
-        idx = freqs >= 0
-
-        if np.any(idx):
-            peak_freq = freqs[idx][np.argmax(fft_vals[idx])]
-        else:
-            peak_freq = 0.0
-
+        results = self.measure.compute(
+            signal, self.sampling_rate.get(), ("peak", "rms", "freq")
+        )
         self.measure_label.config(
             text=(
-                f"Peak: {peak:.3f}   "
-                f"RMS: {rms:.3f}   "
-                f"Freq: {peak_freq:.2f} Hz"
+                f"Peak: {format_value('peak', results['peak'][0])}   "
+                f"RMS: {format_value('rms', results['rms'][0])}   "
+                f"Freq: {format_value('freq', results['freq'][0])}"
             )
         )
 
@@ -539,6 +1298,12 @@ class HomePage(ThemedFrame):
         if event.inaxes != self.ax:
             return
 
+        # Pressing on an existing cursor starts dragging it
+        grabbed = self._cursor_near(event)
+        if grabbed is not None:
+            self._drag_cursor = grabbed
+            return
+
         x = int(event.xdata)
 
         if self.cursor_a is None:
@@ -554,18 +1319,64 @@ class HomePage(ThemedFrame):
             if self.measure_overlay is not None:
                 self.measure_overlay.remove()
                 self.measure_overlay = None
+            self.measure_overlay_text = None
+            self._sync_blit_artists()
 
             self.measure_label.config(text="Peak: --   RMS: --   Freq: --")
             self.sb_meas.config(text="MEAS: OFF", bg="#303030")
-            self.canvas.draw()
+            self._redraw_overlay()
             return
 
         self._draw_cursors()
         self._compute_cursor_measurements()
 
+    def _cursor_near(self, event):
+        """Return "a" or "b" if the event is within grab distance."""
+        for name in ("a", "b"):
+            pos = getattr(self, f"cursor_{name}")
+            if pos is None:
+                continue
+            px = self.ax.transData.transform((pos, 0))[0]
+            if abs(px - event.x) <= self.cursor_grab_px:
+                return name
+        return None
+
+    def _on_waveform_drag(self, event):
+        """Move the grabbed cursor and refresh the readout live."""
+        if self._drag_cursor is None:
+            return
+        if event.inaxes != self.ax or event.xdata is None:
+            return
+
+        # The deep view shows the whole deep record, not the live bank
+        if self.deep_view is not None:
+            n = self.deep.length
+        else:
+            n = self.bank.n_samples
+        x = min(max(int(round(event.xdata)), 0), max(n - 1, 0))
+        if x == getattr(self, f"cursor_{self._drag_cursor}"):
+            return
+        setattr(self, f"cursor_{self._drag_cursor}", x)
+
+        # Move the existing lines instead of recreating them
+        positions = [p for p in (self.cursor_a, self.cursor_b)
+                     if p is not None]
+        for line, pos in zip(self.cursor_lines, positions):
+            line.set_xdata([pos, pos])
+
+        self._compute_cursor_measurements()
+
+    def _on_waveform_release(self, event):
+        self._drag_cursor = None
+
     def _draw_cursors(self):
         self._clear_cursor_lines()
+        self._add_cursor_artists()
+        self._sync_blit_artists()
+        self._redraw_overlay()
 
+    def _add_cursor_artists(self):
+        """Create the cursor lines for the current A/B positions."""
         if self.cursor_a is not None:
             line_a = self.ax.axvline(
                 self.cursor_a, color="yellow", linestyle="--"
@@ -578,8 +1389,6 @@ class HomePage(ThemedFrame):
             )
             self.cursor_lines.append(line_b)
 
-        self.canvas.draw()
-
     def _clear_cursor_lines(self):
         """Remove all cursor lines from the plot."""
         for line in self.cursor_lines:
@@ -588,8 +1397,17 @@ class HomePage(ThemedFrame):
 
     def _update_measure_overlay(self, text):
         if self.measure_overlay is not None:
-            self.measure_overlay.remove()
+            # Reuse the box: only its text changes while dragging
+            self.measure_overlay.txt.set_text(text)
+            self.measure_overlay_text = text
+        else:
+            self._add_measure_overlay(text)
+            self._sync_blit_artists()
+        self._redraw_overlay()
 
+    def _add_measure_overlay(self, text):
+        """Create the measurement box artist and attach it to the axes."""
+        self.measure_overlay_text = text
         self.measure_overlay = AnchoredText(
             text,
             loc="upper right",
@@ -604,7 +1422,6 @@ class HomePage(ThemedFrame):
         self.measure_overlay.patch.set_edgecolor("white")
 
         self.ax.add_artist(self.measure_overlay)
-        self.canvas.draw()
 
     def _compute_cursor_measurements(self):
         self.sb_meas.config(text="MEAS: ON", bg="#004488")
@@ -614,16 +1431,20 @@ class HomePage(ThemedFrame):
             return
 
         sig = ch.signal
-        n = len(sig)
+        deep = self.deep if self.deep_view is not None else None
+        n = deep.length if deep is not None else len(sig)
 
         if self.cursor_a is None or self.cursor_a < 0 or self.cursor_a >= n:
             return
 
-        fs = self.sampling_rate.get()
+        fs = deep.fs if deep is not None and deep.fs else self.engine.fs
 
         # Single cursor: show value
         if self.cursor_b is None:
-            y = sig[self.cursor_a]
+            if deep is not None:
+                y = deep.read(self.cursor_a, self.cursor_a + 1)[ch.index, 0]
+            else:
+                y = sig[self.cursor_a]
             overlay_text = (
                 f"{ch.name}\n"
                 f"Cursor A: {self.cursor_a}\n"
@@ -637,13 +1458,18 @@ class HomePage(ThemedFrame):
             return
 
         a, b = sorted([self.cursor_a, self.cursor_b])
-        region = sig[a:b]
-
-        if len(region) < 2:
+        if b - a < 2:
             return
 
-        peak = np.max(np.abs(region))
-        rms = np.sqrt(np.mean(region**2))
+        # O(1) per cursor move: answered from the prefix-sum index.
+        # The deep record reads just the region, chunk by chunk.
+        if deep is not None:
+            stats = deep.stats(a, b)
+        else:
+            stats = self._get_region_index().stats(a, b)
+        peak = stats["peak"][ch.index]
+        rms = stats["rms"][ch.index]
+        mean = stats["mean"][ch.index]
         dt = (b - a) / fs
         freq = 1 / dt if dt > 0 else 0
 
@@ -654,23 +1480,59 @@ class HomePage(ThemedFrame):
             f"ΔX: {b - a} samples ({dt:.4f} s)\n"
             f"Peak: {peak:.3f}\n"
             f"RMS: {rms:.3f}\n"
+            f"Mean: {mean:.3f}\n"
             f"Freq: {freq:.2f} Hz"
         )
 
         self._update_measure_overlay(overlay_text)
 
-    def _auto_measure_first_enabled_channel(self):
+    def _get_region_index(self):
+        """Region statistics index for the current acquisition."""
+        if self._region_version != self.bank.version:
+            self.region_index = RegionIndex(self.bank.data)
+            self._region_version = self.bank.version
+        return self.region_index
+
+    def _auto_measure_first_enabled_channel(self, pipelined=False):
+        """Measure all enabled channels in one vectorized pass.
+
+        With pipelined=True the work runs on the DSP executor and the
+        results submitted on the previous frame are shown.
+        """
         self.sb_meas.config(text="MEAS: ON", bg="#004488")
-        ch = self._get_first_enabled_channel()
-        if ch is None or ch.signal is None:
+        rows = self._shown_rows()
+
+        if not pipelined:
+            if len(rows):
+                results = self.engine.measurements(rows=rows)
+                self._show_measurements(rows, [results])
             return
 
-        sig = ch.signal
-        peak = np.max(np.abs(sig))
-        rms = np.sqrt(np.mean(sig**2))
-        self.measure_label.config(
-            text=f"{ch.name}  Peak: {peak:.3f}   RMS: {rms:.3f}"
-        )
+        # The engine's analysis, run on the DSP executor
+        func, data, fs, names = self.engine.measure_job(rows=rows)
+        done = self.dsp.collect("measure")
+        job = (tuple(rows), tuple(self.bank.row_version[rows]), fs, names)
+        if len(rows) and job != self._measure_submitted and self.dsp.submit(
+            "measure", func, data, fs, names, tag=rows
+        ):
+            self._measure_submitted = job
+        if done is not None:
+            self._show_measurements(*done)
+
+    def _show_measurements(self, rows, results):
+        """Merge per-chunk results and show one entry per channel."""
+        merged = {
+            name: np.concatenate([part[name] for part in results])
+            for name in results[0]
+        }
+        parts = []
+        for k, i in enumerate(rows):
+            values = "   ".join(
+                f"{LABELS[name]}: {format_value(name, merged[name][k])}"
+                for name in self.measure_items
+            )
+            parts.append(f"{self.channels[i].name}  {values}")
+        self.measure_label.config(text="   |   ".join(parts))
 
     # ---------- REAL-TIME LOOP ----------
     def start_realtime(self):
@@ -686,6 +1548,17 @@ class HomePage(ThemedFrame):
                 text="RT ON", bg="#00aa00")   # #00aa00 Tektronix green
             # status bar
             self.sb_rt.config(text="RT: ON", bg="#006600")
+            self.measure_label.config(text="RT: ON")
+            self._rt_status_text = None
+            self._trig_text = None
+            self._acq_text = None
+            self.scheduler.reset()
+            self.trigger.arm()
+            self._start_deep_record()
+            self.acq_engine.reset()
+            self._start_acquisition()
+            if self.rec_var.get():
+                self._start_recording()
             self._realtime_loop()
 
     def stop_realtime(self):
@@ -695,36 +1568,509 @@ class HomePage(ThemedFrame):
         print(">>> Stop RT pressed")
 
         self.realtime_running = False
+        if self._rt_after_id is not None:
+            self.after_cancel(self._rt_after_id)
+            self._rt_after_id = None
+        self._stop_acquisition()
+        self._stop_recording()
+        if self._deep_recording:
+            self._finish_deep_record()
         # indicator OFF
         self.rt_status.config(text="RT OFF", bg="#660000")
         # status bar
         self.sb_rt.config(text="RT: OFF", bg="#660000")
 
     def _realtime_loop(self):
+        self._rt_after_id = None
+        if not self.realtime_running:
+
+            return
+        self.scheduler.begin_frame()
+
+        # Hand the current control values to the worker thread
+        self.synthetic.settings = self._snapshot_acquisition()
+        self._persist_settings = self._snapshot_persistence()
+
+        # Newest finished frame, if any; never wait for one
+        frame = self.acquisition.slot.take()
+        if frame is None:
+            self._update_drop_status()
+            self._rt_after_id = self.after(
+                self.scheduler.end_frame(), self._realtime_loop)
+            return
+
+        # Copy all channels into the bank in one go; a new record also
+        # goes into the acquisition-mode accumulator
+        self.engine.acq_bins = self._plot_width_pixels(self.ax)
+        self.engine.load(frame, roll=self.roll_var.get())
+
+        # Update plots and measurements. The trace runs every frame;
+        # FFT and measurements are thinned out when frames run long.
+        self.update_waveform()
+        if self.scheduler.due("fft", base_every=2):
+            self.update_fft(pipelined=True)
+        if self.scheduler.due("measure", base_every=4):
+            self._auto_measure_first_enabled_channel(pipelined=True)
+            if self.cursor_a is not None:
+                self._compute_cursor_measurements()
+
+        # Schedule next frame: target period minus the time just spent
+        delay = self.scheduler.end_frame()
+        self._update_rt_status()
+        self._update_drop_status()
+        self._update_trigger_status()
+        self._update_acq_status()
+        self._update_rec_status()
+        self._update_replay_status()
+        self._rt_after_id = self.after(delay, self._realtime_loop)
+
+    def _update_acq_status(self):
+        """Show the acquisition mode and the accumulated record count."""
+        text = self.acq_engine.status_text()
+        if text == self._acq_text:
+            return
+        self._acq_text = text
+        idle = self.acq_engine.mode == "sample"
+        self.sb_acq.config(text=text, bg="#303030" if idle else "#004488")
+
+    def _update_trigger_status(self):
+        """Show the trigger state (TRIG'D / AUTO / WAIT / STOP / ROLL)."""
+        status = "ROLL" if self.roll_var.get() else self.trigger.status
+        text = f"TRIG: {status}"
+        if text == self._trig_text:
+            return
+        self._trig_text = text
+        colors = {"TRIG'D": "#006600", "AUTO": "#aa6600", "STOP": "#660000"}
+        self.sb_trig.config(text=text, bg=colors.get(status, "#303030"))
+
+    def _snapshot_acquisition(self):
+        """Plain-value acquisition settings for the worker thread."""
+        return (
+            self._snapshot_generator(),
+            self.n_samples,
+            self.sampling_rate.get(),
+            self.roll_var.get()
+        )
+
+    def _start_acquisition(self):
+        self.synthetic.settings = self._snapshot_acquisition()
+        self.synthetic.rate_hz = self.scheduler.target_fps
+        self._persist_settings = self._snapshot_persistence()
+        # Sources that wait for their data are polled as fast as they go
+        rate_hz = (1000.0 if self.engine.source.paces_itself
+                   else self.scheduler.target_fps)
+        sinks = [
+            self.engine.store_history, self._store_persistence,
+            self._store_deep, self._store_recording
+        ]
+        if self.acquisition is None or not self.acquisition.running:
+            self.acquisition = AcquisitionWorker(
+                self.engine.produce, rate_hz=rate_hz, sinks=sinks
+            )
+        else:
+            # The previous worker has not finished stopping: resume it
+            # rather than run two threads on the same producer
+            self.acquisition.rate_hz = rate_hz
+            self.acquisition.sinks = sinks
+        self.acquisition.start()
+
+    def _stop_acquisition(self):
+        if self.acquisition is not None:
+            self.acquisition.stop()
+
+    def _on_rate_changed(self, *_):
+        if self.engine.source is self.synthetic:
+            self.engine.fs = self.sampling_rate.get()
+
+    def _on_roll_toggle(self):
+        # Start the scrolling view from an empty history
+        with self.ring.lock:
+            self.ring.clear()
+            self._persist_next = 0
+
+    def _snapshot_persistence(self):
+        """Plain-value persistence settings for the worker (or None)."""
+        if not self._persist_enabled():
+            return None
+        trig = self.trigger
+        return (
+            self.n_samples, self.engine.trigger_source, trig.level, trig.slope,
+            trig.hysteresis, int(round(trig.position * (self.n_samples - 1))),
+            trig.mode == "auto"
+        )
 
+    def _store_persistence(self, frame):
+        """
+        Acquisition-thread sink: add every triggered waveform in the
+        new part of the history (not just the one displayed) to the
+        persistence map. Without triggers, auto mode adds the frame.
+        """
+        settings = self._persist_settings
+        if settings is None:
+            return
+        n, src, level, slope, hysteresis, pre, free_run = settings
+
+        with self.ring.lock:
+            end = self.ring.end
+            first = max(self.ring.start, self._persist_next - pre - 1)
+            span = self.ring.read(first, end)
+            edges = find_edges(span[src], level, slope, hysteresis) + first
+            # Whole windows only, each edge once
+            last = end - n + pre
+            edges = edges[
+                (edges >= self._persist_next) & (edges < last) &
+                (edges - pre >= first)
+            ][-self.persist_max_waves:]
+            self._persist_next = max(self._persist_next, last)
+
+            starts = np.round(edges - pre).astype(int) - first
+            waves = span[:, starts[:, None] + np.arange(n)]
+
+        if len(edges) == 0:
+            if not (free_run and frame.data.shape[1] == n):
+                return
+            waves = frame.data[:, None, :]
+
+        # Rasterize in display units (scale, offset, coupling applied)
+        n_ch, k, _ = waves.shape
+        dc = waves.reshape(n_ch, -1).mean(axis=1)
+        display = self.bank.to_display(waves.reshape(n_ch, -1), dc=dc)
+        self.persistence.add(display.reshape(n_ch, k, n))
+
+    # ---------- RECORDING ----------
+    def _on_rec_toggle(self):
+        """Rec checkbox: start or stop streaming while RT runs."""
         if not self.realtime_running:
+            return
+        if self.rec_var.get():
+            self._start_recording()
+        else:
+            self._stop_recording()
+
+    def _start_recording(self):
+        """Open a new capture file in the record folder."""
+        self._stop_recording()
+        stem = os.path.join(self.controller.record_dir,
+                            time.strftime("capture_%Y%m%d_%H%M%S"))
+        path, n = stem + ".kbkrec", 1
+        while os.path.exists(path):
+            path, n = f"{stem}_{n}.kbkrec", n + 1
+        self.recorder = StreamRecorder(
+            path, self.engine.fs, self._channel_meta())
+        self._rec_text = None
+        print(f"[Recorder] Recording to {self.recorder.path}")
+
+    def _channel_meta(self):
+        """Names and vertical settings of all channels, for file headers."""
+        return [
+            {
+                "name": ch.name,
+                "scale": ch.scale,
+                "offset": ch.offset,
+                "probe": ch.probe_factor,
+                "coupling": ch.coupling,
+            }
+            for ch in self.channels
+        ]
 
+    def _stop_recording(self, wait=False):
+        """
+        Finish the capture file (queued frames are still written).
+        Writing out the queue can take seconds on a slow disk, so the
+        file is closed from a helper thread and polled with after();
+        wait=True closes it inline (application shutdown).
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        if wait:
+            recorder.close()
+            self._recording_closed(recorder)
             return
-        print(">>> RT loop running")
-        self.measure_label.config(text="RT: ON")
+        closer = threading.Thread(
+            target=recorder.close, name="recorder-close", daemon=True)
+        closer.start()
+        self._rec_closers.append(closer)
+        self._poll_recorder_close(recorder, closer)
+
+    def _poll_recorder_close(self, recorder, closer):
+        if closer.is_alive():
+            self.after(100, self._poll_recorder_close, recorder, closer)
+            return
+        self._rec_closers.remove(closer)
+        self._recording_closed(recorder)
 
-        fs = self.sampling_rate.get()
-        n = self.n_samples
+    def _recording_closed(self, recorder):
+        print(
+            f"[Recorder] {recorder.written} frames, "
+            f"{recorder.dropped} dropped: {recorder.path}"
+        )
+        if self.recorder is None:
+            self._update_rec_status(recorder)
+
+    def _store_recording(self, frame):
+        """Acquisition-thread sink: queue every frame for the recorder."""
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.submit(frame)
+
+    def _update_rec_status(self, recorder=None):
+        """Show bytes recorded, or dropped frames, in the REC block."""
+        recorder = recorder or self.recorder
+        if recorder is None:
+            text, bg = "REC: OFF", "#303030"
+        else:
+            text = recorder.status_text()
+            bad = recorder.dropped or recorder.error is not None
+            bg = "#aa6600" if bad else "#aa0000"
+            if not recorder.recording:
+                bg = "#303030"
+        if (text, bg) == self._rec_text:
+            return
+        self._rec_text = (text, bg)
+        self.sb_rec.config(text=text, bg=bg)
+
+    # ---------- EXPORT ----------
+    def _choose_export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy", "*.npy"),
+                       ("NumPy archive", "*.npz"), ("Raw binary", "*.bin")]
+        )
+        if not path:
+            return
+        try:
+            self.export(path)
+        except RuntimeError:
+            # Export is disabled while a job runs; this covers a click
+            # that was already queued when it started
+            self.export_label.config(text="Export in progress")
+
+    def export(self, path, start=None, stop=None, **options):
+        """
+        Export all channels to path (format from the extension) in the
+        background and return the ExportJob. The range defaults to the
+        cursor region, else everything: the deep record while it is
+        shown, otherwise the current acquisition.
+        """
+        if self.export_job is not None and not self.export_job.done:
+            raise RuntimeError("An export is already running")
+        if self.deep_view is not None:
+            read, length = self.deep.read, self.deep.length
+            fs = self.deep.fs or self.engine.fs
+        else:
+            # Copy: the RT loop keeps writing the bank meanwhile
+            data = self.bank.data.copy()
+            read, length = array_reader(data), data.shape[1]
+            fs = self.engine.fs
+        if start is None and stop is None and self.cursor_b is not None:
+            start, stop = sorted([self.cursor_a, self.cursor_b])
+        start = 0 if start is None else max(0, int(start))
+        stop = length if stop is None else min(int(stop), length)
+
+        self.export_job = ExportJob(
+            path, read, start, stop, fs, self._channel_meta(), **options)
+        self.export_btn.config(state="disabled")
+        self._poll_export()
+        return self.export_job
+
+    def _cancel_export(self):
+        if self.export_job is not None:
+            self.export_job.cancel()
+
+    def _poll_export(self):
+        """Show export progress until the job finishes."""
+        job = self.export_job
+        self.export_label.config(text=job.status_text())
+        if job.done:
+            self.export_btn.config(state="normal")
+            if job.error is None:
+                print(f"[Export] Wrote {job.path}")
+            return
+        self.after(200, self._poll_export)
+
+    # ---------- REMOTE CONTROL ----------
+    def start_remote(self, port, host="127.0.0.1"):
+        """Serve the remote command set (see RemoteControl) on host:port."""
+        if self.remote is not None:
+            return self.remote
+        try:
+            self.remote = RemoteServer(
+                RemoteControl(self).execute, host, port).start()
+        except OSError as exc:
+            print(f"[Remote] Cannot listen on {host}:{port}: {exc}")
+            return None
+        print(f"[Remote] Listening on {self.remote.address}")
+        self._poll_remote()
+        return self.remote
+
+    def _poll_remote(self):
+        """Run queued remote commands within the per-poll budget."""
+        if self.remote is None:
+            return
+        self.remote.process(budget=self.remote_budget)
+        self.after(self.remote_poll_ms, self._poll_remote)
+
+    # ---------- SHUTDOWN ----------
+    def shutdown(self):
+        """Stop threads, servers and worker processes; close files.
+        Called by the controller before the window is destroyed."""
+        self._stop_recording(wait=True)
+        self.stop_realtime()
+        for closer in list(self._rec_closers):
+            closer.join()
+        self.engine.set_source(None)    # closes an instrument or replay
+        if self.remote is not None:
+            self.remote.stop()
+            self.remote = None
+        if self.simulator is not None:
+            self.simulator.stop()
+            self.simulator = None
+        if self.deep is not None:
+            self.deep.close()
+            self.deep = None
+        self.dsp.shutdown()
+
+    # ---------- REPLAY ----------
+    def _choose_replay(self):
+        path = filedialog.askopenfilename(
+            parent=self, initialdir=self.controller.record_dir,
+            filetypes=[("Captures", "*.kbkrec"), ("All files", "*.*")]
+        )
+        if path:
+            self.open_replay(path)
+
+    def open_replay(self, path, speed=1.0):
+        """Play a capture file through the scope instead of the
+        generator; the recorded sampling rate and vertical settings
+        are applied."""
+        try:
+            capture = CaptureFile(path)
+        except (OSError, ValueError) as exc:
+            print(f"[Replay] Cannot open {path}: {exc}")
+            messagebox.showerror(
+                "Replay", f"Cannot open capture file:\n{path}\n\n{exc}",
+                parent=self)
+            return
+        self.stop_realtime()
+        for ch, meta in zip(self.channels, capture.channels):
+            for name, attr in (("scale", "scale"), ("offset", "offset"),
+                               ("probe", "probe_factor"),
+                               ("coupling", "coupling")):
+                if name in meta:
+                    setattr(ch, attr, meta[name])
+        self.replay_play_btn.config(text="Pause")
+        print(f"[Replay] {len(capture)} frames, "
+              f"{capture.duration:.1f} s: {path}")
+        self.set_source(ReplaySource(capture, speed=speed))
+
+    def set_source(self, source):
+        """
+        Acquire from `source` (a SignalSource) from now on; None goes
+        back to the built-in generator. The previous source is closed.
+        """
+        source = source or self.synthetic
+        self.stop_realtime()
+        # Analysis runs at the source's rate; the generator's is the
+        # Rate slider (frames then keep engine.fs in step)
+        self.engine.set_source(source)
+        self._on_rate_changed()
+        self.replay = source if isinstance(source, ReplaySource) else None
+        self.replay_label.config(text="")
+        self._replay_text = None
+        self.start_realtime()
+
+    # ---------- INSTRUMENT ----------
+    def _on_connect_instrument(self):
+        host, _, port = self.instrument_var.get().rpartition(":")
+        try:
+            self.connect_instrument(host or "127.0.0.1", int(port))
+        except (OSError, ValueError) as exc:
+            self.measure_label.config(text=f"Connect failed: {exc}")
+
+    def connect_instrument(self, host, port):
+        """Acquire records of n_samples points from a SCPI instrument."""
+        source = ScpiSource(host, port, n_samples=self.n_samples)
+        print(f"[Instrument] {source.idn} at {host}:{port}")
+        self.set_source(source)
+        return source
+
+    def start_simulator(self):
+        """Start the loopback instrument (once) and acquire from it."""
+        if self.simulator is None:
+            self.simulator = ScpiSimulator(
+                n_channels=len(self.channels),
+                fs=self.sampling_rate.get(),
+                frame_rate=self.scheduler.target_fps
+            ).start()
+            host, port = self.simulator.address
+            self.instrument_var.set(f"{host}:{port}")
+        return self.connect_instrument(*self.simulator.address)
+
+    def _toggle_replay_pause(self):
+        if self.replay is None:
+            return
+        paused = not self.replay.paused
+        self.replay.configure(paused=paused)
+        self.replay_play_btn.config(text="Play" if paused else "Pause")
 
-        # Get signals from waveform.py
-        signals = waveform.get_signals(len(self.channels), n, fs, home=self)
+    def _step_replay(self):
+        if self.replay is None:
+            return
+        self.replay.step()
+        self.replay_play_btn.config(text="Play")
 
-        # Assign signals to channels
-        for ch, sig in zip(self.channels, signals):
-            ch.set_signal(sig)
+    def _on_replay_speed_changed(self, *_):
+        if self.replay is None:
+            return
+        speed = self.replay_speed_var.get()
+        self.replay.configure(speed=None if speed == "max" else float(speed))
 
-        # Update plots and measurements
-        self.update_waveform()
-        self.update_fft()
-        self._auto_measure_first_enabled_channel()
+    def _update_replay_status(self):
+        """Show the playback position as 'frame i/N'."""
+        if self.replay is None:
+            return
+        text = f"{self.replay.position}/{len(self.replay.capture)}"
+        if self.replay.finished:
+            text += " END"
+        if text == self._replay_text:
+            return
+        self._replay_text = text
+        self.replay_label.config(text=text)
 
-        # Schedule next frame (16 ms = ~60 FPS)
-        self.after(16, self._realtime_loop)
+    def _update_rt_status(self):
+        """Show frame rate, or skipped frames, in the RT status block."""
+        text = self.scheduler.status_text()
+        if text == self._rt_status_text:
+            return
+        self._rt_status_text = text
+        bg = "#aa6600" if self.scheduler.skipping else "#006600"
+        self.sb_rt.config(text=text, bg=bg)
+
+    def _update_drop_status(self):
+        """Show how many acquired frames were never displayed, or that
+        acquisition is failing (the error itself in the readout)."""
+        error = self.acquisition.error
+        if error is not None:
+            text, bg = "ACQ: ERR", "#aa0000"
+        else:
+            dropped = self.acquisition.dropped
+            text = f"DROP: {dropped}"
+            bg = "#aa6600" if dropped else "#303030"
+        if error is not None and error is not self._acq_error:
+            self.measure_label.config(text=f"Acquisition error: {error}")
+        self._acq_error = error
+        if text == self._drop_text:
+            return
+        self._drop_text = text
+        self.sb_drop.config(text=text, bg=bg)
+
+    # ---------- THEME ----------
+    def apply_theme(self, theme):
+        super().apply_theme(theme)
+        # Widget colors changed: the cached plot background is stale
+        self.wave_blit.invalidate()
+        self._redraw_waveform()
 
     # ---------- TEXT REFRESH (I18N) ----------
     def refresh_text(self):
@@ -0,0 +1,188 @@
+# views/remote_control.py
+
+import re
+
+import numpy as np
+
+from scope.dds import WAVEFORMS
+from scope.measurements import MEASUREMENTS
+
+IDN = "KBK,SCOPE-APP,0,1.0"
+SIGNAL_TYPES = WAVEFORMS + ("noise",)
+
+# :CHAN<n>:<field> -> ScopeChannel Tk variable or bank property
+CHANNEL_FIELDS = {
+    "FUNC": "signal_type_var",
+    "FREQ": "freq_var",
+    "AMPL": "amp_var",
+    "NOIS": "noise_var",
+    "SCAL": "scale",
+    "OFFS": "offset",
+}
+
+# Ranges of the Home page sliders; remote values must stay inside them
+RATE_RANGE = (100.0, 5000.0)
+FIELD_RANGES = {
+    "FREQ": (1.0, 50.0),
+    "AMPL": (0.1, 5.0),
+    "NOIS": (0.0, 2.0),
+}
+
+
+class RemoteCommandError(Exception):
+    """SCPI error: code and message go to the :SYST:ERR? queue."""
+
+    def __init__(self, code, message):
+        super().__init__(f'{code},"{message}"')
+
+
+class RemoteControl:
+    """
+    SCPI-like command set of a HomePage, for scope.remote.RemoteServer.
+
+    execute() runs on the Tk thread (RemoteServer.process is called
+    from after()), so it can use widgets and Tk variables directly.
+    All :MEAS queries of one line share a single measurement pass.
+
+      *IDN?  *OPC?  :RUN  :STOP  :RUN?
+      :ACQ:SRAT <hz> / ?       :ACQ:POIN?
+      :CHAN<n>:DISP 0|1 / ?    :CHAN<n>:FUNC|FREQ|AMPL|NOIS|SCAL|OFFS
+      :WAV:DATA? <n>|ALL       float32 block (ALL: channels x samples)
+      :MEAS:<item>? <n>        e.g. :MEAS:RMS? 1 (items: MEASUREMENTS)
+      :MEAS:ALL? <n>           every measurement, comma-separated
+      :SYST:ERR?
+    """
+
+    def __init__(self, home):
+        self.home = home
+        self.errors = []
+        self._measured = None
+
+    def execute(self, commands):
+        """Replies for one line of commands (None for set commands)."""
+        self._measured = None        # measure at most once per line
+        replies = []
+        for command in commands:
+            try:
+                replies.append(self._execute(command))
+            except RemoteCommandError as exc:
+                self.errors.append(str(exc))
+                # Queries still answer, so replies stay in step
+                replies.append("" if command.split()[0].endswith("?")
+                               else None)
+        return replies
+
+    def _execute(self, command):
+        header, _, arg = command.partition(" ")
+        header, arg = header.upper(), arg.strip()
+        home = self.home
+
+        if header == "*IDN?":
+            return IDN
+        if header == "*OPC?":
+            return "1"
+        if header == ":RUN":
+            home.start_realtime()
+            return None
+        if header == ":STOP":
+            home.stop_realtime()
+            return None
+        if header == ":RUN?":
+            return "1" if home.realtime_running else "0"
+        if header == ":ACQ:SRAT":
+            home.sampling_rate.set(self._number(arg, RATE_RANGE))
+            return None
+        if header == ":ACQ:SRAT?":
+            return repr(float(home.sampling_rate.get()))
+        if header == ":ACQ:POIN?":
+            return str(home.n_samples)
+        if header == ":WAV:DATA?":
+            return self._waveform(arg)
+        if header == ":SYST:ERR?":
+            return self.errors.pop(0) if self.errors else '0,"No error"'
+
+        match = re.fullmatch(r":MEAS:(\w+)\?", header)
+        if match:
+            return self._measure(match.group(1).lower(), arg)
+        match = re.fullmatch(r":CHAN(\d+):(\w+)(\?)?", header)
+        if match:
+            return self._channel(int(match.group(1)) - 1, match.group(2),
+                                 arg, bool(match.group(3)))
+        raise RemoteCommandError(-113, f"Undefined header; {command}")
+
+    # ---------- HELPERS ----------
+    @staticmethod
+    def _number(arg, limits=None):
+        """arg as a float, inside the inclusive limits (lo, hi) if given."""
+        try:
+            value = float(arg)
+        except ValueError:
+            raise RemoteCommandError(-104, f"Data type error; {arg}")
+        if not np.isfinite(value) or (
+            limits is not None and not limits[0] <= value <= limits[1]
+        ):
+            raise RemoteCommandError(-222, f"Data out of range; {arg}")
+        return value
+
+    def _row(self, arg):
+        """Bank row of a 1-based channel argument ("1" or "CH1")."""
+        text = arg.upper().removeprefix("CH")
+        if not text.isdigit() or not 1 <= int(text) <= len(
+            self.home.channels
+        ):
+            raise RemoteCommandError(-222, f"Data out of range; {arg}")
+        return int(text) - 1
+
+    def _channel(self, index, field, arg, query):
+        home = self.home
+        if not 0 <= index < len(home.channels):
+            raise RemoteCommandError(-114, "Header suffix out of range")
+        if field == "DISP":
+            var = home.channel_vars[index]
+            if query:
+                return "1" if var.get() else "0"
+            var.set(bool(int(self._number(arg))))
+            home._on_channel_toggle(index)
+            return None
+        if field not in CHANNEL_FIELDS:
+            raise RemoteCommandError(-113, f"Undefined header; {field}")
+
+        ch = home.channels[index]
+        name = CHANNEL_FIELDS[field]
+        var = getattr(ch, name)
+        if query:
+            value = var.get() if name.endswith("_var") else var
+            return value if isinstance(value, str) else repr(float(value))
+        if field == "FUNC":
+            value = arg.lower()
+            if value not in SIGNAL_TYPES:
+                raise RemoteCommandError(
+                    -224, f"Illegal parameter value; {arg}")
+        else:
+            value = self._number(arg, FIELD_RANGES.get(field))
+        if name.endswith("_var"):
+            var.set(value)
+        else:
+            setattr(ch, name, value)
+        return None
+
+    def _waveform(self, arg):
+        """A copy of the current record, taken now on the Tk thread."""
+        data = self.home.bank.data
+        if arg.upper() in ("", "ALL"):
+            return np.array(data, dtype=np.float32)
+        return np.array(data[self._row(arg)], dtype=np.float32)
+
+    def _measure(self, item, arg):
+        if item != "all" and item not in MEASUREMENTS:
+            raise RemoteCommandError(
+                -113, f"Undefined header; :MEAS:{item.upper()}?")
+        row = self._row(arg or "1")
+        if self._measured is None:
+            # Everything for every channel in one vectorized pass
+            self._measured = self.home.engine.measurements(MEASUREMENTS)
+        if item == "all":
+            return ",".join(
+                repr(float(self._measured[name][row]))
+                for name in MEASUREMENTS)
+        return repr(float(self._measured[item][row]))
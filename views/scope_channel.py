@@ -2,36 +2,85 @@
 scope_channel.py
 
 Defines the ScopeChannel class used by the oscilloscope UI.
-Each channel stores its own name, color, enable state, and signal data.
+Each channel stores its own name, color and enable state; its signal
+data and vertical settings live in a shared ChannelBank row.
 This file contains no UI code and no plotting code.
 """
 from tkinter import StringVar, DoubleVar
 
+from scope.channel_bank import ChannelBank
+
 
 class ScopeChannel:
     """
     Represents a single oscilloscope channel.
-    Stores channel metadata and the most recent signal buffer.
+    A thin view over one row of a ChannelBank: signal, scale, offset,
+    probe and coupling are read from and written to the bank.
     """
 
-    def __init__(self, name: str, color: str, enabled: bool = True):
+    def __init__(self, name: str, color: str, enabled: bool = True,
+                 bank: ChannelBank | None = None, index: int = 0):
         self.name = name          # "CH1", "CH2", ...
         self.color = color        # waveform color
         self.enabled = enabled    # checkbox state
 
-        # Signal data
-        self.signal = None        # numpy array of samples
-
-        # Future expansion (safe placeholders)
-        # Vertical settings
-        self.scale = 1.0          # volts per division
-        self.offset = 0.0         # vertical offset
-        self.probe_factor = 1     # x1, x10, x100
-        self.coupling = "DC"      # "DC", "AC", "GND"
+        # Backing storage (a private one-channel bank if none is given)
+        if bank is None:
+            bank, index = ChannelBank(1), 0
+        self.bank = bank
+        self.index = index
 
         self.signal_type_var: StringVar | None = None
         self.freq_var: DoubleVar | None = None
         self.amp_var: DoubleVar | None = None
+        self.noise_var: DoubleVar | None = None         # additive RMS
+        self.noise_color_var: StringVar | None = None
+
+    # Signal data
+    @property
+    def signal(self):
+        """numpy array of samples (a view into the bank), or None."""
+        return self.bank.signal(self.index)
+
+    @signal.setter
+    def signal(self, sig):
+        if sig is None:
+            self.bank.invalidate(self.index)
+        else:
+            self.bank.write(self.index, sig)
+
+    # Vertical settings
+    @property
+    def scale(self):              # volts per division
+        return float(self.bank.scale[self.index])
+
+    @scale.setter
+    def scale(self, value):
+        self.bank.scale[self.index] = value
+
+    @property
+    def offset(self):             # vertical offset
+        return float(self.bank.offset[self.index])
+
+    @offset.setter
+    def offset(self, value):
+        self.bank.offset[self.index] = value
+
+    @property
+    def probe_factor(self):       # x1, x10, x100
+        return int(self.bank.probe[self.index])
+
+    @probe_factor.setter
+    def probe_factor(self, value):
+        self.bank.probe[self.index] = value
+
+    @property
+    def coupling(self):           # "DC", "AC", "GND"
+        return self.bank.get_coupling(self.index)
+
+    @coupling.setter
+    def coupling(self, value):
+        self.bank.set_coupling(self.index, value)
 
     def set_signal(self, sig):
         """Assign a new numpy array to this channel."""
@@ -1,7 +1,14 @@
 # waveform.py
 
+from functools import lru_cache
+
 import numpy as np
 
+from scope import dds
+from scope.noise import NoiseSource
+
+_noise = None
+
 
 def draw_test_waveform(controller):
     home = controller.get_frame("HomePage")
@@ -27,25 +34,117 @@ def draw_test_waveform(controller):
     home._auto_measure_first_enabled_channel()
 
 
-def get_signals(n_channels, n_samples, fs, home=None):
+@lru_cache(maxsize=None)
+def _wavetable(sig_type):
+    return dds.make_table(sig_type)
+
+
+@lru_cache(maxsize=8)
+def _time_base(n_samples, fs):
+    """Shared read-only time axis: 1 s span, or 1/fs spacing."""
+    if fs is None:
+        t = np.linspace(0, 1, n_samples, endpoint=False)
+    else:
+        t = np.arange(n_samples) / fs
+    t.flags.writeable = False
+    return t
+
+
+def default_noise():
+    """Shared NoiseSource for callers that do not bring their own."""
+    global _noise
+    if _noise is None:
+        _noise = NoiseSource()
+    return _noise
+
+
+def generate_channel(sig_type, t, freq, amp, noise_amp=0.0,
+                     noise_color="white", noise=None):
+    """
+    Generate one synthetic channel on the time base t, plus optional
+    additive noise of RMS noise_amp. "noise" uses noise_color.
+    """
+    noise = noise or default_noise()
+    sig = _clean_channel(sig_type, t, freq, amp, noise_color, noise)
+    if noise_amp and sig_type != "noise":
+        sig = sig + noise.noise(len(t), noise_amp, noise_color)
+    return sig
+
+
+def _clean_channel(sig_type, t, freq, amp, noise_color, noise):
+    if sig_type == "sine":
+        return amp * np.sin(2 * np.pi * freq * t)
+    if sig_type == "square":
+        return amp * np.sign(np.sin(2 * np.pi * freq * t))
+    if sig_type == "noise":
+        return noise.noise(len(t), amp, noise_color, out=np.empty(len(t)))
+    if sig_type in dds.WAVEFORMS:
+        table = _wavetable(sig_type)
+        idx = ((freq * t) % 1.0 * len(table)).astype(int)
+        return amp * table[idx]
+
+    return np.zeros_like(t)
+
+
+def generate_signals(settings, n_samples, fs=None, generator=None,
+                     noise=None):
+    """
+    Generate all channels from plain generator settings.
+    settings: one (sig_type, freq, amp[, noise_amp, noise_color]) tuple
+    per channel; noise_amp adds noise on top of the waveform.
+    noise is the NoiseSource to draw from (default_noise() if None).
+    Without a generator the record spans 1 s (or n_samples / fs) from
+    t = 0. With a dds.DDSGenerator each call continues every channel
+    from its phase accumulator, so consecutive blocks join up, and
+    generator.changed flags the channels whose block is new.
+    Returns a list of arrays, or one (channels, n_samples) array with
+    a generator.
+    Touches no Tk state, so it is safe to call from a worker thread.
+    """
+    noise = noise or default_noise()
+    if generator is None:
+        t = _time_base(n_samples, fs)
+        return [
+            generate_channel(entry[0], t, *entry[1:], noise=noise)
+            for entry in settings
+        ]
+
+    # Every channel is written straight into one (channels, n) block
+    signals = np.empty((len(settings), n_samples))
+    for i, entry in enumerate(settings):
+        sig_type, freq, amp = entry[:3]
+        noise_amp, noise_color = (tuple(entry[3:]) + (0.0, "white"))[:2]
+        sig = signals[i]
+        if sig_type in generator.tables:
+            # Copies the (possibly cached, read-only) block
+            sig[:] = generator.generate(
+                i, sig_type, freq, amp, fs, n_samples)
+        elif sig_type == "noise":
+            generator.mark(i)
+            noise.noise(n_samples, amp, noise_color, out=sig)
+        else:
+            generator.mark(i, ("off", n_samples))
+            sig[:] = 0.0
+
+        if noise_amp and sig_type != "noise":
+            generator.mark(i)
+            sig += noise.noise(n_samples, noise_amp, noise_color)
+    return signals
+
+
+def get_signals(n_channels, n_samples, fs, home=None, source=None):
     """
     Return a list of numpy arrays, one per channel.
-    For now: synthetic signals. Later: replace with real hardware input.
+    Synthetic signals, or the next frame of `source` when given: any
+    scope.sources.SignalSource (capture file, SCPI instrument, ...);
+    None then means no frame is ready yet.
     """
+    if source is not None:
+        frame = source.read()
+        return None if frame is None else list(frame[0])
+
     # Safety: avoid Pylance warnings and runtime errors
     if home is None:
         return [np.zeros(n_samples) for _ in range(n_channels)]
 
-    t = np.linspace(0, 1, n_samples, endpoint=False)
-    signals = []
-
-    for ch in home.channels:
-        sig = home._generate_single_channel(
-            ch.signal_type_var.get(),
-            t,
-            ch.freq_var.get(),
-            ch.amp_var.get()
-        )
-        signals.append(sig)
-
-    return signals
+    return generate_signals(home._snapshot_generator(), n_samples)